@@ -1,33 +1,353 @@
 # __init__.py
 
+import asyncio
 import logging
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ENTITY_ID, CONF_IP_ADDRESS, CONF_PASSWORD
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .capture import DEFAULT_BACKUP_COUNT, DEFAULT_MAX_BYTES, CaptureWriter, PacketRing, format_packets
+from .codec import SCHEDULE_DAYS, SCHEDULE_PERIODS, SchedulePeriod
+from .const import (
+    CONF_DEVICE_ID, CONF_FAST_WINDOW, CONF_MEMBERS, CONF_MIN_GAP, CONF_PACKET_BUFFER, CONF_POLL_MAX, CONF_POLL_MIN,
+    CONF_SYNC_CLOCK, DATA_COORDINATOR, DOMAIN,
+    GROUP_PLATFORMS, PLATFORMS, SIGNAL_DEVICE_UPDATED, SERVICE_DUMP_PACKETS, SERVICE_GET_SCHEDULE, SERVICE_GROUP_COMMAND,
+    SERVICE_APPLY_CONFIG, SERVICE_POLL_SCHEDULE, SERVICE_SET_SCHEDULE, SERVICE_SNAPSHOT_CONFIG, SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE, SERVICE_SYNC_CLOCK,
+)
+from .coordinator import BlaubergVentoCoordinator, VentoDevice, VentoGroup
+from .fan import fan_parameters
+from .snapshot import dump_snapshot, load_snapshot
 
-DOMAIN = "blauberg_vento"
 _LOGGER = logging.getLogger(__name__)
 
+START_CAPTURE_SCHEMA = vol.Schema({
+    vol.Optional("path"): cv.string,
+    vol.Optional("max_bytes", default=DEFAULT_MAX_BYTES): cv.positive_int,
+    vol.Optional("backup_count", default=DEFAULT_BACKUP_COUNT): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(CONF_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+})
+
+DUMP_PACKETS_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+})
+
+GROUP_COMMAND_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional("turn_on"): cv.boolean,
+    vol.Optional("percentage"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    vol.Optional("oscillating"): cv.boolean,
+})
+
+DEVICES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+})
+
+SCHEDULE_PERIOD_SCHEMA = vol.Schema({
+    vol.Required("day"): vol.In(SCHEDULE_DAYS),
+    vol.Required("period"): vol.All(vol.Coerce(int), vol.Range(min=1, max=SCHEDULE_PERIODS)),
+    vol.Required("speed"): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+    vol.Required("end"): cv.time,
+})
+
+SET_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional("periods", default=[]): vol.All(cv.ensure_list, [SCHEDULE_PERIOD_SCHEMA]),
+    vol.Optional("enabled"): cv.boolean,
+})
+
+SNAPSHOT_CONFIG_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional("path"): cv.string,
+})
+
+APPLY_CONFIG_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional("path"): cv.string,
+    vol.Optional("source"): cv.string,
+    vol.Optional("dry_run", default=False): cv.boolean,
+})
+
 async def async_setup(hass: HomeAssistant, config: dict):
     """
     Diese Funktion wird aufgerufen, wenn die Integration über YAML konfiguriert wird.
-    Da wir eine reine Config-Flow-Integration nutzen, tun wir hier nichts und geben einfach True zurück.
+    Da wir eine reine Config-Flow-Integration nutzen, werden hier nur die Dienste registriert.
     """
+
+    def get_coordinator() -> BlaubergVentoCoordinator:
+        coordinator = hass.data.get(DOMAIN, {}).get(DATA_COORDINATOR)
+        if coordinator is None:
+            raise HomeAssistantError("No Blauberg Vento device is set up")
+        return coordinator
+
+    def resolve_devices(entity_ids: list[str]) -> list[VentoDevice]:
+        """Lüfter zu den Entitäten; Gruppen-Entitäten stehen für alle ihre Mitglieder."""
+        registry = er.async_get(hass)
+        devices: list[VentoDevice] = []
+        for entity_id in entity_ids:
+            registry_entry = registry.async_get(entity_id)
+            if registry_entry is None or registry_entry.platform != DOMAIN:
+                raise HomeAssistantError(f"{entity_id} is not a Blauberg Vento entity")
+            target = hass.data[DOMAIN].get(registry_entry.config_entry_id)
+            members = target.devices if isinstance(target, VentoGroup) else [target]
+            devices.extend(device for device in members if device is not None and device not in devices)
+        return devices
+
+    async def async_start_capture(call: ServiceCall):
+        """Startet den Mitschnitt des UDP-Verkehrs (optional nur bestimmter Geräte)."""
+        path = call.data.get("path") or hass.config.path(f"{DOMAIN}_capture.bin")
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Path {path} is not allowed (allowlist_external_dirs)")
+        await get_coordinator().async_start_capture(CaptureWriter(
+            path, call.data["max_bytes"], call.data["backup_count"], call.data.get(CONF_DEVICE_ID)
+        ))
+
+    async def async_stop_capture(call: ServiceCall):
+        """Beendet den Mitschnitt."""
+        await get_coordinator().async_stop_capture()
+
+    async def async_dump_packets(call: ServiceCall):
+        """
+        Liefert die im Ringpuffer gehaltenen Datagramme (alle Lüfter oder die der angegebenen Entitäten);
+        erst hier werden sie formatiert und dekodiert.
+        """
+        coordinator = get_coordinator()
+        if ATTR_ENTITY_ID in call.data:
+            devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        else:
+            devices = list(coordinator.devices.values())
+        result = {}
+        for device in devices:
+            packets = device.client.metrics.packets
+            result[device.device_id] = format_packets(packets.records()) if packets is not None else []
+            for packet in result[device.device_id]:
+                _LOGGER.info(
+                    "[%s] %s %s %s %s", device.name, packet["time"], packet["direction"], packet["data"],
+                    packet.get("decoded", packet.get("error", "")),
+                )
+        return result
+
+    async def async_group_command(call: ServiceCall):
+        """
+        Schaltet mehrere Lüfter (oder Gruppen-Entitäten) gleichzeitig: alle Pakete werden vorab gebaut
+        und unmittelbar nacheinander gesendet. Liefert die erreichte Sendespanne (skew_ms).
+        """
+        coordinator = get_coordinator()
+        devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        params = fan_parameters(
+            call.data.get("turn_on"), call.data.get("percentage"), call.data.get("oscillating")
+        )
+        if not params:
+            raise HomeAssistantError("Nothing to do: set turn_on, percentage and/or oscillating")
+        return await coordinator.async_group_write(devices, params)
+
+    async def async_poll_schedule(call: ServiceCall):
+        """Liefert den Abfrageplan aller Lüfter (Phase, Intervall, nächste Abfrage)."""
+        return get_coordinator().poll_schedule()
+
+    async def async_get_schedule(call: ServiceCall):
+        """Liest den Wochenzeitplan der Lüfter vom Gerät."""
+        devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        schedules = await asyncio.gather(*(device.async_read_schedule() for device in devices))
+        result = {}
+        for device, schedule in zip(devices, schedules):
+            if schedule is None:
+                raise HomeAssistantError(f"No response from {device.name}")
+            result[device.device_id] = {
+                "enabled": device.data.get("weekly_schedule_enabled"),
+                "periods": [period.as_dict() for period in schedule],
+            }
+        return result
+
+    async def async_set_schedule(call: ServiceCall):
+        """
+        Schreibt Perioden des Wochenzeitplans und/oder schaltet ihn ein oder aus. Alle Einträge eines
+        Lüfters werden gebündelt in möglichst wenigen Paketen gesendet; danach schaltet der Lüfter selbst.
+        """
+        periods = [
+            SchedulePeriod(SCHEDULE_DAYS.index(item["day"]), item["period"], item["speed"],
+                           item["end"].hour, item["end"].minute)
+            for item in call.data["periods"]
+        ]
+        enabled = call.data.get("enabled")
+        if not periods and enabled is None:
+            raise HomeAssistantError("Nothing to do: set periods and/or enabled")
+        devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        results = await asyncio.gather(*(device.async_write_schedule(periods, enabled) for device in devices))
+        failed = [device.name for device, ok in zip(devices, results) if not ok]
+        if failed:
+            raise HomeAssistantError(f"Schedule write failed for {', '.join(failed)}")
+
+    def snapshot_path(call: ServiceCall) -> str:
+        path = call.data.get("path") or hass.config.path(f"{DOMAIN}_config.json")
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Path {path} is not allowed (allowlist_external_dirs)")
+        return path
+
+    async def async_snapshot_config(call: ServiceCall):
+        """
+        Speichert die Einstellungen und Wochenzeitpläne der Lüfter (alle oder die der Entitäten) in eine
+        versionierte JSON-Datei; jeder Lüfter wird mit möglichst wenigen READ-Paketen gelesen.
+        """
+        coordinator = get_coordinator()
+        path = snapshot_path(call)
+        if ATTR_ENTITY_ID in call.data:
+            devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        else:
+            devices = list(coordinator.devices.values())
+        snapshot = await coordinator.async_snapshot_config(devices)
+        failed = snapshot.pop("failed")
+        await hass.async_add_executor_job(dump_snapshot, path, snapshot)
+        _LOGGER.info("Saved configuration of %d fans to %s", len(snapshot["devices"]), path)
+        if failed and not call.return_response:
+            raise HomeAssistantError(f"No response from {', '.join(failed)}; saved the other fans to {path}")
+        return {**snapshot, "path": path, "failed": failed}
+
+    async def async_apply_config(call: ServiceCall):
+        """
+        Überträgt einen Konfigurationsabzug auf die Lüfter (alle im Abzug enthaltenen oder die der Entitäten)
+        und schreibt dabei nur abweichende Register; mit dry_run werden die Abweichungen nur gemeldet.
+        """
+        coordinator = get_coordinator()
+        path = snapshot_path(call)
+        try:
+            snapshot = await hass.async_add_executor_job(load_snapshot, path)
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Cannot read snapshot {path}: {err}") from err
+        if ATTR_ENTITY_ID in call.data:
+            devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        else:
+            devices = [device for device in coordinator.devices.values() if device.device_id in snapshot["devices"]]
+        source = call.data.get("source")
+        if source is not None and source not in snapshot["devices"]:
+            raise HomeAssistantError(f"{source} is not in snapshot {path}")
+        try:
+            result = await coordinator.async_apply_config(devices, snapshot, source, call.data["dry_run"])
+        except (KeyError, TypeError, ValueError) as err:
+            raise HomeAssistantError(f"Invalid snapshot {path}: {err}") from err
+        failed = [device_id for device_id, item in result.items() if "error" in item or item.get("verified") is False]
+        if failed and not call.return_response:
+            raise HomeAssistantError(f"Applying the configuration failed for {', '.join(failed)}")
+        return result
+
+    async def async_sync_clock(call: ServiceCall):
+        """Stellt die Uhren der Lüfter sofort auf die Ortszeit von Home Assistant."""
+        now = dt_util.now()
+        devices = resolve_devices(call.data[ATTR_ENTITY_ID])
+        results = await asyncio.gather(*(device.async_set_clock(now) for device in devices))
+        failed = [device.name for device, ok in zip(devices, results) if not ok]
+        if failed:
+            raise HomeAssistantError(f"Setting the clock failed for {', '.join(failed)}")
+
+    hass.services.async_register(DOMAIN, SERVICE_START_CAPTURE, async_start_capture, schema=START_CAPTURE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture)
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP_PACKETS, async_dump_packets,
+        schema=DUMP_PACKETS_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GROUP_COMMAND, async_group_command,
+        schema=GROUP_COMMAND_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_POLL_SCHEDULE, async_poll_schedule, supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_SCHEDULE, async_get_schedule,
+        schema=DEVICES_SCHEMA, supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_SET_SCHEDULE, async_set_schedule, schema=SET_SCHEDULE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SYNC_CLOCK, async_sync_clock, schema=DEVICES_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_SNAPSHOT_CONFIG, async_snapshot_config,
+        schema=SNAPSHOT_CONFIG_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_CONFIG, async_apply_config,
+        schema=APPLY_CONFIG_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """
     Wird aufgerufen, wenn ein neuer Config-Entry erstellt wird (über die UI).
-    Leitet den Setup-Prozess an die 'fan'-Plattform weiter.
+    Meldet den Lüfter beim gemeinsamen Koordinator an und leitet den Setup-Prozess
+    an die Plattformen (fan, sensor, binary_sensor, button, switch) weiter.
+    Gruppen-Entries erhalten nur eine Fan-Entität, die ihre Mitglieder gemeinsam schaltet.
     """
-    hass.data.setdefault(DOMAIN, {})
-    await hass.config_entries.async_forward_entry_setups(entry, ["fan"])
+    if CONF_MEMBERS in entry.data:
+        return await _async_setup_group_entry(hass, entry)
+
+    # Überprüfe, ob alle erforderlichen Konfigurationsparameter vorhanden sind
+    if not all(entry.data.get(key) for key in (CONF_IP_ADDRESS, CONF_DEVICE_ID, CONF_PASSWORD)):
+        _LOGGER.error("Missing required configuration parameters.")
+        return False
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    coordinator = domain_data.get(DATA_COORDINATOR)
+    if coordinator is None:
+        coordinator = domain_data[DATA_COORDINATOR] = BlaubergVentoCoordinator(hass)
+    device = domain_data[entry.entry_id] = await coordinator.async_add_entry(entry)
+    # Gruppen, zu denen der Lüfter gehört, folgen dem neu geladenen Gerät
+    async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Erste Abfrage im Hintergrund, danach fragt nur noch der gemeinsame Timer des Koordinators ab
+    coordinator.async_refresh_in_background(entry, device)
     return True
 
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Richtet eine Gruppe ein, sobald alle Mitglieder geladen sind."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    missing = [entry_id for entry_id in entry.data[CONF_MEMBERS] if entry_id not in domain_data]
+    if missing or DATA_COORDINATOR not in domain_data:
+        raise ConfigEntryNotReady(f"Group members are not set up yet: {missing}")
+    group = domain_data[entry.entry_id] = VentoGroup(entry.title, entry.data[CONF_MEMBERS], domain_data)
+    domain_data[DATA_COORDINATOR].async_set_controller(group, entry.options)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    await hass.config_entries.async_forward_entry_setups(entry, GROUP_PLATFORMS)
+    return True
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Übernimmt geänderte Optionen ohne Neuladen des Config-Entries."""
+    device = hass.data[DOMAIN][entry.entry_id]
+    hass.data[DOMAIN][DATA_COORDINATOR].async_set_controller(device, entry.options)
+    if isinstance(device, VentoGroup):
+        return
+    if CONF_MIN_GAP in entry.options:
+        device.queue.min_gap = entry.options[CONF_MIN_GAP] / 1000
+    if CONF_SYNC_CLOCK in entry.options:
+        device.sync_clock = entry.options[CONF_SYNC_CLOCK]
+    if CONF_POLL_MIN in entry.options:
+        hass.data[DOMAIN][DATA_COORDINATOR].async_set_poll_intervals(
+            device, entry.options[CONF_POLL_MIN], entry.options[CONF_POLL_MAX], entry.options[CONF_FAST_WINDOW]
+        )
+    if CONF_PACKET_BUFFER in entry.options:
+        size = entry.options[CONF_PACKET_BUFFER]
+        metrics = device.client.metrics
+        if (metrics.packets.size if metrics.packets is not None else 0) != size:
+            metrics.packets = PacketRing(size) if size > 0 else None
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """
     Wird aufgerufen, wenn ein Config-Entry entladen wird (z.B. bei Deinstallation).
     """
-    unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "fan")
+    if CONF_MEMBERS in entry.data:
+        unload_ok = await hass.config_entries.async_unload_platforms(entry, GROUP_PLATFORMS)
+        if unload_ok:
+            hass.data[DOMAIN].pop(entry.entry_id, None)
+        return unload_ok
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        domain_data = hass.data[DOMAIN]
+        domain_data.pop(entry.entry_id, None)
+        async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id))
+        if await domain_data[DATA_COORDINATOR].async_remove_entry(entry.entry_id):
+            domain_data.pop(DATA_COORDINATOR)
     return unload_ok
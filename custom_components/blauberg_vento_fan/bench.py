@@ -0,0 +1,257 @@
+# bench.py
+
+"""
+Reproduzierbare Benchmarks für Codec, Abfragezyklen und Befehlslaufzeiten.
+Die Geräte werden vom Emulator auf localhost bereitgestellt, es wird keine Hardware benötigt.
+
+Beispiele:
+    python bench.py --output results-0.2.0.json
+    python bench.py --devices 1 10 --cycles 20 --compare results-0.1.0.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .codec import FUNC_READ, FUNC_WRITE_READ, POLL_PARAMETERS, Encoder, decode
+    from .emulator import FaultProfile, VentoEmulator
+    from .udp_client import BlaubergVentoUDPClient, VentoTransport
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from codec import FUNC_READ, FUNC_WRITE_READ, POLL_PARAMETERS, Encoder, decode
+    from emulator import FaultProfile, VentoEmulator
+    from udp_client import BlaubergVentoUDPClient, VentoTransport
+
+# Pakete, die async_turn_on, async_set_percentage und async_oscillate senden
+COMMANDS = {
+    "async_turn_on": {0x01: 1},
+    "async_set_percentage": {0x02: 2},
+    "async_oscillate": {0xB7: 1},
+}
+
+SAMPLE_RESPONSE = bytes.fromhex(
+    "fdfd02103030343130303343353434363537313004313131310601010201b701d804"
+)
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99/max in Millisekunden."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q):
+        return round(ordered[min(last, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Standard-Executor, der zählt, wie viele Aufträge und Threads benutzt werden."""
+
+    def __init__(self):
+        super().__init__()
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+    @property
+    def threads(self) -> int:
+        return len(self._threads)
+
+
+class LoopLagMonitor:
+    """Misst, wie stark ein periodischer Timer in der Event-Loop verspätet läuft."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def stop(self) -> dict:
+        self._task.cancel()
+        return percentiles(self.samples)
+
+
+def bench_codec(number: int) -> dict:
+    """Mikrobenchmarks für Dekodierung und Paketaufbau."""
+    encoder = Encoder(b"0041003C54465710", b"1111")
+    results = {}
+    for name, func in (
+        ("decode", lambda: decode(SAMPLE_RESPONSE)),
+        ("encode_read", lambda: encoder.encode(FUNC_READ, POLL_PARAMETERS)),
+        ("encode_write", lambda: encoder.encode(FUNC_WRITE_READ, {0x01: 1, 0x02: 3, 0xB7: 1})),
+    ):
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[name] = {"ops_per_sec": round(number / best), "ns_per_op": round(best / number * 1e9)}
+    return results
+
+
+async def _async_timed(client: BlaubergVentoUDPClient, func: int, params: dict, samples: list, failures: list):
+    start = time.perf_counter()
+    frame = await client.async_send_command(func, params)
+    if frame is None:
+        failures.append(1)
+    else:
+        samples.append(time.perf_counter() - start)
+
+
+async def bench_fleet(devices: int, cycles: int, faults: FaultProfile, timeout: float) -> dict:
+    """Abfragezyklen und Befehlslaufzeiten gegen devices emulierte Geräte über einen gemeinsamen Socket."""
+    emulator = VentoEmulator()
+    await emulator.async_add_devices(devices, faults=faults, seed=devices)
+    transport = await VentoTransport.async_create()
+    clients = [
+        BlaubergVentoUDPClient(d["ip"], d["device_id"], d["password"], port=d["port"],
+                               timeout=timeout, transport=transport)
+        for d in emulator.inventory()
+    ]
+    executor = CountingExecutor()
+    asyncio.get_running_loop().set_default_executor(executor)
+    monitor = LoopLagMonitor()
+    monitor.start()
+    try:
+        poll_samples, poll_failures, cycle_times = [], [], []
+        start = time.perf_counter()
+        for _ in range(cycles):
+            cycle_start = time.perf_counter()
+            await asyncio.gather(*(
+                _async_timed(client, FUNC_READ, POLL_PARAMETERS, poll_samples, poll_failures)
+                for client in clients
+            ))
+            cycle_times.append(time.perf_counter() - cycle_start)
+        poll_elapsed = time.perf_counter() - start
+
+        commands = {}
+        for name, params in COMMANDS.items():
+            samples, failures = [], []
+            for _ in range(cycles):
+                await asyncio.gather(*(
+                    _async_timed(client, FUNC_WRITE_READ, params, samples, failures)
+                    for client in clients
+                ))
+            commands[name] = {"latency": percentiles(samples), "failures": len(failures)}
+
+        packets = 2 * (len(poll_samples) + len(poll_failures))
+        return {
+            "devices": devices,
+            "poll": {
+                "latency": percentiles(poll_samples),
+                "cycle": percentiles(cycle_times),
+                "failures": len(poll_failures),
+                "packets_per_sec": round(packets / poll_elapsed),
+            },
+            "commands": commands,
+            "loop_lag": monitor.stop(),
+            "executor": {"submitted": executor.submitted, "threads": executor.threads},
+            "threads_total": threading.active_count(),
+        }
+    finally:
+        transport.close()
+        emulator.close()
+        executor.shutdown(wait=False)
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """Stellt die wichtigsten Kennzahlen zweier Ergebnisdateien gegenüber."""
+    lines = []
+    for name, result in current["codec"].items():
+        old = baseline.get("codec", {}).get(name)
+        if old:
+            change = (result["ops_per_sec"] / old["ops_per_sec"] - 1) * 100
+            lines.append(f"codec {name:<14} {old['ops_per_sec']:>10} -> {result['ops_per_sec']:>10} ops/s ({change:+.1f} %)")
+    old_fleets = {fleet["devices"]: fleet for fleet in baseline.get("fleet", [])}
+    for fleet in current["fleet"]:
+        old = old_fleets.get(fleet["devices"])
+        if not old:
+            continue
+        for label, new_val, old_val in (
+            ("poll p95 ms", fleet["poll"]["latency"].get("p95_ms"), old["poll"]["latency"].get("p95_ms")),
+            ("poll pkt/s", fleet["poll"]["packets_per_sec"], old["poll"]["packets_per_sec"]),
+            ("loop lag p99 ms", fleet["loop_lag"].get("p99_ms"), old["loop_lag"].get("p99_ms")),
+        ):
+            lines.append(f"{fleet['devices']:>4} devices {label:<16} {old_val} -> {new_val}")
+    return lines
+
+
+def print_text(results: dict):
+    for name, result in results["codec"].items():
+        print(f"codec {name:<14} {result['ops_per_sec']:>10} ops/s")
+    for fleet in results["fleet"]:
+        poll = fleet["poll"]
+        print(
+            f"{fleet['devices']:>4} devices  poll p50/p95/p99 {poll['latency'].get('p50_ms')}/"
+            f"{poll['latency'].get('p95_ms')}/{poll['latency'].get('p99_ms')} ms  "
+            f"{poll['packets_per_sec']} pkt/s  failures {poll['failures']}  "
+            f"loop lag p99 {fleet['loop_lag'].get('p99_ms')} ms  executor jobs {fleet['executor']['submitted']}"
+        )
+        for name, command in fleet["commands"].items():
+            latency = command["latency"]
+            print(f"     {name:<22} p50/p95/p99 {latency.get('p50_ms')}/{latency.get('p95_ms')}/{latency.get('p99_ms')} ms")
+
+
+async def _async_main(args) -> dict:
+    faults = FaultProfile(latency=args.latency, jitter=args.jitter, loss=args.loss)
+    fleet = []
+    for devices in args.devices:
+        fleet.append(await bench_fleet(devices, args.cycles, faults, args.timeout))
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "cycles": args.cycles, "latency": args.latency, "jitter": args.jitter,
+            "loss": args.loss, "timeout": args.timeout,
+        },
+        "codec": bench_codec(args.codec_ops),
+        "fleet": fleet,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks für die Blauberg Vento Integration")
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--cycles", type=int, default=10, help="Abfragezyklen bzw. Befehle pro Gerät")
+    parser.add_argument("--latency", type=float, default=0.005, help="Antwortzeit der Geräte in Sekunden")
+    parser.add_argument("--jitter", type=float, default=0.002)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--codec-ops", type=int, default=100000)
+    parser.add_argument("--label", default="", help="z.B. Version oder Commit")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="mit einer früheren JSON-Ergebnisdatei vergleichen")
+    args = parser.parse_args()
+
+    results = asyncio.run(_async_main(args))
+    print_text(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            print("\n".join(compare(results, json.load(file))))
@@ -0,0 +1,88 @@
+# binary_sensor.py
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import VentoDevice
+from .entity import BlaubergVentoEntity
+
+
+@dataclass(frozen=True, kw_only=True)
+class BlaubergVentoBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Binärsensor, dessen Zustand aus dem Register-Schlüssel key der gemeinsamen Abfrage stammt."""
+    value_fn: Callable[[Any], bool] = bool
+
+
+BINARY_SENSORS: tuple[BlaubergVentoBinarySensorEntityDescription, ...] = (
+    BlaubergVentoBinarySensorEntityDescription(
+        key="filter_replacement_needed",
+        name="Filter replacement",
+        icon="mdi:air-filter",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
+    BlaubergVentoBinarySensorEntityDescription(
+        key="alarm_status",
+        name="Alarm",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        value_fn=lambda value: value != 0,
+    ),
+    BlaubergVentoBinarySensorEntityDescription(
+        key="boost_active",
+        name="Boost",
+        device_class=BinarySensorDeviceClass.RUNNING,
+    ),
+    BlaubergVentoBinarySensorEntityDescription(
+        key="humidity_over_setpoint",
+        name="Humidity above setpoint",
+        device_class=BinarySensorDeviceClass.MOISTURE,
+    ),
+    BlaubergVentoBinarySensorEntityDescription(
+        key="relay_sensor_active",
+        name="Relay sensor",
+        entity_registry_enabled_default=False,
+    ),
+    BlaubergVentoBinarySensorEntityDescription(
+        key="analog_over_setpoint",
+        name="0-10V sensor above setpoint",
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Legt die Binärsensoren eines Lüfters an; sie teilen sich die Abfrage des Lüfters."""
+    device: VentoDevice = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        BlaubergVentoBinarySensor(device, description) for description in BINARY_SENSORS
+    )
+
+
+class BlaubergVentoBinarySensor(BlaubergVentoEntity, BinarySensorEntity):
+    """Ein Statuswert aus der gemeinsamen Registerabfrage."""
+
+    entity_description: BlaubergVentoBinarySensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(self, device: VentoDevice, description: BlaubergVentoBinarySensorEntityDescription):
+        super().__init__(device)
+        self.entity_description = description
+        self._attr_unique_id = f"{self._device_id}_{description.key}"
+        self._snapshot_keys = (description.key,)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Zustand aus der letzten Abfrage."""
+        value = self._device.data.get(self.entity_description.key)
+        if value is None:
+            return None
+        return self.entity_description.value_fn(value)
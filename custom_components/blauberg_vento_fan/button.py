@@ -0,0 +1,60 @@
+# button.py
+
+from dataclasses import dataclass
+
+from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+
+from .codec import PARAM_ALARM_RESET, PARAM_FILTER_RESET
+from .const import DOMAIN
+from .coordinator import VentoDevice
+from .entity import BlaubergVentoEntity
+
+
+@dataclass(frozen=True, kw_only=True)
+class BlaubergVentoButtonEntityDescription(ButtonEntityDescription):
+    """Taste, die ein nur beschreibbares Register des Lüfters setzt."""
+    param_id: int
+
+
+BUTTONS: tuple[BlaubergVentoButtonEntityDescription, ...] = (
+    BlaubergVentoButtonEntityDescription(
+        key="filter_reset",
+        name="Reset filter timer",
+        icon="mdi:air-filter",
+        entity_category=EntityCategory.CONFIG,
+        param_id=PARAM_FILTER_RESET,
+    ),
+    BlaubergVentoButtonEntityDescription(
+        key="alarm_reset",
+        name="Reset alarms",
+        icon="mdi:alarm-light-off",
+        entity_category=EntityCategory.CONFIG,
+        param_id=PARAM_ALARM_RESET,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Legt die Tasten eines Lüfters an."""
+    device: VentoDevice = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(BlaubergVentoButton(device, description) for description in BUTTONS)
+
+
+class BlaubergVentoButton(BlaubergVentoEntity, ButtonEntity):
+    """Setzt z.B. den Filter-Timer oder die Alarme des Lüfters zurück."""
+
+    entity_description: BlaubergVentoButtonEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(self, device: VentoDevice, description: BlaubergVentoButtonEntityDescription):
+        super().__init__(device)
+        self.entity_description = description
+        self._attr_unique_id = f"{self._device_id}_{description.key}"
+
+    async def async_press(self) -> None:
+        """Schreibt das Register und liest danach den neuen Zustand (z.B. Filter-Restlaufzeit)."""
+        if await self._device.async_write({self.entity_description.param_id: 1}):
+            await self._device.async_refresh()
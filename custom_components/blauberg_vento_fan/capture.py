@@ -0,0 +1,391 @@
+# capture.py
+
+"""
+Mitschnitt und Wiedergabe des UDP-Verkehrs mit den Lüftern.
+
+Dateiformat (little endian):
+    Kopf:      b"VCAP", Version (1 Byte), Startzeit (double, Unix-Zeit)
+    Datensatz: Zeitstempel (double, Unix-Zeit), Richtung (1 Byte, 0 = gesendet, 1 = empfangen),
+               IPv4-Adresse (4 Byte), Port (2 Byte), Länge (2 Byte), Datagramm
+
+Die Datei wird wie bei RotatingFileHandler rotiert (capture.bin, capture.bin.1, ...).
+Aufgezeichnet wird in der Event-Loop nur in einen Puffer; geschrieben wird mit write_chunk,
+in Home Assistant im Executor.
+
+Unabhängig davon hält PacketRing je Gerät die letzten Datagramme im Speicher,
+formatiert werden sie erst bei Bedarf (Diagnose-Download, Dienst dump_packets).
+
+Beispiele:
+    python capture.py show capture.bin --device 0041003C54465710
+    python capture.py decode capture.bin --repeat 100
+    python capture.py serve capture.bin --port 4000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import time
+import timeit
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+try:
+    from .codec import ProtocolError, decode, describe
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from codec import ProtocolError, decode, describe
+
+MAGIC = b"VCAP"
+VERSION = 1
+DIRECTION_TX = 0
+DIRECTION_RX = 1
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_RING_SIZE = 50
+# Obergrenze des Puffers zwischen zwei Schreibvorgängen; darüber werden Datensätze verworfen
+MAX_BUFFER = 4 * 1024 * 1024
+
+_HEADER = struct.Struct("<4sBd")
+_RECORD = struct.Struct("<dB4sHH")
+
+
+class Record(NamedTuple):
+    """Ein aufgezeichnetes Datagramm."""
+    timestamp: float
+    direction: int
+    ip: str
+    port: int
+    data: bytes
+
+    @property
+    def device_id(self) -> str:
+        """DeviceID aus dem Paketkopf (leer bei unlesbarem Paket)."""
+        data = self.data
+        if len(data) < 4 or len(data) < 4 + data[3]:
+            return ""
+        return data[4:4 + data[3]].decode("ascii", "replace")
+
+
+class PacketRing:
+    """
+    Ringpuffer fester Größe mit den letzten gesendeten und empfangenen Datagrammen eines Geräts.
+    Die Plätze werden beim Anlegen reserviert; record() speichert nur Zeitstempel, Richtung und
+    die unveränderten Bytes. Formatiert wird erst in format_packets.
+    """
+
+    __slots__ = ("size", "count", "_times", "_directions", "_data", "_index")
+
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
+        self.size = size
+        self.count = 0
+        self._times = [0.0] * size
+        self._directions = bytearray(size)
+        self._data: list[bytes | None] = [None] * size
+        self._index = 0
+
+    def record(self, direction: int, data: bytes):
+        index = self._index
+        self._times[index] = time.time()
+        self._directions[index] = direction
+        self._data[index] = data
+        self._index = index + 1 if index + 1 < self.size else 0
+        self.count += 1
+
+    def records(self) -> list[Record]:
+        """Die gespeicherten Datagramme, ältestes zuerst (ohne Adresse)."""
+        filled = min(self.count, self.size)
+        start = (self._index - filled) % self.size if self.size else 0
+        return [
+            Record(self._times[i], self._directions[i], "", 0, self._data[i])
+            for i in ((start + offset) % self.size for offset in range(filled))
+        ]
+
+
+def format_packets(records: Iterable[Record]) -> list[dict]:
+    """Lesbare Form von Datensätzen: Zeit, Richtung, Bytes und bei Antworten die dekodierten Werte."""
+    result = []
+    for record in records:
+        item = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.timestamp))
+                    + f".{int(record.timestamp * 1000) % 1000:03d}",
+            "direction": "tx" if record.direction == DIRECTION_TX else "rx",
+            "data": record.data.hex(" "),
+        }
+        if record.direction == DIRECTION_RX:
+            try:
+                item["decoded"] = describe(decode(record.data).params)
+            except ProtocolError as err:
+                item["error"] = err.reason
+        result.append(item)
+    return result
+
+
+class CaptureWriter:
+    """
+    Zeichnet Datagramme auf. record() wird aus der Event-Loop aufgerufen und füllt nur einen Puffer;
+    drain() entnimmt die gesammelten Datensätze, write_chunk() schreibt sie (blockierend) in die Datei.
+    Mit device_ids werden nur Pakete dieser Geräte aufgezeichnet.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT, device_ids: Iterable[str] | None = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.device_ids = {device_id.encode("ascii") for device_id in device_ids} if device_ids else None
+        self.records = 0
+        self.dropped = 0
+        self._buffer = bytearray()
+        self._file = None
+        self._size = 0
+
+    def record(self, direction: int, addr, data: bytes):
+        """Nimmt ein gesendetes oder empfangenes Datagramm in den Puffer auf."""
+        if self.device_ids is not None and (len(data) < 4 or data[4:4 + data[3]] not in self.device_ids):
+            return
+        if len(self._buffer) > MAX_BUFFER:
+            self.dropped += 1
+            return
+        try:
+            ip = socket.inet_aton(addr[0])
+        except OSError:
+            ip = bytes(4)
+        self._buffer += _RECORD.pack(time.time(), direction, ip, addr[1], len(data))
+        self._buffer += data
+        self.records += 1
+
+    def drain(self) -> bytes:
+        """Entnimmt alle gepufferten Datensätze (in der Event-Loop aufrufen)."""
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+    def write_chunk(self, chunk: bytes):
+        """Schreibt Datensätze in die Datei und rotiert vorher bei Bedarf (blockierend)."""
+        if not chunk:
+            return
+        if self._file is None:
+            self._open()
+        elif self._size + len(chunk) > self.max_bytes:
+            self._rotate()
+        self._file.write(chunk)
+        self._file.flush()
+        self._size += len(chunk)
+
+    def flush(self):
+        """Schreibt den Puffer sofort (nur außerhalb von Home Assistant oder im Executor verwenden)."""
+        self.write_chunk(self.drain())
+
+    def close(self):
+        """Schließt die Datei (blockierend)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, time.time()))
+        self._size = _HEADER.size
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._open()
+
+
+def capture_files(path: str) -> list[str]:
+    """Die Dateien eines Mitschnitts in zeitlicher Reihenfolge (älteste Rotation zuerst)."""
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.append(f"{path}.{index}")
+        index += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_capture(path: str, device_id: str | None = None) -> Iterator[Record]:
+    """Liest alle Datensätze einer Datei (ohne Rotationen), optional nur eines Geräts."""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, _ = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} ist kein Mitschnitt im Format {MAGIC!r} v{VERSION}")
+    idx = _HEADER.size
+    end = len(data)
+    while idx + _RECORD.size <= end:
+        timestamp, direction, ip, port, length = _RECORD.unpack_from(data, idx)
+        idx += _RECORD.size
+        if idx + length > end:
+            break  # Unvollständiger letzter Datensatz, z.B. nach einem Absturz
+        record = Record(timestamp, direction, socket.inet_ntoa(ip), port, data[idx:idx + length])
+        idx += length
+        if device_id is None or record.device_id == device_id:
+            yield record
+
+
+def read_captures(path: str, device_id: str | None = None) -> Iterator[Record]:
+    """Liest einen Mitschnitt samt aller Rotationen."""
+    for file in capture_files(path):
+        yield from read_capture(file, device_id)
+
+
+def replay_decode(records: Iterable[Record], repeat: int = 1) -> dict:
+    """
+    Dekodiert alle empfangenen Datagramme so schnell wie möglich, z.B. zum Vermessen des Codecs
+    mit echtem Verkehr. Liefert Anzahl, Fehler je ProtocolError.reason und Durchsatz.
+    """
+    packets = [record.data for record in records if record.direction == DIRECTION_RX]
+    errors: dict[str, int] = {}
+    for data in packets:
+        try:
+            decode(data)
+        except ProtocolError as err:
+            errors[err.reason] = errors.get(err.reason, 0) + 1
+
+    def run():
+        for data in packets:
+            try:
+                decode(data)
+            except ProtocolError:
+                pass
+
+    elapsed = min(timeit.repeat(run, number=repeat, repeat=3)) if packets else 0.0
+    total = len(packets) * repeat
+    return {
+        "packets": len(packets),
+        "errors": errors,
+        "ops_per_sec": round(total / elapsed) if elapsed else None,
+        "bytes_per_packet": round(sum(map(len, packets)) / len(packets), 1) if packets else None,
+    }
+
+
+class ReplayDevice(asyncio.DatagramProtocol):
+    """
+    Spielt die aufgezeichneten Antworten eines Geräts mit der aufgezeichneten Antwortzeit ab.
+    Eine Anfrage wird der nächsten aufgezeichneten Anfrage mit identischem Inhalt zugeordnet,
+    sonst der nächsten überhaupt; unbeantwortete Anfragen im Mitschnitt bleiben auch hier unbeantwortet.
+    """
+
+    def __init__(self, records: Iterable[Record], speed: float = 1.0):
+        self.exchanges: list[tuple[bytes, float, bytes | None]] = []
+        self.speed = speed
+        self.transport = None
+        self._position = 0
+        pending = None
+        for record in records:
+            if record.direction == DIRECTION_TX:
+                if pending is not None:
+                    self.exchanges.append((pending.data, 0.0, None))
+                pending = record
+            elif pending is not None:
+                self.exchanges.append((pending.data, record.timestamp - pending.timestamp, record.data))
+                pending = None
+        if pending is not None:
+            self.exchanges.append((pending.data, 0.0, None))
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        if not self.exchanges:
+            return
+        index = next(
+            (i for i in range(self._position, len(self.exchanges)) if self.exchanges[i][0] == data),
+            self._position % len(self.exchanges),
+        )
+        self._position = (index + 1) % len(self.exchanges)
+        _, delay, response = self.exchanges[index]
+        if response is None:
+            return
+        asyncio.get_running_loop().call_later(
+            max(0.0, delay) / self.speed, self._send, response, addr
+        )
+
+    def _send(self, response: bytes, addr):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(response, addr)
+
+
+async def async_serve(path: str, host: str = "127.0.0.1", port: int = 0, speed: float = 1.0) -> list:
+    """Startet für jedes Gerät im Mitschnitt ein ReplayDevice; liefert [(DeviceID, Port, Transport), ...]."""
+    by_device: dict[str, list[Record]] = {}
+    for record in read_captures(path):
+        if record.device_id:
+            by_device.setdefault(record.device_id, []).append(record)
+    loop = asyncio.get_running_loop()
+    served = []
+    for index, (device_id, records) in enumerate(sorted(by_device.items())):
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda records=records: ReplayDevice(records, speed),
+            local_addr=(host, port + index if port else 0),
+        )
+        served.append((device_id, transport.get_extra_info("sockname")[1], transport))
+    return served
+
+
+async def _async_serve_main(args):
+    served = await async_serve(args.file, args.host, args.port, args.speed)
+    print(json.dumps([
+        {"ip": args.host, "port": port, "device_id": device_id, "password": args.password}
+        for device_id, port, _ in served
+    ], indent=2), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for _, _, transport in served:
+            transport.close()
+
+
+def _show(args):
+    for record in read_captures(args.file, args.device):
+        direction = ">" if record.direction == DIRECTION_TX else "<"
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.timestamp))
+        line = f"{stamp}.{int(record.timestamp * 1000) % 1000:03d} {direction} {record.ip}:{record.port} {record.data.hex()}"
+        if record.direction == DIRECTION_RX:
+            try:
+                line += f" => {describe(decode(record.data).params)}"
+            except ProtocolError as err:
+                line += f" => {err.reason}"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mitschnitte der Blauberg Vento Integration auswerten")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    show = subparsers.add_parser("show", help="Datensätze lesbar ausgeben")
+    show.add_argument("file")
+    show.add_argument("--device", help="nur diese DeviceID")
+    bench = subparsers.add_parser("decode", help="empfangene Pakete mit voller Geschwindigkeit dekodieren")
+    bench.add_argument("file")
+    bench.add_argument("--device", help="nur diese DeviceID")
+    bench.add_argument("--repeat", type=int, default=100)
+    serve = subparsers.add_parser("serve", help="Geräte aus dem Mitschnitt mit aufgezeichneter Antwortzeit nachbilden")
+    serve.add_argument("file")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=0, help="erster Port, 0 = beliebige Ports")
+    serve.add_argument("--speed", type=float, default=1.0, help="Faktor für die Wiedergabegeschwindigkeit")
+    serve.add_argument("--password", default="1111", help="nur für die ausgegebene Geräteliste")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        _show(args)
+    elif args.command == "decode":
+        print(json.dumps(replay_decode(read_captures(args.file, args.device), args.repeat), indent=2))
+    else:
+        try:
+            asyncio.run(_async_serve_main(args))
+        except KeyboardInterrupt:
+            pass
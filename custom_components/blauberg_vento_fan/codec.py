@@ -0,0 +1,579 @@
+# codec.py
+
+"""
+Kodierung und Dekodierung des Blauberg-/Vento-Protokolls.
+Rahmen: Start (0xFD 0xFD), Protokolltyp (0x02), ID, Passwort, Funktion, Parameter, Checksumme.
+Das Modul hat keine Abhängigkeit zu Home Assistant und wird auch von den Werkzeugen genutzt.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Sequence
+
+FRAME_START             = b"\xFD\xFD"
+PROTOCOL_TYPE           = 0x02
+
+# Funktionen
+FUNC_READ               = 0x01
+FUNC_WRITE              = 0x02   # ohne Antwort
+FUNC_WRITE_READ         = 0x03   # mit Antwort (0x06)
+FUNC_INCREMENT          = 0x04
+FUNC_DECREMENT          = 0x05
+FUNC_RESPONSE           = 0x06
+
+# Sonderbefehle im Datenbereich
+BGCP_CMD_PAGE           = 0xFF
+BGCP_CMD_FUNC           = 0xFC
+BGCP_CMD_SIZE           = 0xFE
+BGCP_CMD_NOT_SUP        = 0xFD
+
+# Größte Paketlänge, die die Lüfter annehmen bzw. senden
+MAX_PACKET_SIZE         = 256
+
+# Parameter (Seite << 8 | Nummer), laut Herstellerdokumentation "Vento Expert W V.2"
+PARAM_UNIT_ON_OFF        = 0x01   # 0=Off, 1=On
+PARAM_SPEED_NUMBER       = 0x02   # 1..3
+PARAM_BOOST_STATUS       = 0x06
+PARAM_TIMER_MODE         = 0x07   # 0=Aus, 1=Nacht, 2=Party
+PARAM_TIMER_COUNTDOWN    = 0x0B
+PARAM_HUMIDITY_SENSOR    = 0x0F   # Feuchtesensor aktiv
+PARAM_RELAY_SENSOR       = 0x14
+PARAM_ANALOG_SENSOR      = 0x16   # 0-10V-Sensor aktiv
+PARAM_HUMIDITY_SETPOINT  = 0x19   # 40..80 %
+PARAM_RTC_BATTERY        = 0x24   # mV
+PARAM_HUMIDITY           = 0x25   # %
+PARAM_ANALOG_VALUE       = 0x2D   # 0..100 %
+PARAM_RELAY_STATUS       = 0x32
+PARAM_MANUAL_SPEED       = 0x44   # 0..255
+PARAM_FAN1_RPM           = 0x4A
+PARAM_FAN2_RPM           = 0x4B
+PARAM_FILTER_COUNTDOWN   = 0x64
+PARAM_FILTER_RESET       = 0x65   # nur schreiben
+PARAM_BOOST_DELAY        = 0x66   # Minuten
+PARAM_RTC_TIME           = 0x6F   # Sekunden, Minuten, Stunden
+PARAM_RTC_CALENDAR       = 0x70   # Tag, Wochentag (1=Mo), Monat, Jahr (zweistellig)
+PARAM_WEEKLY_SCHEDULE    = 0x72   # Wochenzeitplan aktiv
+PARAM_SCHEDULE_PERIOD    = 0x77   # Eintrag des Wochenzeitplans, siehe SchedulePeriod
+PARAM_DEVICE_SEARCH      = 0x7C   # DeviceID
+PARAM_MACHINE_HOURS      = 0x7E
+PARAM_ALARM_RESET        = 0x80   # nur schreiben
+PARAM_ALARM_STATUS       = 0x83   # 0=Keine, 1=Alarm, 2=Warnung
+PARAM_FIRMWARE           = 0x86
+PARAM_FILTER_INDICATOR   = 0x88   # 1=Filter wechseln
+PARAM_VENTILATION_MODE   = 0xB7   # 0=Ventilation, 1=Heat Recovery, 2=Supply
+PARAM_UNIT_TYPE          = 0xB9
+PARAM_NIGHT_TIMER        = 0x0302
+PARAM_PARTY_TIMER        = 0x0303
+PARAM_HUMIDITY_OVER      = 0x0304
+PARAM_ANALOG_OVER        = 0x0305
+
+# Gründe für verworfene Pakete (ProtocolError.reason)
+ERROR_TOO_SHORT         = "too_short"
+ERROR_START_BYTES       = "start_bytes"
+ERROR_PROTOCOL_TYPE     = "protocol_type"
+ERROR_ID_LENGTH         = "id_length"
+ERROR_PASSWORD_LENGTH   = "password_length"
+ERROR_CHECKSUM          = "checksum"
+ERROR_INCOMPLETE_BLOCK  = "incomplete_block"
+ERROR_REASONS = (
+    ERROR_TOO_SHORT, ERROR_START_BYTES, ERROR_PROTOCOL_TYPE, ERROR_ID_LENGTH,
+    ERROR_PASSWORD_LENGTH, ERROR_CHECKSUM, ERROR_INCOMPLETE_BLOCK,
+)
+
+
+class ProtocolError(ValueError):
+    """Ein empfangenes Paket entspricht nicht dem Protokoll."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class ParamDescriptor(NamedTuple):
+    """
+    Beschreibt, unter welchem Schlüssel und wie ein Parameterwert dekodiert wird.
+    Einbytige Werte werden als int übergeben, mehrbytige (0xFE-Block) als memoryview.
+    Für einbytige Parameter berechnet decode() alle 256 Werte vorab; decode muss dort allein vom Wert abhängen.
+    poll: wird bei jeder regelmäßigen Abfrage gelesen.
+    readable/writable: vom Gerät lesbar bzw. beschreibbar.
+    repeat: mehrbytiger Parameter, der in einem Paket mehrfach vorkommen darf (z.B. Zeitplaneinträge);
+    die dekodierten Werte werden unter key als Liste gesammelt.
+    """
+    key: str
+    decode: Callable[[Any], Any]
+    size: int = 1
+    poll: bool = False
+    writable: bool = False
+    readable: bool = True
+    repeat: bool = False
+
+
+# Tage eines Zeitplaneintrags (Index = Wert im Paket): einzelne Wochentage und Tagesgruppen
+SCHEDULE_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun", "weekdays", "weekend", "all")
+SCHEDULE_WEEKDAYS = 7
+SCHEDULE_PERIODS = 4
+
+
+class SchedulePeriod(NamedTuple):
+    """
+    Eintrag des Wochenzeitplans (Parameter 0x77): Periode period (1..4) eines Tages läuft bis
+    end_hour:end_minute auf Stufe speed (0 = Standby). day ist der Index in SCHEDULE_DAYS;
+    beim Schreiben setzen die Tagesgruppen (weekdays, weekend, all) mehrere Tage auf einmal.
+    """
+    day: int
+    period: int
+    speed: int
+    end_hour: int
+    end_minute: int
+
+    def to_bytes(self) -> bytes:
+        """Wert im Paket: Tag, Periode, Stufe, reserviert, Minuten, Stunden."""
+        return bytes((self.day, self.period, self.speed, 0, self.end_minute, self.end_hour))
+
+    def as_dict(self) -> dict:
+        return {
+            "day": SCHEDULE_DAYS[self.day],
+            "period": self.period,
+            "speed": self.speed,
+            "end": f"{self.end_hour:02d}:{self.end_minute:02d}",
+        }
+
+
+_VENTILATION_MODES = {0: "Ventilation", 1: "Heat Recovery", 2: "Supply"}
+
+
+def _decode_ventilation_mode(value: int) -> str:
+    return _VENTILATION_MODES.get(value, f"Unknown ({value})")
+
+
+def _decode_u16(value: memoryview) -> int:
+    return int.from_bytes(value, "little")
+
+
+def _decode_countdown_seconds(value: memoryview) -> int:
+    """Sekunden, Minuten, Stunden -> Sekunden."""
+    return value[0] + 60 * value[1] + 3600 * value[2]
+
+
+def _decode_filter_days(value: memoryview) -> float:
+    """Minuten, Stunden, Tage -> Tage."""
+    return round(value[2] + value[1] / 24 + value[0] / 1440, 2)
+
+
+def _decode_machine_hours(value: memoryview) -> float:
+    """Minuten, Stunden, Tage (2 Bytes) -> Stunden."""
+    return round(int.from_bytes(value[2:4], "little") * 24 + value[1] + value[0] / 60, 2)
+
+
+def _decode_timer_setpoint(value: memoryview) -> int:
+    """Minuten, Stunden -> Minuten."""
+    return value[0] + 60 * value[1]
+
+
+def _decode_firmware(value: memoryview) -> str:
+    """Hauptversion, Nebenversion, Tag, Monat, Jahr (2 Bytes)."""
+    year = int.from_bytes(value[4:6], "little")
+    return f"{value[0]}.{value[1]} ({year:04d}-{value[3]:02d}-{value[2]:02d})"
+
+
+def _decode_ascii(value: memoryview) -> str:
+    return bytes(value).decode("ascii", "replace")
+
+
+def _decode_rtc_time(value: memoryview) -> str:
+    """Sekunden, Minuten, Stunden -> "HH:MM:SS"."""
+    return f"{value[2]:02d}:{value[1]:02d}:{value[0]:02d}"
+
+
+def _decode_rtc_calendar(value: memoryview) -> str:
+    """Tag, Wochentag, Monat, Jahr (zweistellig) -> "JJJJ-MM-TT"."""
+    return f"{2000 + value[3]:04d}-{value[2]:02d}-{value[0]:02d}"
+
+
+def _decode_schedule_period(value: memoryview) -> SchedulePeriod:
+    return SchedulePeriod(value[0], value[1], value[2], value[5], value[4])
+
+
+# Parameternummer (Seite << 8 | Nummer) -> Beschreibung
+PARAMETERS: dict[int, ParamDescriptor] = {
+    PARAM_UNIT_ON_OFF: ParamDescriptor("unit_on_off", bool, poll=True, writable=True),
+    PARAM_SPEED_NUMBER: ParamDescriptor("speed_number", lambda v: v * 33, poll=True, writable=True),  # Beispielhafte Umrechnung
+    PARAM_BOOST_STATUS: ParamDescriptor("boost_active", bool, poll=True),
+    PARAM_TIMER_MODE: ParamDescriptor("timer_mode", int, poll=True, writable=True),
+    PARAM_TIMER_COUNTDOWN: ParamDescriptor("timer_countdown", _decode_countdown_seconds, 3, poll=True),
+    PARAM_HUMIDITY_SENSOR: ParamDescriptor("humidity_sensor_enabled", int, writable=True),
+    PARAM_RELAY_SENSOR: ParamDescriptor("relay_sensor_enabled", int, writable=True),
+    PARAM_ANALOG_SENSOR: ParamDescriptor("analog_sensor_enabled", int, writable=True),
+    PARAM_HUMIDITY_SETPOINT: ParamDescriptor("humidity_setpoint", int, writable=True),
+    PARAM_RTC_BATTERY: ParamDescriptor("rtc_battery_voltage", _decode_u16, 2, poll=True),
+    PARAM_HUMIDITY: ParamDescriptor("humidity", int, poll=True),
+    PARAM_ANALOG_VALUE: ParamDescriptor("analog_sensor_value", int, poll=True),
+    PARAM_RELAY_STATUS: ParamDescriptor("relay_sensor_active", bool, poll=True),
+    PARAM_MANUAL_SPEED: ParamDescriptor("manual_speed", int, writable=True),
+    PARAM_FAN1_RPM: ParamDescriptor("fan1_rpm", _decode_u16, 2, poll=True),
+    PARAM_FAN2_RPM: ParamDescriptor("fan2_rpm", _decode_u16, 2, poll=True),
+    PARAM_FILTER_COUNTDOWN: ParamDescriptor("filter_days_remaining", _decode_filter_days, 3, poll=True),
+    PARAM_FILTER_RESET: ParamDescriptor("filter_reset", int, writable=True, readable=False),
+    PARAM_BOOST_DELAY: ParamDescriptor("boost_delay", int, writable=True),
+    PARAM_RTC_TIME: ParamDescriptor("rtc_time", _decode_rtc_time, 3, writable=True),
+    PARAM_RTC_CALENDAR: ParamDescriptor("rtc_calendar", _decode_rtc_calendar, 4, writable=True),
+    PARAM_WEEKLY_SCHEDULE: ParamDescriptor("weekly_schedule_enabled", bool, poll=True, writable=True),
+    PARAM_SCHEDULE_PERIOD: ParamDescriptor("schedule", _decode_schedule_period, 6, writable=True, repeat=True),
+    PARAM_DEVICE_SEARCH: ParamDescriptor("device_id", _decode_ascii, 16),
+    PARAM_MACHINE_HOURS: ParamDescriptor("machine_hours", _decode_machine_hours, 4, poll=True),
+    PARAM_ALARM_RESET: ParamDescriptor("alarm_reset", int, writable=True, readable=False),
+    PARAM_ALARM_STATUS: ParamDescriptor("alarm_status", int, poll=True),
+    PARAM_FIRMWARE: ParamDescriptor("firmware", _decode_firmware, 6),
+    PARAM_FILTER_INDICATOR: ParamDescriptor("filter_replacement_needed", bool, poll=True),
+    PARAM_VENTILATION_MODE: ParamDescriptor("ventilation_mode", _decode_ventilation_mode, poll=True, writable=True),
+    PARAM_UNIT_TYPE: ParamDescriptor("unit_type", _decode_u16, 2),
+    PARAM_NIGHT_TIMER: ParamDescriptor("night_timer_setpoint", _decode_timer_setpoint, 2, writable=True),
+    PARAM_PARTY_TIMER: ParamDescriptor("party_timer_setpoint", _decode_timer_setpoint, 2, writable=True),
+    PARAM_HUMIDITY_OVER: ParamDescriptor("humidity_over_setpoint", bool, poll=True),
+    PARAM_ANALOG_OVER: ParamDescriptor("analog_over_setpoint", bool, poll=True),
+}
+
+# Parameter einer regelmäßigen Abfrage; werden gemeinsam in einem READ-Paket gelesen
+POLL_PARAMETERS: tuple[int, ...] = tuple(
+    param_id for param_id, descriptor in PARAMETERS.items() if descriptor.poll
+)
+
+# Einstellungen eines Lüfters für einen Konfigurationsabzug (snapshot.py): beschreibbare und lesbare Register
+# ohne Uhr, Ein/Aus und laufenden Timer; Zeitplaneinträge werden getrennt gelesen
+CONFIG_PARAMETERS: tuple[int, ...] = tuple(
+    param_id for param_id, descriptor in PARAMETERS.items()
+    if descriptor.writable and descriptor.readable and not descriptor.repeat
+    and param_id not in (PARAM_UNIT_ON_OFF, PARAM_TIMER_MODE, PARAM_RTC_TIME, PARAM_RTC_CALENDAR)
+)
+
+# Parameter, die eine Fähigkeitsprüfung liest; Zeitplaneinträge brauchen eine Adresse und fehlen daher
+READABLE_PARAMETERS: tuple[int, ...] = tuple(
+    param_id for param_id, descriptor in PARAMETERS.items() if descriptor.readable and not descriptor.repeat
+)
+
+
+class Frame(NamedTuple):
+    """Ein dekodiertes Paket."""
+    device_id: bytes
+    func: int
+    params: dict
+    # Parameternummern, die die Antwort als "nicht unterstützt" (0xFD) markiert; VentoTransport ergänzt
+    # die in einer Antwort auf READ ausgelassenen
+    unsupported: list
+    # Alle in der Antwort enthaltenen Parameternummern in Paketreihenfolge,
+    # zur Zuordnung zu offenen Anfragen
+    ids: list
+    raw: bytes
+
+
+# Umgeht den in Python erzeugten NamedTuple-Konstruktor (Hot Path beim Empfang)
+_new_frame = tuple.__new__
+
+
+def _byte_value_pages(descriptors: Mapping[int, ParamDescriptor]) -> dict[int, list]:
+    """
+    Vorab dekodierte Werte der einbytigen Parameter: je Seite eine Liste über die Nummer (0..255)
+    mit (Schlüssel, dekodierte Werte aller 256 Bytes) oder None.
+    """
+    pages: dict[int, list] = {}
+    for param_id, descriptor in descriptors.items():
+        if descriptor.size == 1:
+            pages.setdefault(param_id >> 8, [None] * 256)[param_id & 0xFF] = (
+                descriptor.key, tuple(descriptor.decode(value) for value in range(256))
+            )
+    return pages
+
+
+# Für die Standard-Beschreibungstabelle spart decode() damit je Parameter den Aufruf der Umrechnung
+_BYTE_VALUE_PAGES = _byte_value_pages(PARAMETERS)
+_NO_BYTE_VALUES = [None] * 256
+
+
+def decode(data: bytes, descriptors: Mapping[int, ParamDescriptor] = PARAMETERS) -> Frame:
+    """
+    Dekodiert ein Paket in einem einzigen Durchlauf.
+    Mehrbytige Werte (0xFE-Blöcke) werden als memoryview-Ausschnitt ohne Kopie an die
+    Beschreibung übergeben. Bekannte Parameter landen unter ihrem Schlüssel aus der
+    Beschreibungstabelle, unbekannte unter ihrer Nummer (int bzw. bytes bei 0xFE-Blöcken).
+    Löst ProtocolError aus, wenn das Paket verworfen werden muss.
+    """
+    length = len(data)
+    if length < 8:
+        raise ProtocolError(ERROR_TOO_SHORT, f"Received response is too short: {length} bytes")
+    if data[0] != 0xFD or data[1] != 0xFD:
+        raise ProtocolError(ERROR_START_BYTES, "Ungültige Startbytes in der Antwort.")
+    if data[2] != PROTOCOL_TYPE:
+        raise ProtocolError(ERROR_PROTOCOL_TYPE, f"Ungültiger Protokolltyp: {data[2]:02x}")
+
+    idx = 4 + data[3]
+    if idx >= length:
+        raise ProtocolError(ERROR_ID_LENGTH, "DeviceID-Länge überschreitet die Antwortlänge.")
+    device_id = data[4:idx]
+    idx += 1 + data[idx]
+    end = length - 2
+    if idx >= end:
+        raise ProtocolError(ERROR_PASSWORD_LENGTH, "Passwort-Länge überschreitet die Antwortlänge.")
+    func = data[idx]
+    idx += 1
+
+    checksum = sum(data[2:end])
+    if data[end] != (checksum & 0xFF) or data[end + 1] != ((checksum >> 8) & 0xFF):
+        raise ProtocolError(ERROR_CHECKSUM, "Checksumme stimmt nicht überein.")
+
+    params = {}
+    unsupported = []
+    ids = []
+    page = 0
+    view = None
+    get_descriptor = descriptors.get
+    byte_pages = _BYTE_VALUE_PAGES if descriptors is PARAMETERS else {}
+    byte_row = byte_pages.get(0, _NO_BYTE_VALUES)
+    while idx < end:
+        b = data[idx]
+        if b < BGCP_CMD_FUNC:  # Normales Param + Wert (2 Bytes)
+            if idx + 1 >= end:
+                break
+            param_id = page | b
+            ids.append(param_id)
+            byte_values = byte_row[b]
+            if byte_values is not None:
+                params[byte_values[0]] = byte_values[1][data[idx + 1]]
+                idx += 2
+                continue
+            value = data[idx + 1]
+            idx += 2
+            descriptor = get_descriptor(param_id)
+            if descriptor is None:
+                params[param_id] = value
+            elif descriptor.size == 1:
+                params[descriptor.key] = descriptor.decode(value)
+            else:
+                # Mehrbytiger Parameter, den das Gerät ohne 0xFE-Block geschickt hat
+                params[descriptor.key] = descriptor.decode(_padded(bytes((value,)), descriptor.size))
+        elif b == BGCP_CMD_SIZE:  # 0xFE: Größe, Nummer, Wert
+            if idx + 2 >= end:
+                raise ProtocolError(ERROR_INCOMPLETE_BLOCK, "Unvollständiges Parameter-Block gefunden.")
+            if view is None:
+                view = memoryview(data)
+            size = data[idx + 1]
+            if idx + 3 + size > end:
+                raise ProtocolError(ERROR_INCOMPLETE_BLOCK, "Parameter-Block ragt über das Paketende hinaus.")
+            param_id = page | data[idx + 2]
+            block = view[idx + 3:idx + 3 + size]
+            idx += 3 + size
+            ids.append(param_id)
+            descriptor = get_descriptor(param_id)
+            if descriptor is None:
+                params[param_id] = bytes(block)
+            elif descriptor.repeat:
+                params.setdefault(descriptor.key, []).append(
+                    descriptor.decode(block if len(block) >= descriptor.size
+                                      else _padded(bytes(block), descriptor.size))
+                )
+            elif descriptor.size == 1:
+                params[descriptor.key] = descriptor.decode(block[0] if block else 0)
+            elif len(block) < descriptor.size:
+                params[descriptor.key] = descriptor.decode(_padded(bytes(block), descriptor.size))
+            else:
+                params[descriptor.key] = descriptor.decode(block)
+        elif b == BGCP_CMD_PAGE:  # 0xFF: Seitenwechsel für alle folgenden Parameter
+            if idx + 1 < end:
+                page = data[idx + 1] << 8
+                byte_row = byte_pages.get(data[idx + 1], _NO_BYTE_VALUES)
+            idx += 2
+        elif b == BGCP_CMD_NOT_SUP:  # 0xFD: Parameter wird nicht unterstützt
+            if idx + 1 < end:
+                param_id = page | data[idx + 1]
+                unsupported.append(param_id)
+                ids.append(param_id)
+            idx += 2
+        else:  # 0xFC: Funktionswechsel innerhalb des Pakets
+            if idx + 1 < end:
+                func = data[idx + 1]
+            idx += 2
+
+    return _new_frame(Frame, (device_id, func, params, unsupported, ids, data))
+
+
+def _padded(value: bytes, size: int) -> memoryview:
+    """Füllt einen zu kurzen Wert mit Nullbytes auf die erwartete Größe auf."""
+    return memoryview(value.ljust(size, b"\0"))
+
+
+class Encoder:
+    """
+    Baut Pakete für ein Gerät. Kopf (Start, Protokolltyp, ID, Passwort) und dessen
+    Checksummen-Anteil werden einmalig vorberechnet.
+    """
+
+    __slots__ = ("_header", "_seed")
+
+    # Funktion und Checksumme
+    FRAME_OVERHEAD = 3
+
+    def __init__(self, device_id: bytes, password: bytes):
+        header = bytearray(FRAME_START)
+        header.append(PROTOCOL_TYPE)
+        header.append(len(device_id))
+        header.extend(device_id)
+        header.append(len(password))
+        header.extend(password)
+        self._header = bytes(header)
+        self._seed = sum(header[2:])
+
+    @property
+    def overhead(self) -> int:
+        """Bytes eines Pakets außerhalb der Parameter (Kopf, Funktion, Checksumme), siehe pack_items."""
+        return len(self._header) + self.FRAME_OVERHEAD
+
+    def encode(self, func: int, parameters: Mapping[int, Any] | Iterable) -> bytes:
+        """
+        Baut ein Paket. parameters ist entweder eine Zuordnung Nummer -> Wert
+        (int oder bytes; Werte über ein Byte werden als 0xFE-Block übertragen)
+        als dict, eine reine Folge von Nummern (READ) oder eine Folge von (Nummer, Wert)-Paaren,
+        in der eine Nummer mehrfach vorkommen darf, siehe parameter_items. Parameter anderer
+        Seiten werden gruppiert und mit 0xFF eingeleitet.
+        """
+        return self.encode_items(func, parameter_items(parameters))
+
+    def encode_items(self, func: int, items: Sequence[tuple[int, Any]]) -> bytes:
+        """Baut ein Paket aus (Nummer, Wert)-Paaren; Wert None steht für eine reine Nummer (READ)."""
+        data = bytearray()
+        data.append(func)
+        if items and max(param_id for param_id, _ in items) > 0xFF:
+            items = sorted(items, key=_page_of)
+
+        page = 0
+        for param_id, value in items:
+            if param_id > 0xFF or page:
+                param_page = param_id >> 8
+                if param_page != page:
+                    data.append(BGCP_CMD_PAGE)
+                    data.append(param_page)
+                    page = param_page
+            if value is None:
+                data.append(param_id & 0xFF)
+            elif value.__class__ is int and 0 <= value <= 0xFF:
+                data.append(param_id & 0xFF)
+                data.append(value)
+            else:
+                block = _value_bytes(value)
+                if len(block) == 1:
+                    data.append(param_id & 0xFF)
+                    data.append(block[0])
+                else:
+                    data.append(BGCP_CMD_SIZE)
+                    data.append(len(block))
+                    data.append(param_id & 0xFF)
+                    data.extend(block)
+
+        return self.wrap(data)
+
+    def wrap(self, payload: bytes | bytearray) -> bytes:
+        """Umrahmt einen fertigen Datenbereich (Funktion + Parameter) mit Kopf und Checksumme."""
+        checksum = self._seed + sum(payload)
+        return self._header + payload + bytes((checksum & 0xFF, (checksum >> 8) & 0xFF))
+
+
+def _page_of(item) -> int:
+    return item[0] >> 8
+
+
+def parameter_items(parameters: Mapping[int, Any] | Iterable) -> list[tuple[int, Any]]:
+    """
+    Vereinheitlicht eine Parameterangabe zu (Nummer, Wert)-Paaren: eine Zuordnung Nummer -> Wert,
+    eine Folge von Nummern (Wert None) oder bereits eine Folge von Paaren, z.B. mehrere
+    Zeitplaneinträge oder READ-Anfragen mit Adressbytes (0x77).
+    """
+    if isinstance(parameters, dict):
+        return list(parameters.items())
+    return [item if item.__class__ is tuple else (item, None) for item in parameters]
+
+
+def _item_size(value) -> int:
+    """Bytes eines (Nummer, Wert)-Paars im Datenbereich."""
+    if value is None:
+        return 1
+    if value.__class__ is int and 0 <= value <= 0xFF:
+        return 2
+    size = len(_value_bytes(value))
+    return 2 if size == 1 else 3 + size
+
+
+def pack_items(items: Iterable[tuple[int, Any]], overhead: int, limit: int = MAX_PACKET_SIZE,
+               descriptors: Mapping[int, ParamDescriptor] = PARAMETERS) -> list[list[tuple[int, Any]]]:
+    """
+    Verteilt (Nummer, Wert)-Paare in Reihenfolge auf möglichst wenige Pakete, sodass weder die
+    Anfrage noch die erwartete Antwort länger als limit Bytes wird. overhead sind die Bytes eines
+    Pakets außerhalb der Parameter (Encoder.overhead), Seitenwechsel (0xFF) werden mitgezählt.
+    """
+    budget = limit - overhead
+    chunks: list[list[tuple[int, Any]]] = []
+    chunk: list[tuple[int, Any]] = []
+    request = response = 0
+    pages: set[int] = set()
+    for param_id, value in items:
+        descriptor = descriptors.get(param_id)
+        request_size = _item_size(value)
+        if descriptor is None or not descriptor.readable:
+            response_size = request_size if value is not None else 2
+        else:
+            response_size = 2 if descriptor.size == 1 else 3 + descriptor.size
+        page = param_id >> 8
+        page_size = 2 if page and page not in pages else 0
+        if chunk and max(request + request_size, response + response_size) + page_size > budget:
+            chunks.append(chunk)
+            chunk = []
+            request = response = 0
+            pages = set()
+            page_size = 2 if page else 0
+        chunk.append((param_id, value))
+        request += request_size + page_size
+        response += response_size + page_size
+        pages.add(page)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def schedule_read_items(days: Iterable[int] = range(SCHEDULE_WEEKDAYS),
+                        periods: Iterable[int] = range(1, SCHEDULE_PERIODS + 1)) -> list[tuple[int, bytes]]:
+    """READ-Paare für Zeitplaneinträge; das Gerät erwartet Tag und Periode als Adresse im Wert."""
+    periods = tuple(periods)
+    return [(PARAM_SCHEDULE_PERIOD, bytes((day, period))) for day in days for period in periods]
+
+
+def clock_parameters(now: datetime) -> dict[int, bytes]:
+    """Parameter, die die Echtzeituhr des Geräts auf now (Ortszeit) stellen."""
+    return {
+        PARAM_RTC_TIME: bytes((now.second, now.minute, now.hour)),
+        PARAM_RTC_CALENDAR: bytes((now.day, now.isoweekday(), now.month, now.year % 100)),
+    }
+
+
+def _value_bytes(value) -> bytes:
+    """Liefert die Bytes eines Werts, ganze Zahlen in Little Endian."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "little")
+
+
+def describe(params: dict) -> str:
+    """
+    Interpretiert die dekodierten Parameter und gibt eine lesbare Zeichenkette zurück.
+    Beispiel: "Unit status [Off], Speed number [1], Ventilation mode [Ventilation]"
+    """
+    msgs = []
+
+    unit_val = params.get("unit_on_off")
+    if unit_val is not None:
+        msgs.append(f"Unit status [{'On' if unit_val else 'Off'}]")
+
+    speed_val = params.get("speed_number")
+    if speed_val is not None:
+        msgs.append(f"Speed number [{speed_val // 33}]")  # Beispielhafte Umrechnung zurück zu 1..3
+
+    mode_val = params.get("ventilation_mode")
+    if mode_val is not None:
+        msgs.append(f"Ventilation mode [{mode_val}]")
+
+    return ", ".join(msgs) if msgs else "No known param"
@@ -1,26 +1,243 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD
-from .const import DOMAIN
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import selector
+from .capture import DEFAULT_RING_SIZE
+from .const import (
+    CONF_CONTROL, CONF_CONTROL_DWELL_DOWN, CONF_CONTROL_DWELL_UP, CONF_CONTROL_HYSTERESIS, CONF_CONTROL_SENSOR,
+    CONF_CONTROL_SPEED1, CONF_CONTROL_SPEED2, CONF_CONTROL_SPEED3, CONF_DEVICE_ID, CONF_FAST_WINDOW, CONF_MEMBERS,
+    CONF_MIN_GAP, CONF_PACKET_BUFFER, CONF_POLL_MAX, CONF_POLL_MIN, CONF_SYNC_CLOCK, CONTROL_HUMIDITY, CONTROL_OFF,
+    CONTROL_SENSOR, DEFAULT_CONTROL_DWELL_DOWN, DEFAULT_CONTROL_DWELL_UP, DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_THRESHOLDS, DEFAULT_FAST_WINDOW, DEFAULT_POLL_MAX, DEFAULT_POLL_MIN, DOMAIN,
+)
+from .discovery import DEFAULT_PASSWORD, async_discover, async_verify
+from .udp_client import DEFAULT_MIN_GAP
+
+CONF_SUBNET = "subnet"
+CONF_DEVICES = "devices"
 
 DATA_SCHEMA = vol.Schema({
     vol.Required("name", default="Blauberg Vento"): str,
     vol.Required(CONF_IP_ADDRESS): str,
-    vol.Required("deviceId"): str,
+    vol.Required(CONF_DEVICE_ID): str,
     vol.Required(CONF_PASSWORD): str,
 })
 
+DISCOVERY_SCHEMA = vol.Schema({
+    vol.Optional(CONF_SUBNET, default=""): str,
+    vol.Required(CONF_PASSWORD, default=DEFAULT_PASSWORD): str,
+})
+
+
+def _entry_data(name, ip, device_id, password) -> dict:
+    return {"name": name, CONF_IP_ADDRESS: ip, CONF_DEVICE_ID: device_id, CONF_PASSWORD: password}
+
+
 class BlaubergVentoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Blauberg Vento Fan."""
     VERSION = 1
 
+    def __init__(self):
+        self._discovered = {}
+        self._password = DEFAULT_PASSWORD
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return BlaubergVentoOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
+        return self.async_show_menu(step_id="user", menu_options=["discovery", "manual", "group"])
+
+    async def async_step_manual(self, user_input=None):
+        errors = {}
+        if user_input is not None:
+            await self.async_set_unique_id(user_input[CONF_DEVICE_ID])
+            self._abort_if_unique_id_configured()
+            verified, = await async_verify([
+                (user_input[CONF_IP_ADDRESS], user_input[CONF_DEVICE_ID], user_input[CONF_PASSWORD])
+            ])
+            if verified:
+                return self.async_create_entry(title=user_input["name"], data=user_input)
+            errors["base"] = "cannot_connect"
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=self.add_suggested_values_to_schema(DATA_SCHEMA, user_input),
+            errors=errors
+        )
+
+    async def async_step_discovery(self, user_input=None):
+        """Broadcast und optional ein Subnetz nach Lüftern absuchen."""
         errors = {}
         if user_input is not None:
-            # Hier könnte ggf. eine Verbindung getestet werden.
-            return self.async_create_entry(title=user_input["name"], data=user_input)
+            self._password = user_input[CONF_PASSWORD]
+            try:
+                found = await async_discover(user_input[CONF_SUBNET] or None, self._password)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                configured = {entry.data.get(CONF_DEVICE_ID) for entry in self._async_current_entries()}
+                self._discovered = {
+                    device.device_id: device for device in found if device.device_id not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=self.add_suggested_values_to_schema(DISCOVERY_SCHEMA, user_input),
+            errors=errors
+        )
+
+    async def async_step_pick(self, user_input=None):
+        """Gefundene Geräte auswählen; jedes wird vor dem Anlegen per READ geprüft."""
+        errors = {}
+        if user_input is not None and user_input[CONF_DEVICES]:
+            selected = [self._discovered[device_id] for device_id in user_input[CONF_DEVICES]]
+            verified = await async_verify(
+                [(device.ip, device.device_id, self._password) for device in selected]
+            )
+            if all(verified):
+                first, *others = selected
+                for device in others:
+                    # Jedes weitere Gerät bekommt einen eigenen Config-Entry über einen Import-Flow
+                    self.hass.async_create_task(self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data=_entry_data(f"Blauberg Vento {device.device_id[-4:]}",
+                                         device.ip, device.device_id, self._password),
+                    ))
+                await self.async_set_unique_id(first.device_id)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=f"Blauberg Vento {first.device_id[-4:]}",
+                    data=_entry_data(f"Blauberg Vento {first.device_id[-4:]}",
+                                     first.ip, first.device_id, self._password),
+                )
+            errors["base"] = "cannot_connect"
+        elif user_input is not None:
+            errors["base"] = "no_devices_selected"
+        options = {
+            device.device_id: f"{device.device_id} ({device.ip}, {device.model}, FW {device.firmware})"
+            for device in self._discovered.values()
+        }
         return self.async_show_form(
-            step_id="user",
-            data_schema=DATA_SCHEMA,
+            step_id="pick",
+            data_schema=vol.Schema({vol.Required(CONF_DEVICES, default=list(options)): cv.multi_select(options)}),
             errors=errors
         )
+
+    async def async_step_group(self, user_input=None):
+        """Fasst bereits eingerichtete Lüfter zu einer Gruppe zusammen, die gemeinsam geschaltet wird."""
+        errors = {}
+        devices = {
+            entry.entry_id: entry.title
+            for entry in self._async_current_entries() if CONF_MEMBERS not in entry.data
+        }
+        if user_input is not None:
+            members = sorted(user_input[CONF_MEMBERS])
+            if len(members) < 2:
+                errors["base"] = "too_few_members"
+            else:
+                await self.async_set_unique_id("group_" + "_".join(members))
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=user_input["name"], data={"name": user_input["name"], CONF_MEMBERS: members}
+                )
+        return self.async_show_form(
+            step_id="group",
+            data_schema=vol.Schema({
+                vol.Required("name", default="Blauberg Vento group"): str,
+                vol.Required(CONF_MEMBERS, default=[]): cv.multi_select(devices),
+            }),
+            errors=errors
+        )
+
+    async def async_step_import(self, import_data):
+        """Legt ein weiteres in der Suche ausgewähltes (und bereits geprüftes) Gerät an."""
+        await self.async_set_unique_id(import_data[CONF_DEVICE_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=import_data["name"], data=import_data)
+
+
+def _control_schema(options: dict) -> dict:
+    """Optionen des Reglers (controller.SpeedController); für Lüfter und Gruppen gleich."""
+    schema = {
+        vol.Required(CONF_CONTROL, default=options.get(CONF_CONTROL, CONTROL_OFF)): vol.In(
+            [CONTROL_OFF, CONTROL_HUMIDITY, CONTROL_SENSOR]
+        ),
+        vol.Optional(
+            CONF_CONTROL_SENSOR, description={"suggested_value": options.get(CONF_CONTROL_SENSOR)}
+        ): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+    }
+    thresholds = (CONF_CONTROL_SPEED1, CONF_CONTROL_SPEED2, CONF_CONTROL_SPEED3)
+    for key, default in zip(thresholds, DEFAULT_CONTROL_THRESHOLDS):
+        schema[vol.Required(key, default=options.get(key, default))] = vol.Coerce(float)
+    schema.update({
+        vol.Required(
+            CONF_CONTROL_HYSTERESIS, default=options.get(CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS)
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Required(
+            CONF_CONTROL_DWELL_UP, default=options.get(CONF_CONTROL_DWELL_UP, DEFAULT_CONTROL_DWELL_UP)
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+        vol.Required(
+            CONF_CONTROL_DWELL_DOWN, default=options.get(CONF_CONTROL_DWELL_DOWN, DEFAULT_CONTROL_DWELL_DOWN)
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+    })
+    return schema
+
+
+def _control_errors(user_input: dict) -> dict:
+    errors = {}
+    if user_input[CONF_CONTROL] == CONTROL_SENSOR and not user_input.get(CONF_CONTROL_SENSOR):
+        errors[CONF_CONTROL_SENSOR] = "control_sensor_missing"
+    if not user_input[CONF_CONTROL_SPEED1] <= user_input[CONF_CONTROL_SPEED2] <= user_input[CONF_CONTROL_SPEED3]:
+        errors["base"] = "control_thresholds_order"
+    return errors
+
+
+class BlaubergVentoOptionsFlow(config_entries.OptionsFlow):
+    """
+    Optionen eines Lüfters, z.B. der Mindestabstand zwischen zwei Paketen und die Abfrageintervalle,
+    sowie der Regler der Stufe; Gruppen haben nur den Regler.
+    """
+
+    def __init__(self, config_entry):
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        errors = {}
+        if user_input is not None:
+            errors = _control_errors(user_input)
+            if CONF_POLL_MIN in user_input and user_input[CONF_POLL_MIN] > user_input[CONF_POLL_MAX]:
+                errors[CONF_POLL_MAX] = "poll_max_below_min"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+        options = {**self._entry.options, **(user_input or {})}
+        if CONF_MEMBERS in self._entry.data:
+            return self.async_show_form(step_id="init", errors=errors, data_schema=vol.Schema(_control_schema(options)))
+        return self.async_show_form(
+            step_id="init",
+            errors=errors,
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_MIN_GAP, default=options.get(CONF_MIN_GAP, int(DEFAULT_MIN_GAP * 1000))
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Required(
+                    CONF_PACKET_BUFFER, default=options.get(CONF_PACKET_BUFFER, DEFAULT_RING_SIZE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Required(CONF_SYNC_CLOCK, default=options.get(CONF_SYNC_CLOCK, True)): bool,
+                vol.Required(
+                    CONF_POLL_MIN, default=options.get(CONF_POLL_MIN, DEFAULT_POLL_MIN)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=3600)),
+                vol.Required(
+                    CONF_POLL_MAX, default=options.get(CONF_POLL_MAX, DEFAULT_POLL_MAX)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=3600)),
+                vol.Required(
+                    CONF_FAST_WINDOW, default=options.get(CONF_FAST_WINDOW, DEFAULT_FAST_WINDOW)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+                **_control_schema(options),
+            }),
+        )
@@ -1 +1,91 @@
-DOMAIN = "blauberg_vento"
\ No newline at end of file
+from datetime import timedelta
+
+DOMAIN = "blauberg_vento"
+
+# Konfigurationsschlüssel des Config-Entries
+CONF_DEVICE_ID = "deviceId"
+CONF_MEMBERS = "members"      # Gruppen-Entry: Entry-IDs der Lüfter
+
+# Optionen des Config-Entries
+CONF_MIN_GAP = "min_gap_ms"   # Mindestabstand zwischen zwei Paketen an einen Lüfter in Millisekunden
+CONF_POLL_MIN = "poll_min_s"           # kürzestes Abfrageintervall (nach Änderungen) in Sekunden
+CONF_POLL_MAX = "poll_max_s"           # längstes Abfrageintervall (ohne Änderungen) in Sekunden
+CONF_FAST_WINDOW = "fast_window_s"     # Dauer der schnellen Abfrage nach einer Änderung in Sekunden
+CONF_PACKET_BUFFER = "packet_buffer"   # Anzahl der im Speicher gehaltenen Datagramme je Lüfter
+CONF_SYNC_CLOCK = "sync_clock"         # Echtzeituhr des Lüfters täglich stellen
+# Regelung der Stufe nach einem Messwert (controller.SpeedController), auch für Gruppen
+CONF_CONTROL = "control"                          # CONTROL_OFF, CONTROL_HUMIDITY oder CONTROL_SENSOR
+CONF_CONTROL_SENSOR = "control_sensor"            # Entity-ID des verknüpften Sensors
+CONF_CONTROL_SPEED1 = "control_speed1_from"       # Schwellen der Stufen 1..3 (darunter aus)
+CONF_CONTROL_SPEED2 = "control_speed2_from"
+CONF_CONTROL_SPEED3 = "control_speed3_from"
+CONF_CONTROL_HYSTERESIS = "control_hysteresis"    # Abstand unter der Schwelle, ab dem zurückgeschaltet wird
+CONF_CONTROL_DWELL_UP = "control_dwell_up_s"      # Mindestverweildauer vor dem Hochschalten in Sekunden
+CONF_CONTROL_DWELL_DOWN = "control_dwell_down_s"  # Mindestverweildauer vor dem Zurückschalten in Sekunden
+
+# Quellen des Reglers und Standardwerte seiner Optionen (für die Luftfeuchte in %)
+CONTROL_OFF = "off"
+CONTROL_HUMIDITY = "humidity"
+CONTROL_SENSOR = "sensor"
+DEFAULT_CONTROL_THRESHOLDS = (0, 60, 70)
+DEFAULT_CONTROL_HYSTERESIS = 3
+DEFAULT_CONTROL_DWELL_UP = 30
+DEFAULT_CONTROL_DWELL_DOWN = 300
+
+# Schlüssel in hass.data[DOMAIN]
+DATA_COORDINATOR = "coordinator"
+
+# Dispatcher-Signal je Config-Entry eines Lüfters (mit der Entry-ID formatiert): sein Zustand hat sich geändert
+# oder er wurde geladen bzw. entladen; Gruppen hören darauf, damit sie auch neu geladene Mitglieder verfolgen
+SIGNAL_DEVICE_UPDATED = f"{DOMAIN}_device_updated_{{}}"
+
+# Abfrageintervall je Lüfter: nach einem Befehl oder einer erkannten Änderung für DEFAULT_FAST_WINDOW
+# Sekunden DEFAULT_POLL_MIN, danach mit jeder unveränderten Abfrage um POLL_DECAY_FACTOR länger
+# bis DEFAULT_POLL_MAX (Standardwerte der Optionen, in Sekunden)
+DEFAULT_POLL_MIN = 2
+DEFAULT_POLL_MAX = 60
+DEFAULT_FAST_WINDOW = 30
+POLL_DECAY_FACTOR = 2
+# Höchstzahl gleichzeitig laufender regelmäßiger Abfragen über alle Lüfter
+MAX_POLLS_IN_FLIGHT = 8
+
+# Erreichbarkeit eines Lüfters (VentoDevice.availability)
+AVAILABILITY_AVAILABLE = "available"
+AVAILABILITY_DEGRADED = "degraded"        # einzelne Anfragen blieben unbeantwortet
+AVAILABILITY_UNAVAILABLE = "unavailable"  # wird nur noch mit Proben abgefragt
+# Aufeinanderfolgende unbeantwortete Anfragen, nach denen ein Lüfter als nicht erreichbar gilt
+UNAVAILABLE_AFTER = 3
+# Abstand der Proben an einen nicht erreichbaren Lüfter; verdoppelt sich bis PROBE_INTERVAL_MAX
+PROBE_INTERVAL_MIN = timedelta(seconds=10)
+PROBE_INTERVAL_MAX = timedelta(minutes=10)
+
+# Zeitfenster, in dem kurz aufeinanderfolgende Befehle zu einem WRITE-Paket zusammengefasst werden
+WRITE_COALESCE_WINDOW = 0.01
+
+# Persistente Daten (z.B. gemessene Antwortzeiten je Gerät)
+STORAGE_KEY = f"{DOMAIN}.transport"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Plattformen, die pro Config-Entry eingerichtet werden
+PLATFORMS = ["fan", "sensor", "binary_sensor", "button", "switch"]
+GROUP_PLATFORMS = ["fan"]
+
+# Dienste
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_GROUP_COMMAND = "group_command"
+SERVICE_DUMP_PACKETS = "dump_packets"
+SERVICE_GET_SCHEDULE = "get_schedule"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_SYNC_CLOCK = "sync_clock"
+SERVICE_POLL_SCHEDULE = "poll_schedule"
+SERVICE_SNAPSHOT_CONFIG = "snapshot_config"
+SERVICE_APPLY_CONFIG = "apply_config"
+
+# Intervall, in dem ein laufender Mitschnitt in die Datei geschrieben wird
+CAPTURE_FLUSH_INTERVAL = timedelta(seconds=5)
+
+# Ortszeit (Stunde, Minute, Sekunde), zu der die Uhren der Lüfter täglich gestellt werden;
+# liegt nach den Zeitumstellungen in Mitteleuropa
+CLOCK_SYNC_TIME = (3, 5, 0)
@@ -0,0 +1,111 @@
+# controller.py
+
+"""
+Regelung der Lüfterstufe nach einem Messwert (Luftfeuchte des Lüfters oder ein verknüpfter Sensor, z.B. CO2).
+
+Die Kennlinie ordnet dem Messwert eine Stufe zu: unter der ersten Schwelle aus (0), ab der ersten Stufe 1,
+ab der zweiten Stufe 2, ab der dritten Stufe 3. Hochgeschaltet wird beim Erreichen einer Schwelle,
+zurückgeschaltet erst, wenn der Wert die Schwelle um die Hysterese unterschreitet. Zwischen zwei Wechseln
+der Stufe muss die jeweilige Mindestverweildauer vergangen sein. Ein WRITE wird nur gesendet, wenn sich
+die Zielstufe von der tatsächlichen Stufe des Lüfters unterscheidet.
+
+Der Regler wird mit jeder regelmäßigen Abfrage ausgewertet; Home Assistant ist dafür nicht nötig.
+"""
+
+import math
+from typing import Sequence
+
+try:
+    from .codec import PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from codec import PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF
+
+# Höchste Stufe; 0 = aus
+MAX_LEVEL = 3
+
+
+def current_level(data: dict) -> int | None:
+    """Stufe 0..3 aus dem Zustand eines Lüfters (speed_number ist als 33/66/99 dekodiert); None = unbekannt."""
+    if "unit_on_off" not in data or "speed_number" not in data:
+        return None
+    if not data["unit_on_off"]:
+        return 0
+    return min(MAX_LEVEL, max(1, round(data["speed_number"] / 33)))
+
+
+def level_parameters(level: int, data: dict) -> dict[int, int]:
+    """Parameter, die den Lüfter auf level stellen; Ein/Aus wird nur geschrieben, wenn es sich ändert."""
+    if level == 0:
+        return {PARAM_UNIT_ON_OFF: 0}
+    params = {PARAM_SPEED_NUMBER: level}
+    if not data.get("unit_on_off"):
+        params[PARAM_UNIT_ON_OFF] = 1
+    return params
+
+
+class SpeedController:
+    """
+    Kennlinie mit Hysterese und Mindestverweildauer für einen Lüfter oder eine Gruppe.
+    source ist "humidity" (Feuchteregister des Lüfters) oder die Entity-ID eines Sensors.
+    """
+
+    def __init__(self, source: str, thresholds: Sequence[float], hysteresis: float = 0.0,
+                 dwell_up: float = 0.0, dwell_down: float = 0.0):
+        if len(thresholds) != MAX_LEVEL or list(thresholds) != sorted(thresholds):
+            raise ValueError(f"Expected {MAX_LEVEL} ascending thresholds, got {thresholds}")
+        self.source = source
+        self.thresholds = tuple(thresholds)
+        self.hysteresis = hysteresis
+        self.dwell_up = dwell_up
+        self.dwell_down = dwell_down
+        # Zuletzt beobachtete oder geschriebene Stufe und Zeitpunkt (Event-Loop) ihres letzten Wechsels
+        self.level: int | None = None
+        self.changed_at = -math.inf
+        self.value: float | None = None
+        self.writes = 0
+
+    def target(self, value: float, level: int) -> int:
+        """Zielstufe für value, ausgehend von der aktuellen Stufe (Hysterese beim Zurückschalten)."""
+        up = sum(value >= threshold for threshold in self.thresholds)
+        if up > level:
+            return up
+        down = sum(value >= threshold - self.hysteresis for threshold in self.thresholds)
+        return min(down, level)
+
+    def update(self, value: float, level: int, now: float) -> int | None:
+        """
+        Wertet den Regler für einen neuen Messwert aus. level ist die tatsächliche Stufe des Lüfters;
+        wurde sie von außen geändert (Fernbedienung, Dienst), beginnt die Verweildauer neu.
+        Liefert die zu schreibende Stufe oder None, wenn nichts gesendet werden muss.
+        """
+        self.value = value
+        if self.level is None:
+            self.level = level
+        elif level != self.level:
+            self.level = level
+            self.changed_at = now
+        target = self.target(value, level)
+        if target == level:
+            return None
+        dwell = self.dwell_up if target > level else self.dwell_down
+        if now - self.changed_at < dwell:
+            return None
+        return target
+
+    def commanded(self, level: int, now: float):
+        """Die Stufe wurde geschrieben; ab jetzt läuft die Verweildauer."""
+        self.level = level
+        self.changed_at = now
+        self.writes += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "thresholds": list(self.thresholds),
+            "hysteresis": self.hysteresis,
+            "dwell_up_s": self.dwell_up,
+            "dwell_down_s": self.dwell_down,
+            "value": self.value,
+            "level": self.level,
+            "writes": self.writes,
+        }
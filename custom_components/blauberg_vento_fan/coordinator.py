@@ -0,0 +1,996 @@
+# coordinator.py
+
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Callable, Iterable, Mapping
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_change, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .capture import DEFAULT_RING_SIZE, CaptureWriter
+from .const import (
+    AVAILABILITY_AVAILABLE, AVAILABILITY_DEGRADED, AVAILABILITY_UNAVAILABLE, CAPTURE_FLUSH_INTERVAL, CLOCK_SYNC_TIME,
+    CONF_CONTROL, CONF_CONTROL_DWELL_DOWN, CONF_CONTROL_DWELL_UP, CONF_CONTROL_HYSTERESIS, CONF_CONTROL_SENSOR,
+    CONF_CONTROL_SPEED1, CONF_CONTROL_SPEED2, CONF_CONTROL_SPEED3, CONF_DEVICE_ID, CONF_FAST_WINDOW, CONF_MIN_GAP,
+    CONF_PACKET_BUFFER, CONF_POLL_MAX, CONF_POLL_MIN, CONF_SYNC_CLOCK, CONTROL_HUMIDITY, CONTROL_OFF, CONTROL_SENSOR,
+    DATA_COORDINATOR, DEFAULT_CONTROL_DWELL_DOWN, DEFAULT_CONTROL_DWELL_UP, DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_THRESHOLDS, DEFAULT_FAST_WINDOW, DEFAULT_POLL_MAX, DEFAULT_POLL_MIN, DOMAIN,
+    MAX_POLLS_IN_FLIGHT, POLL_DECAY_FACTOR, PROBE_INTERVAL_MAX, PROBE_INTERVAL_MIN, SIGNAL_DEVICE_UPDATED,
+    STORAGE_KEY, STORAGE_SAVE_DELAY, STORAGE_VERSION, UNAVAILABLE_AFTER, WRITE_COALESCE_WINDOW,
+)
+from .codec import (
+    CONFIG_PARAMETERS, FUNC_WRITE_READ, PARAM_FIRMWARE, PARAM_RTC_TIME, PARAM_SCHEDULE_PERIOD, PARAM_UNIT_ON_OFF,
+    PARAM_WEEKLY_SCHEDULE, PARAMETERS, POLL_PARAMETERS, READABLE_PARAMETERS, SchedulePeriod, clock_parameters,
+    decode, pack_items, parameter_items, schedule_read_items,
+)
+from .controller import SpeedController, current_level, level_parameters
+from .snapshot import (
+    SNAPSHOT_VERSION, diff_registers, diff_schedule, registers_from_json, registers_to_json, same_value,
+    schedule_from_json,
+)
+from .udp_client import (
+    DEFAULT_MIN_GAP, BlaubergVentoUDPClient, RequestQueue, VentoTransport, async_send_group,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Kleinstmögliche Abfrage, mit der ein nicht erreichbarer Lüfter geprüft wird
+PROBE_PARAMETERS = (PARAM_UNIT_ON_OFF,)
+
+# Betriebszustand (beschreibbare Register und Boost): eine Änderung, z.B. über die Fernbedienung oder den
+# Zeitplan des Lüfters, beschleunigt die Abfrage; Messwerte wie Feuchte oder Drehzahl tun das nicht
+ACTIVITY_KEYS = frozenset(
+    descriptor.key for descriptor in PARAMETERS.values() if descriptor.writable and descriptor.poll
+) | {"boost_active"}
+
+
+class AdaptivePollInterval:
+    """
+    Abfrageintervall eines Lüfters: für fast_window Sekunden nach einem Befehl oder einer erkannten
+    Änderung min_interval, danach wird es mit jeder Abfrage um POLL_DECAY_FACTOR länger bis max_interval.
+    Alle Zeiten in Sekunden (Zeitbasis der Event-Loop).
+    """
+
+    __slots__ = ("min_interval", "max_interval", "fast_window", "current", "_fast_until")
+
+    def __init__(self, min_interval: float = DEFAULT_POLL_MIN, max_interval: float = DEFAULT_POLL_MAX,
+                 fast_window: float = DEFAULT_FAST_WINDOW):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.fast_window = fast_window
+        self.current = min_interval
+        self._fast_until = 0.0
+
+    def activity(self, now: float):
+        """Beginnt (oder verlängert) die schnelle Abfrage."""
+        self._fast_until = now + self.fast_window
+        self.current = self.min_interval
+
+    def next_interval(self, now: float) -> float:
+        """Abstand bis zur nächsten Abfrage, gerechnet ab einer gerade beendeten Abfrage."""
+        if now < self._fast_until:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, max(self.min_interval, self.current * POLL_DECAY_FACTOR))
+        return self.current
+
+
+class DeviceCapabilities:
+    """
+    Ergebnis der Fähigkeitsprüfung eines Lüfters: welche lesbaren Parameter (und damit Seiten) er unterstützt.
+    Gilt für eine Firmware-Version; nach einem Firmware-Update wird neu geprüft.
+    """
+
+    def __init__(self, firmware: str | None, supported: Iterable[int], unsupported: Iterable[int]):
+        self.firmware = firmware
+        self.supported = frozenset(supported)
+        self.unsupported = frozenset(unsupported)
+
+    @property
+    def pages(self) -> list[int]:
+        """Parameterseiten mit mindestens einem unterstützten Parameter."""
+        return sorted({param_id >> 8 for param_id in self.supported})
+
+    def supports(self, param_id: int) -> bool:
+        """Nicht geprüfte Parameter (z.B. Zeitplaneinträge) gelten als unterstützt, solange ihre Seite es ist."""
+        if param_id in self.supported:
+            return True
+        return param_id not in self.unsupported and (param_id >> 8) in self.pages
+
+    def as_dict(self) -> dict:
+        return {
+            "firmware": self.firmware,
+            "supported": sorted(self.supported),
+            "unsupported": sorted(self.unsupported),
+            "pages": self.pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DeviceCapabilities":
+        return cls(data.get("firmware"), data.get("supported", ()), data.get("unsupported", ()))
+
+
+class VentoDevice:
+    """
+    Zustand eines einzelnen Lüfters innerhalb des Koordinators.
+    Entitäten melden sich hier als Listener an, statt selbst zu pollen.
+    """
+
+    def __init__(self, name: str, client: BlaubergVentoUDPClient, min_gap: float = DEFAULT_MIN_GAP):
+        self.name = name
+        self.client = client
+        # Alle Anfragen an den Lüfter laufen nacheinander über diese Warteschlange
+        self.queue = RequestQueue(client, min_gap)
+        self.device_id = client.device_id.decode("ascii")
+        self.data: dict = {}
+        # True, solange data nur den beim letzten Lauf gespeicherten Zustand enthält
+        self.restored = False
+        # Zuletzt gelesener Wochenzeitplan des Geräts (None = noch nicht gelesen)
+        self.schedule: list[SchedulePeriod] | None = None
+        # Echtzeituhr des Geräts täglich mit Home Assistant abgleichen
+        self.sync_clock = True
+        # Unterstützte Parameter (None = unbekannt) und die daraus folgenden Parameter einer Abfrage;
+        # capabilities_checked wird True, sobald sie für die aktuelle Firmware bestätigt oder neu geprüft sind
+        self.capabilities: DeviceCapabilities | None = None
+        self.capabilities_checked = False
+        self.poll_parameters: tuple[int, ...] = POLL_PARAMETERS
+        # Optionaler Regler der Stufe, vom Koordinator nach jeder Abfrage ausgewertet
+        self.controller: SpeedController | None = None
+        # Erreichbarkeit, siehe _async_record_failure
+        self.availability = AVAILABILITY_AVAILABLE
+        self.failures = 0
+        self._probe_interval = PROBE_INTERVAL_MIN.total_seconds()
+        self._next_probe = 0.0
+        # Abfrageintervall, Phase (Anteil am Intervall, vom Koordinator verteilt) und Zeitpunkt
+        # (Event-Loop) der nächsten regelmäßigen Abfrage
+        self.poll = AdaptivePollInterval()
+        self.phase = 0.0
+        self.next_poll = 0.0
+        # Vom Koordinator gesetzt: stellt dessen Timer neu, wenn eine Abfrage früher fällig wird
+        self.reschedule: Callable[[], None] | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._pending_write: dict = {}
+        self._write_task: asyncio.Task | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Registriert einen Listener und liefert die Funktion zum Abmelden."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_set_data(self, params: dict):
+        """
+        Übernimmt neue Parameter und benachrichtigt alle Listener.
+        Unveränderte Abfragen lösen keine Benachrichtigung aus, außer der ersten nach einem Neustart,
+        die den wiederhergestellten Zustand bestätigt.
+        """
+        if params.items() <= self.data.items() and not self.restored:
+            return
+        if not self.restored and any(
+            key in ACTIVITY_KEYS and key in self.data and self.data[key] != value for key, value in params.items()
+        ):
+            self._async_activity()
+        self.restored = False
+        self.data.update(params)
+        self._async_notify()
+
+    @callback
+    def _async_activity(self):
+        """
+        Nach einem Befehl oder einer Änderung des Betriebszustands schnell abfragen (AdaptivePollInterval).
+        Läuft gerade eine Abfrage (next_poll unendlich), gilt das kurze Intervall erst ab deren Ende
+        (async_schedule_next_poll), damit nicht eine zweite Abfrage desselben Lüfters startet.
+        """
+        now = asyncio.get_running_loop().time()
+        self.poll.activity(now)
+        if self.next_poll == math.inf:
+            return
+        if now + self.poll.min_interval < self.next_poll:
+            self.next_poll = now + self.poll.min_interval
+            if self.reschedule is not None:
+                self.reschedule()
+
+    @callback
+    def async_schedule_next_poll(self):
+        """
+        Legt nach einer Abfrage die nächste fest; ein nicht erreichbarer Lüfter erst zur nächsten Probe.
+        Der Zeitpunkt wird auf das Raster des Intervalls mit der Phase des Lüfters gerundet (höchstens ein
+        halbes Intervall Abweichung), damit Lüfter mit gleichem Intervall gleichmäßig versetzt abfragen.
+        """
+        now = asyncio.get_running_loop().time()
+        interval = self.poll.next_interval(now)
+        offset = self.phase * interval
+        self.next_poll = round((now + interval - offset) / interval) * interval + offset
+        if self.availability == AVAILABILITY_UNAVAILABLE:
+            self.next_poll = max(self.next_poll, self._next_probe)
+
+    @property
+    def available(self) -> bool:
+        """False, solange der Lüfter als nicht erreichbar gilt."""
+        return self.availability != AVAILABILITY_UNAVAILABLE
+
+    @callback
+    def _async_record_success(self):
+        """Der Lüfter hat geantwortet."""
+        self.failures = 0
+        if self.availability == AVAILABILITY_UNAVAILABLE:
+            _LOGGER.info("[%s] is available again", self.name)
+        self._async_set_availability(AVAILABILITY_AVAILABLE)
+
+    @callback
+    def _async_record_failure(self):
+        """
+        Eine Anfrage blieb (auch nach allen Wiederholungen) unbeantwortet. Nach UNAVAILABLE_AFTER Fehlschlägen
+        in Folge gilt der Lüfter als nicht erreichbar und wird nur noch mit einzelnen Proben ohne Wiederholung
+        abgefragt, deren Abstand sich bei jedem weiteren Fehlschlag bis PROBE_INTERVAL_MAX verdoppelt.
+        """
+        self.failures += 1
+        now = asyncio.get_running_loop().time()
+        if self.availability == AVAILABILITY_UNAVAILABLE:
+            self._probe_interval = min(self._probe_interval * 2, PROBE_INTERVAL_MAX.total_seconds())
+            self._next_probe = now + self._probe_interval
+            return
+        if self.failures < UNAVAILABLE_AFTER:
+            self._async_set_availability(AVAILABILITY_DEGRADED)
+            return
+        _LOGGER.warning("[%s] is unavailable after %d requests without response", self.name, self.failures)
+        self._probe_interval = PROBE_INTERVAL_MIN.total_seconds()
+        self._next_probe = now + self._probe_interval
+        self._async_set_availability(AVAILABILITY_UNAVAILABLE)
+
+    @callback
+    def async_record_write_result(self, answered: bool):
+        """
+        Pflegt nach einem Befehl Erreichbarkeit und Abfrageintervall, auch für Befehle, die der Koordinator
+        an eine ganze Gruppe gesendet hat (async_group_write).
+        """
+        if not answered:
+            self._async_record_failure()
+            return
+        self._async_record_success()
+        self._async_activity()
+
+    @callback
+    def _async_set_availability(self, availability: str):
+        if availability != self.availability:
+            self.availability = availability
+            self._async_notify()
+
+    @callback
+    def _async_notify(self):
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_restore(self, data: dict):
+        """Übernimmt den zuletzt gespeicherten Zustand, bis die erste Abfrage gelingt."""
+        if data and not self.data:
+            self.data.update(data)
+            self.restored = True
+
+    async def async_refresh(self) -> bool:
+        """
+        Liest alle abgefragten Register des Lüfters mit einem einzigen READ-Paket.
+        Ein nicht erreichbarer Lüfter wird stattdessen, sobald die nächste Probe fällig ist, mit einem
+        einzelnen kleinen Paket geprüft; erst wenn er darauf antwortet, folgt wieder die volle Abfrage.
+        """
+        if self.availability == AVAILABILITY_UNAVAILABLE:
+            if asyncio.get_running_loop().time() < self._next_probe:
+                return False
+            _LOGGER.debug("Probing [%s]", self.name)
+            if await self.queue.async_read(PROBE_PARAMETERS, retries=0) is None:
+                self._async_record_failure()
+                return False
+            self._async_record_success()
+        _LOGGER.debug("Updating fan status for [%s]", self.name)
+        frame = await self.queue.async_read(self.poll_parameters)
+        if frame is None:
+            self._async_record_failure()
+            return False
+        self._async_record_success()
+        if frame.unsupported:
+            # Z.B. vor der ersten Fähigkeitsprüfung: nicht unterstützte Parameter ab sofort nicht mehr abfragen
+            _LOGGER.debug("[%s] does not support %s", self.name, ", ".join(f"0x{p:04X}" for p in frame.unsupported))
+            unsupported = set(frame.unsupported)
+            self.poll_parameters = tuple(p for p in self.poll_parameters if p not in unsupported)
+        params = frame.params
+        if not params:
+            _LOGGER.warning("No valid parameters parsed from response of [%s].", self.name)
+            return False
+        self.async_set_data(params)
+        return True
+
+    async def async_read_firmware(self) -> str | None:
+        """Liest die Firmware-Version; ein Paket mit einem einzigen Parameter. Liefert None ohne Antwort."""
+        frame = await self.queue.async_read((PARAM_FIRMWARE,))
+        if frame is None:
+            return None
+        return frame.params.get("firmware", "")
+
+    async def async_probe_capabilities(self, firmware: str) -> DeviceCapabilities | None:
+        """
+        Liest alle lesbaren Parameter in möglichst wenigen READ-Paketen. Was das Gerät mit 0xFD beantwortet
+        oder in der Antwort auslässt, gilt als nicht unterstützt. Liefert None, wenn ein Paket unbeantwortet bleibt.
+        """
+        supported = set()
+        unsupported = set()
+        for items in pack_items(parameter_items(READABLE_PARAMETERS), self.client.overhead):
+            frame = await self.queue.async_read(items)
+            if frame is None:
+                _LOGGER.warning("No response received while probing the capabilities of [%s].", self.name)
+                return None
+            answered = set(frame.ids).difference(frame.unsupported)
+            for param_id, _ in items:
+                (supported if param_id in answered else unsupported).add(param_id)
+        return DeviceCapabilities(firmware, supported, unsupported)
+
+    @callback
+    def async_set_capabilities(self, capabilities: DeviceCapabilities):
+        """Übernimmt geprüfte Fähigkeiten: ab der nächsten Abfrage werden nur unterstützte Parameter gelesen."""
+        self.capabilities = capabilities
+        self.poll_parameters = tuple(p for p in POLL_PARAMETERS if p in capabilities.supported)
+        if capabilities.unsupported:
+            _LOGGER.debug("[%s] (firmware %s) does not support %s", self.name, capabilities.firmware,
+                          ", ".join(f"0x{p:04X}" for p in sorted(capabilities.unsupported)))
+
+    def supports(self, param_id: int) -> bool:
+        """True, solange die Fähigkeiten noch nicht geprüft sind."""
+        return self.capabilities is None or self.capabilities.supports(param_id)
+
+    async def async_read_config(self) -> dict[int, int | bytes] | None:
+        """
+        Liest alle unterstützten Einstellungen (CONFIG_PARAMETERS) roh, wie sie im Paket stehen, in möglichst
+        wenigen READ-Paketen. Liefert None, wenn ein Paket unbeantwortet bleibt.
+        """
+        values = {}
+        params = [param_id for param_id in CONFIG_PARAMETERS if self.supports(param_id)]
+        for items in pack_items(parameter_items(params), self.client.overhead):
+            frame = await self.queue.async_read(items)
+            if frame is None:
+                _LOGGER.warning("No response received while reading the configuration of [%s].", self.name)
+                return None
+            raw = decode(frame.raw, descriptors={}).params
+            values.update((param_id, raw[param_id]) for param_id, _ in items if param_id in raw)
+        return values
+
+    async def async_write_config(self, values: Mapping[int, int | bytes]) -> list[int] | None:
+        """
+        Schreibt Rohwerte gebündelt in möglichst wenigen WRITE-Paketen (mehrbytige als 0xFE-Block) und prüft
+        sie anhand der Antworten. Liefert die Nummern, deren Wert die Antwort nicht bestätigt,
+        oder None, wenn ein Paket unbeantwortet bleibt.
+        """
+        mismatched = []
+        for chunk in pack_items(parameter_items(values), self.client.overhead):
+            _LOGGER.debug("Writing %d configuration parameters to [%s]", len(chunk), self.name)
+            frame = await self.queue.async_write(FUNC_WRITE_READ, chunk)
+            if frame is None:
+                _LOGGER.warning("No response received for configuration write to [%s].", self.name)
+                return None
+            raw = decode(frame.raw, descriptors={}).params
+            mismatched.extend(param_id for param_id, value in chunk if not same_value(raw.get(param_id), value))
+            if frame.params:
+                self.async_set_data(frame.params)
+        self._async_activity()
+        return mismatched
+
+    async def async_read_schedule(self) -> list[SchedulePeriod] | None:
+        """
+        Liest den Wochenzeitplan (7 Tage mit je 4 Perioden) mit möglichst wenigen READ-Paketen.
+        Liefert None, wenn ein Paket unbeantwortet bleibt.
+        """
+        periods = []
+        for items in pack_items(schedule_read_items(), self.client.overhead):
+            frame = await self.queue.async_read(items)
+            if frame is None:
+                _LOGGER.warning("No response received while reading the schedule of [%s].", self.name)
+                return None
+            periods.extend(frame.params.get("schedule", ()))
+        self.schedule = sorted(periods)
+        self._async_notify()
+        return self.schedule
+
+    async def async_write_schedule(self, periods: Iterable[SchedulePeriod], enabled: bool | None = None) -> bool:
+        """
+        Schreibt Zeitplaneinträge und optional den Schalter des Wochenzeitplans gebündelt in möglichst
+        wenigen WRITE-Paketen und liest den Zeitplan danach neu, da Tagesgruppen mehrere Tage setzen.
+        """
+        periods = list(periods)
+        items = [(PARAM_SCHEDULE_PERIOD, period.to_bytes()) for period in periods]
+        if enabled is not None:
+            items.append((PARAM_WEEKLY_SCHEDULE, int(enabled)))
+        for chunk in pack_items(items, self.client.overhead):
+            _LOGGER.debug("Writing %d schedule parameters to [%s]", len(chunk), self.name)
+            frame = await self.queue.async_write(FUNC_WRITE_READ, chunk)
+            if frame is None:
+                _LOGGER.warning("No response received for schedule write to [%s].", self.name)
+                return False
+            params = dict(frame.params)
+            params.pop("schedule", None)
+            if params:
+                self.async_set_data(params)
+        self._async_activity()
+        if periods:
+            return await self.async_read_schedule() is not None
+        return True
+
+    async def async_set_clock(self, now: datetime) -> bool:
+        """Stellt die Echtzeituhr des Lüfters (Uhrzeit und Datum in einem Paket), damit sein Zeitplan stimmt."""
+        frame = await self.queue.async_write(FUNC_WRITE_READ, clock_parameters(now))
+        if frame is None:
+            _LOGGER.warning("No response received while setting the clock of [%s].", self.name)
+            return False
+        _LOGGER.debug("Clock of [%s] set to %s %s", self.name,
+                      frame.params.get("rtc_calendar"), frame.params.get("rtc_time"))
+        return True
+
+    async def async_write(self, params: dict) -> bool:
+        """
+        Schreibt Parameter auf den Lüfter und übernimmt die Antwort (0x06) als neuen Zustand.
+        Befehle, die innerhalb von WRITE_COALESCE_WINDOW eintreffen (z.B. aus einer Szene),
+        werden zu einem einzigen WRITE-Paket mit mehreren Parametern zusammengefasst.
+        """
+        self._pending_write.update(params)
+        if self._write_task is None:
+            self._write_task = asyncio.get_running_loop().create_task(self._async_flush_write())
+        return await asyncio.shield(self._write_task)
+
+    async def _async_flush_write(self) -> bool:
+        """Sendet alle gesammelten Parameter als ein WRITE-Paket."""
+        await asyncio.sleep(WRITE_COALESCE_WINDOW)
+        params, self._pending_write = self._pending_write, {}
+        self._write_task = None
+        _LOGGER.debug("Writing %s to [%s]", params, self.name)
+        frame = await self.queue.async_write(FUNC_WRITE_READ, params)
+        if frame is None:
+            _LOGGER.warning("No response received for write to [%s].", self.name)
+            self.async_record_write_result(False)
+            return False
+        self.async_record_write_result(True)
+        if not frame.params:
+            _LOGGER.warning("No valid parameters parsed from write response of [%s].", self.name)
+            return False
+        self.async_set_data(frame.params)
+        return True
+
+
+class VentoGroup:
+    """
+    Gruppe von Lüftern (z.B. ein Paar mit Wärmerückgewinnung), die gemeinsam geschaltet werden.
+    Die Mitglieder werden bei jedem Zugriff über ihre Config-Entries aufgelöst,
+    damit neu geladene Entries automatisch berücksichtigt werden.
+    """
+
+    def __init__(self, name: str, entry_ids: list[str], domain_data: dict):
+        self.name = name
+        self.entry_ids = entry_ids
+        self.last_result: dict | None = None
+        # Optionaler Regler der Gruppe, ausgewertet nach jeder Abfrage eines Mitglieds
+        self.controller: SpeedController | None = None
+        self._domain_data = domain_data
+
+    @property
+    def devices(self) -> list[VentoDevice]:
+        """Die derzeit geladenen Mitglieder."""
+        return [device for device in map(self.member, self.entry_ids) if device is not None]
+
+    def member(self, entry_id: str) -> VentoDevice | None:
+        """Das Mitglied eines Config-Entries, sofern es derzeit geladen ist."""
+        device = self._domain_data.get(entry_id)
+        return device if isinstance(device, VentoDevice) else None
+
+    async def async_write(self, params: dict) -> dict:
+        """Schreibt params gleichzeitig auf alle Mitglieder, siehe BlaubergVentoCoordinator.async_group_write."""
+        self.last_result = await self._domain_data[DATA_COORDINATOR].async_group_write(self.devices, params)
+        return self.last_result
+
+
+class BlaubergVentoCoordinator:
+    """
+    Domänenweiter Koordinator, abgelegt in hass.data[DOMAIN].
+    Besitzt einen einzigen UDP-Socket und einen einzigen Timer für alle Config-Entries;
+    Antworten werden vom Transport anhand der DeviceID im Paketkopf zugeordnet.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.devices: dict[str, VentoDevice] = {}
+        self._transport: VentoTransport | None = None
+        self._unsub_timer = None
+        self._unsub_clock = None
+        # Begrenzt die gleichzeitig laufenden Abfragen, damit viele Lüfter nicht im selben Moment senden
+        self._poll_slots = asyncio.Semaphore(MAX_POLLS_IN_FLIGHT)
+        self._polls_in_flight = 0
+        self._setup_lock = asyncio.Lock()
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        # DeviceID -> gespeicherte Antwortzeit-Statistik (RttEstimator.as_dict)
+        self._stored_rtt: dict | None = None
+        # DeviceID -> zuletzt bekannter Zustand (VentoDevice.data)
+        self._stored_state: dict = {}
+        # DeviceID -> Ergebnis der letzten Fähigkeitsprüfung samt Firmware-Version (DeviceCapabilities.as_dict)
+        self._stored_capabilities: dict = {}
+        self._capture: CaptureWriter | None = None
+        self._capture_lock = asyncio.Lock()
+        self._unsub_capture = None
+
+    async def async_add_entry(self, entry: ConfigEntry) -> VentoDevice:
+        """Legt den Lüfter eines Config-Entries an und startet bei Bedarf den gemeinsamen Timer."""
+        async with self._setup_lock:
+            if self._stored_rtt is None:
+                stored = await self._store.async_load() or {}
+                self._stored_rtt = stored.get("rtt", {})
+                self._stored_state = stored.get("state", {})
+                self._stored_capabilities = stored.get("capabilities", {})
+            if self._transport is None or self._transport.is_closing:
+                self._transport = await VentoTransport.async_create()
+                self._transport.capture = self._capture
+
+        data = entry.data
+        client = BlaubergVentoUDPClient(
+            data[CONF_IP_ADDRESS], data[CONF_DEVICE_ID], data[CONF_PASSWORD],
+            transport=self._transport,
+            ring_size=entry.options.get(CONF_PACKET_BUFFER, DEFAULT_RING_SIZE),
+        )
+        client.rtt.restore(self._stored_rtt.get(data[CONF_DEVICE_ID], {}))
+        device = VentoDevice(
+            data.get("name", "Blauberg Vento"), client,
+            entry.options.get(CONF_MIN_GAP, DEFAULT_MIN_GAP * 1000) / 1000,
+        )
+        device.async_restore(self._stored_state.get(data[CONF_DEVICE_ID], {}))
+        if data[CONF_DEVICE_ID] in self._stored_capabilities:
+            # Gilt schon für die erste Abfrage; die Firmware-Version wird danach geprüft
+            device.async_set_capabilities(DeviceCapabilities.from_dict(self._stored_capabilities[data[CONF_DEVICE_ID]]))
+        device.sync_clock = entry.options.get(CONF_SYNC_CLOCK, True)
+        self.async_set_controller(device, entry.options)
+        device.reschedule = self._async_schedule_poll
+        signal = SIGNAL_DEVICE_UPDATED.format(entry.entry_id)
+        device.async_add_listener(lambda: async_dispatcher_send(self.hass, signal))
+        self.devices[entry.entry_id] = device
+        self._async_update_phases()
+        self.async_set_poll_intervals(
+            device,
+            entry.options.get(CONF_POLL_MIN, DEFAULT_POLL_MIN),
+            entry.options.get(CONF_POLL_MAX, DEFAULT_POLL_MAX),
+            entry.options.get(CONF_FAST_WINDOW, DEFAULT_FAST_WINDOW),
+        )
+
+        if self._unsub_clock is None:
+            hour, minute, second = CLOCK_SYNC_TIME
+            self._unsub_clock = async_track_time_change(
+                self.hass, self._async_sync_clocks, hour=hour, minute=minute, second=second
+            )
+        return device
+
+    async def async_remove_entry(self, entry_id: str) -> bool:
+        """
+        Entfernt den Lüfter eines Config-Entries.
+        Liefert True, wenn danach kein Lüfter mehr verwaltet wird und Socket und Timer geschlossen wurden.
+        """
+        device = self.devices.pop(entry_id, None)
+        if device is not None:
+            self._stored_rtt[device.device_id] = device.client.rtt.as_dict()
+            self._stored_state[device.device_id] = dict(device.data)
+            device.queue.cancel()
+            await device.client.async_close()
+            self._async_schedule_save()
+            self._async_update_phases()
+        if self.devices:
+            return False
+        await self.async_stop_capture()
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._unsub_clock is not None:
+            self._unsub_clock()
+            self._unsub_clock = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        return True
+
+    async def async_start_capture(self, writer: CaptureWriter):
+        """Zeichnet ab sofort alle Datagramme des gemeinsamen Sockets mit writer auf."""
+        await self.async_stop_capture()
+        self._capture = writer
+        if self._transport is not None:
+            self._transport.capture = writer
+        self._unsub_capture = async_track_time_interval(
+            self.hass, self._async_flush_capture, CAPTURE_FLUSH_INTERVAL
+        )
+        _LOGGER.info("Packet capture started: %s", writer.path)
+
+    async def async_stop_capture(self) -> CaptureWriter | None:
+        """Beendet einen laufenden Mitschnitt und schreibt die restlichen Datensätze."""
+        writer = self._capture
+        if writer is None:
+            return None
+        self._capture = None
+        if self._transport is not None:
+            self._transport.capture = None
+        if self._unsub_capture is not None:
+            self._unsub_capture()
+            self._unsub_capture = None
+        await self._async_flush_capture(writer=writer)
+        await self.hass.async_add_executor_job(writer.close)
+        _LOGGER.info(
+            "Packet capture stopped: %s (%d records, %d dropped)", writer.path, writer.records, writer.dropped
+        )
+        return writer
+
+    async def _async_flush_capture(self, now=None, writer: CaptureWriter | None = None):
+        """Schreibt die gepufferten Datensätze im Executor, damit die Event-Loop nicht blockiert."""
+        writer = writer or self._capture
+        if writer is None:
+            return
+        async with self._capture_lock:
+            await self.hass.async_add_executor_job(writer.write_chunk, writer.drain())
+
+    async def async_group_write(self, devices: list[VentoDevice], params: dict) -> dict:
+        """
+        Schreibt params auf mehrere Lüfter mit möglichst geringem Zeitversatz.
+        Alle Pakete werden vorab gebaut und, sobald die Warteschlangen der Geräte frei sind,
+        unmittelbar nacheinander über den gemeinsamen Socket gesendet; die Antworten werden
+        gleichzeitig abgewartet und als neuer Zustand übernommen; Erreichbarkeit und Abfrageintervall
+        jedes Mitglieds werden wie bei einem einzelnen Befehl gepflegt.
+        Liefert Anzahl der Geräte, Sendespanne (skew_ms), Gesamtdauer und die fehlgeschlagenen Geräte.
+        """
+        if not devices:
+            return {"devices": 0, "skew_ms": 0.0, "elapsed_ms": 0.0, "failed": []}
+        loop = asyncio.get_running_loop()
+        reservations = [loop.create_task(device.queue.async_reserve()) for device in devices]
+        try:
+            await asyncio.gather(*reservations)
+            start = loop.time()
+            frames, skew = await async_send_group(
+                self._transport, [(device.client, FUNC_WRITE_READ, params) for device in devices]
+            )
+            elapsed = loop.time() - start
+        finally:
+            for reservation in reservations:
+                if not reservation.done():
+                    reservation.cancel()
+                elif not reservation.cancelled() and reservation.exception() is None:
+                    reservation.result().set()
+
+        failed = []
+        for device, frame in zip(devices, frames):
+            # Wie bei VentoDevice.async_write: Erreichbarkeit pflegen und danach schnell abfragen
+            device.async_record_write_result(frame is not None)
+            if frame is None:
+                failed.append(device.name)
+                continue
+            if frame.params:
+                device.async_set_data(frame.params)
+            else:
+                failed.append(device.name)
+        result = {
+            "devices": len(devices),
+            "skew_ms": round(skew * 1000, 3),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "failed": failed,
+        }
+        _LOGGER.debug("Group write %s: %s", params, result)
+        if failed:
+            _LOGGER.warning("Group write failed for %s", ", ".join(failed))
+        return result
+
+    @callback
+    def async_set_poll_intervals(self, device: VentoDevice, min_interval: float, max_interval: float,
+                                 fast_window: float):
+        """Übernimmt die Abfrageintervalle eines Lüfters (Optionen) und plant seine nächste Abfrage neu."""
+        device.poll = AdaptivePollInterval(min_interval, max_interval, fast_window)
+        device.async_schedule_next_poll()
+        self._async_schedule_poll()
+
+    @callback
+    def _async_update_phases(self):
+        """
+        Verteilt die Lüfter gleichmäßig über ihr Intervall: in der Reihenfolge ihrer DeviceIDs erhält der
+        i-te von N Lüftern die Phase i/N. Die Verteilung hängt nur von den eingerichteten Lüftern ab,
+        nicht davon, wann sie geladen wurden. Gilt ab der jeweils nächsten geplanten Abfrage.
+        """
+        ordered = sorted(self.devices.values(), key=lambda device: device.device_id)
+        for index, device in enumerate(ordered):
+            device.phase = index / len(ordered)
+
+    def poll_schedule(self) -> dict:
+        """Abfrageplan aller Lüfter zur Kontrolle (Dienst poll_schedule), nach Fälligkeit sortiert."""
+        now = asyncio.get_running_loop().time()
+        devices = sorted(
+            (self.device_poll_schedule(device, now) for device in self.devices.values()),
+            key=lambda item: math.inf if item["next_poll_in_s"] is None else item["next_poll_in_s"],
+        )
+        return {
+            "polls_in_flight": self._polls_in_flight,
+            "max_polls_in_flight": MAX_POLLS_IN_FLIGHT,
+            "devices": devices,
+        }
+
+    def device_poll_schedule(self, device: VentoDevice, now: float | None = None) -> dict:
+        """Abfrageplan eines Lüfters; next_poll_in_s ist None, solange seine Abfrage läuft."""
+        if now is None:
+            now = asyncio.get_running_loop().time()
+        return {
+            "device_id": device.device_id,
+            "name": device.name,
+            "phase": round(device.phase, 4),
+            "interval_s": round(device.poll.current, 3),
+            "next_poll_in_s": None if device.next_poll == math.inf else round(device.next_poll - now, 3),
+            "availability": device.availability,
+        }
+
+    @callback
+    def _async_schedule_poll(self):
+        """Stellt den gemeinsamen Timer auf die früheste fällige Abfrage aller Lüfter."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        due = min((device.next_poll for device in self.devices.values()), default=math.inf)
+        if due == math.inf:
+            return
+        delay = max(0.0, due - asyncio.get_running_loop().time())
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_poll_due)
+
+    async def _async_poll_due(self, now=None):
+        """Fragt alle fälligen Lüfter gleichzeitig über den gemeinsamen Socket ab."""
+        self._unsub_timer = None
+        loop_now = asyncio.get_running_loop().time()
+        due = [device for device in self.devices.values() if device.next_poll <= loop_now]
+        for device in due:
+            # Während der Abfrage nicht erneut auswählen; danach legt sie die nächste fest
+            device.next_poll = math.inf
+        self._async_schedule_poll()
+        await asyncio.gather(*(self._async_poll_device(device) for device in due))
+        self._async_schedule_save()
+
+    async def _async_poll_device(self, device: VentoDevice):
+        try:
+            if await self._async_limited_refresh(device):
+                await self._async_run_controllers(device)
+        finally:
+            device.async_schedule_next_poll()
+            if device in self.devices.values():
+                self._async_schedule_poll()
+
+    async def _async_limited_refresh(self, device: VentoDevice) -> bool:
+        """Abfrage eines Lüfters, sobald weniger als MAX_POLLS_IN_FLIGHT Abfragen laufen."""
+        async with self._poll_slots:
+            self._polls_in_flight += 1
+            try:
+                if not await device.async_refresh():
+                    return False
+                if not device.capabilities_checked:
+                    await self._async_update_capabilities(device)
+                return True
+            finally:
+                self._polls_in_flight -= 1
+
+    async def _async_update_capabilities(self, device: VentoDevice):
+        """
+        Bestätigt die gespeicherten Fähigkeiten eines Lüfters, wenn sie für seine aktuelle Firmware geprüft
+        wurden (ein Paket für die Firmware-Version), und prüft sie sonst einmalig neu.
+        """
+        firmware = await device.async_read_firmware()
+        if firmware is None:
+            return
+        if device.capabilities is not None and device.capabilities.firmware == firmware:
+            device.capabilities_checked = True
+            return
+        _LOGGER.debug("Probing capabilities of [%s] (firmware %s)", device.name, firmware)
+        capabilities = await device.async_probe_capabilities(firmware)
+        if capabilities is None:
+            return
+        device.async_set_capabilities(capabilities)
+        device.capabilities_checked = True
+        self._stored_capabilities[device.device_id] = capabilities.as_dict()
+        self._async_schedule_save()
+
+    async def async_snapshot_config(self, devices: list[VentoDevice]) -> dict:
+        """
+        Liest Einstellungen und Wochenzeitplan aller Lüfter gleichzeitig für einen Konfigurationsabzug
+        (Format siehe snapshot.py). Lüfter ohne Antwort fehlen im Abzug und stehen unter "failed".
+        """
+        async def async_snapshot(device: VentoDevice) -> dict | None:
+            values = await device.async_read_config()
+            if values is None:
+                return None
+            entry = {
+                "name": device.name,
+                "firmware": device.capabilities.firmware if device.capabilities is not None else None,
+                "registers": registers_to_json(values),
+            }
+            if device.supports(PARAM_WEEKLY_SCHEDULE):
+                schedule = await device.async_read_schedule()
+                if schedule is None:
+                    return None
+                entry["schedule"] = [period.as_dict() for period in schedule]
+            return entry
+
+        entries = await asyncio.gather(*(async_snapshot(device) for device in devices))
+        return {
+            "version": SNAPSHOT_VERSION,
+            "created": dt_util.now().isoformat(),
+            "devices": {device.device_id: entry for device, entry in zip(devices, entries) if entry is not None},
+            "failed": [device.device_id for device, entry in zip(devices, entries) if entry is None],
+        }
+
+    async def async_apply_config(self, devices: list[VentoDevice], snapshot: dict, source: str | None = None,
+                                 dry_run: bool = False) -> dict:
+        """
+        Überträgt einen Konfigurationsabzug gleichzeitig auf alle Lüfter: jeder erhält seinen eigenen Eintrag
+        (oder den von source, z.B. für ein Ersatzgerät). Nur abweichende Register und Zeitplaneinträge werden
+        geschrieben und anhand der Antworten geprüft. Liefert je DeviceID das Ergebnis.
+        Alle Einträge werden vor dem ersten Paket geprüft; ein fehlerhafter Eintrag oder ein source, der im
+        Abzug fehlt, löst ValueError aus, ohne dass ein Lüfter etwas erhält.
+        """
+        # DeviceID -> (Register, Zeitplan oder None)
+        entries: dict[str, tuple[dict[int, int | bytes], list[SchedulePeriod] | None]] = {}
+        for device_id, entry in snapshot["devices"].items():
+            try:
+                if not isinstance(entry, Mapping):
+                    raise ValueError(f"Invalid entry: {entry!r}")
+                entries[device_id] = (
+                    registers_from_json(entry.get("registers", {})),
+                    schedule_from_json(entry["schedule"]) if "schedule" in entry else None,
+                )
+            except ValueError as err:
+                raise ValueError(f"{device_id}: {err}") from err
+        if source is not None and source not in entries:
+            raise ValueError(f"{source} is not in the snapshot")
+
+        async def async_apply(device: VentoDevice) -> dict:
+            entry = entries.get(source or device.device_id)
+            if entry is None:
+                return {"error": "not_in_snapshot"}
+            registers, desired_schedule = entry
+            desired = {param_id: value for param_id, value in registers.items() if device.supports(param_id)}
+            current = await device.async_read_config()
+            if current is None:
+                return {"error": "no_response"}
+            changes = diff_registers(current, desired)
+            periods = []
+            if desired_schedule is not None and device.supports(PARAM_WEEKLY_SCHEDULE):
+                schedule = await device.async_read_schedule()
+                if schedule is None:
+                    return {"error": "no_response"}
+                periods = diff_schedule(schedule, desired_schedule)
+            result = {
+                "changed": sorted(registers_to_json(changes)),
+                "schedule_changed": [period.as_dict() for period in periods],
+            }
+            if dry_run:
+                return result
+            mismatched = await device.async_write_config(changes) if changes else []
+            if mismatched is None:
+                return {**result, "error": "no_response"}
+            result["mismatched"] = sorted(registers_to_json({param_id: changes[param_id] for param_id in mismatched}))
+            if periods:
+                if not await device.async_write_schedule(periods):
+                    return {**result, "error": "no_response"}
+                result["schedule_mismatched"] = [period.as_dict() for period in diff_schedule(device.schedule, periods)]
+            result["verified"] = not result["mismatched"] and not result.get("schedule_mismatched")
+            return result
+
+        results = await asyncio.gather(*(async_apply(device) for device in devices))
+        return {device.device_id: result for device, result in zip(devices, results)}
+
+    @callback
+    def async_set_controller(self, target: VentoDevice | VentoGroup, options: Mapping):
+        """Richtet den Regler eines Lüfters oder einer Gruppe nach seinen Optionen ein oder entfernt ihn."""
+        control = options.get(CONF_CONTROL, CONTROL_OFF)
+        if control == CONTROL_OFF or (control == CONTROL_SENSOR and not options.get(CONF_CONTROL_SENSOR)):
+            target.controller = None
+            return
+        target.controller = SpeedController(
+            CONTROL_HUMIDITY if control == CONTROL_HUMIDITY else options[CONF_CONTROL_SENSOR],
+            tuple(
+                options.get(key, default) for key, default in zip(
+                    (CONF_CONTROL_SPEED1, CONF_CONTROL_SPEED2, CONF_CONTROL_SPEED3), DEFAULT_CONTROL_THRESHOLDS
+                )
+            ),
+            options.get(CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS),
+            options.get(CONF_CONTROL_DWELL_UP, DEFAULT_CONTROL_DWELL_UP),
+            options.get(CONF_CONTROL_DWELL_DOWN, DEFAULT_CONTROL_DWELL_DOWN),
+        )
+
+    async def _async_run_controllers(self, device: VentoDevice):
+        """Wertet nach einer Abfrage die Regler des Lüfters und der Gruppen aus, zu denen er gehört."""
+        targets = [device, *(
+            group for group in self.hass.data.get(DOMAIN, {}).values()
+            if isinstance(group, VentoGroup) and device in group.devices
+        )]
+        for target in targets:
+            if target.controller is not None:
+                await self._async_control(target)
+
+    async def _async_control(self, target: VentoDevice | VentoGroup):
+        """
+        Stellt die Stufe nach dem Regler, aber nur, wenn sich die Zielstufe von der tatsächlichen unterscheidet.
+        Eine Gruppe folgt der Stufe ihres ersten Mitglieds und schreibt Ein/Aus immer mit, damit alle
+        Mitglieder danach gleich laufen.
+        """
+        controller = target.controller
+        devices = target.devices if isinstance(target, VentoGroup) else [target]
+        if not devices:
+            return
+        value = self._control_value(controller.source, devices)
+        level = current_level(devices[0].data)
+        if value is None or level is None:
+            return
+        now = asyncio.get_running_loop().time()
+        new_level = controller.update(value, level, now)
+        if new_level is None:
+            return
+        _LOGGER.debug("Controller of [%s]: %s -> speed %d (was %d)", target.name, value, new_level, level)
+        controller.commanded(new_level, now)
+        await target.async_write(level_parameters(new_level, {} if isinstance(target, VentoGroup) else devices[0].data))
+
+    def _control_value(self, source: str, devices: list[VentoDevice]) -> float | None:
+        """Messwert des Reglers: höchste Luftfeuchte der erreichbaren Lüfter oder der Zustand des Sensors."""
+        if source == CONTROL_HUMIDITY:
+            return max(
+                (device.data["humidity"] for device in devices if device.available and "humidity" in device.data),
+                default=None,
+            )
+        state = self.hass.states.get(source)
+        if state is None:
+            return None
+        try:
+            return float(state.state)
+        except ValueError:  # unknown, unavailable
+            return None
+
+    async def _async_sync_clocks(self, now=None):
+        """Stellt täglich die Uhren aller Lüfter, deren Option dafür aktiv ist (auch nach Zeitumstellungen)."""
+        now = dt_util.now()
+        await asyncio.gather(*(
+            device.async_set_clock(now) for device in self.devices.values()
+            if device.sync_clock and device.supports(PARAM_RTC_TIME)
+        ))
+
+    @callback
+    def async_refresh_in_background(self, entry: ConfigEntry, device: VentoDevice):
+        """
+        Erste Abfrage eines Lüfters im Hintergrund, damit der Start von Home Assistant nicht
+        auf (eventuell nicht erreichbare) Lüfter wartet; bis dahin gilt der gespeicherte Zustand.
+        Antwortet der Lüfter, werden danach seine Uhr gestellt und sein Wochenzeitplan gelesen.
+        """
+        async def async_first_refresh():
+            if not await self._async_limited_refresh(device):
+                return
+            if device.sync_clock and device.supports(PARAM_RTC_TIME):
+                await device.async_set_clock(dt_util.now())
+            if device.supports(PARAM_WEEKLY_SCHEDULE):
+                await device.async_read_schedule()
+
+        entry.async_create_background_task(
+            self.hass, async_first_refresh(), f"{DOMAIN} first refresh {device.device_id}"
+        )
+
+    @callback
+    def _async_schedule_save(self):
+        """Speichert Antwortzeit-Statistik und letzten Zustand verzögert, damit sie Neustarts überdauern."""
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        rtt = dict(self._stored_rtt or {})
+        state = dict(self._stored_state)
+        for device in self.devices.values():
+            rtt[device.device_id] = device.client.rtt.as_dict()
+            if device.data:
+                state[device.device_id] = device.data
+        return {"rtt": rtt, "state": state, "capabilities": dict(self._stored_capabilities)}
+
@@ -0,0 +1,70 @@
+# diagnostics.py
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .capture import format_packets
+from .const import DATA_COORDINATOR, DOMAIN
+from .coordinator import VentoDevice, VentoGroup
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Zustand und Übertragungsstatistik eines Lüfters für den Diagnose-Download."""
+    device: VentoDevice | VentoGroup = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(device, VentoGroup):
+        return _group_diagnostics(entry, device)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    client = device.client
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "device": {
+            "device_id": device.device_id,
+            "ip": client.ip,
+            "port": client.port,
+            "availability": device.availability,
+            "failures": device.failures,
+            "data": device.data,
+            "schedule": [period.as_dict() for period in device.schedule] if device.schedule is not None else None,
+            "capabilities": device.capabilities.as_dict() if device.capabilities is not None else None,
+            "poll_parameters": [f"0x{param_id:04X}" for param_id in device.poll_parameters],
+            "controller": device.controller.as_dict() if device.controller is not None else None,
+        },
+        "transport": {
+            "rtt": client.rtt.as_dict(),
+            "rto": client.rtt.rto,
+            "retries": client.retries,
+            "metrics": client.metrics.as_dict(),
+        },
+        "packets": format_packets(client.metrics.packets.records()) if client.metrics.packets is not None else [],
+        "poll": coordinator.device_poll_schedule(device),
+        "queue": {
+            "min_gap": device.queue.min_gap,
+            "pending": device.queue.pending,
+            "dropped_reads": device.queue.dropped_reads,
+        },
+    }
+
+
+def _group_diagnostics(entry: ConfigEntry, group: VentoGroup) -> dict:
+    """Gruppen haben keinen eigenen Socket: Mitglieder, Optionen und das Ergebnis des letzten Gruppenbefehls."""
+    members = []
+    for entry_id in group.entry_ids:
+        device = group.member(entry_id)
+        member = {"entry_id": entry_id, "loaded": device is not None}
+        if device is not None:
+            member.update(device_id=device.device_id, name=device.name, availability=device.availability)
+        members.append(member)
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "group": {
+            "name": group.name,
+            "members": members,
+            "last_result": group.last_result,
+            "controller": group.controller.as_dict() if group.controller is not None else None,
+        },
+    }
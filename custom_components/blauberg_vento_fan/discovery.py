@@ -0,0 +1,144 @@
+# discovery.py
+
+"""
+Suche nach Vento-Lüftern im lokalen Netz.
+Die Suchanfrage (READ mit DeviceID "DEFAULT_DEVICEID") wird per Broadcast und zusätzlich
+gleichzeitig an alle Adressen eines angegebenen Subnetzes geschickt; alle Antworten
+innerhalb des Zeitfensters werden gesammelt.
+"""
+
+import asyncio
+import ipaddress
+import logging
+from dataclasses import dataclass
+
+try:
+    from .codec import (
+        FUNC_READ, PARAM_DEVICE_SEARCH, PARAM_FIRMWARE, PARAM_UNIT_ON_OFF, PARAM_UNIT_TYPE,
+        Encoder, ProtocolError, decode,
+    )
+    from .udp_client import DEFAULT_PORT, BlaubergVentoUDPClient, VentoTransport
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from codec import (
+        FUNC_READ, PARAM_DEVICE_SEARCH, PARAM_FIRMWARE, PARAM_UNIT_ON_OFF, PARAM_UNIT_TYPE,
+        Encoder, ProtocolError, decode,
+    )
+    from udp_client import DEFAULT_PORT, BlaubergVentoUDPClient, VentoTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+SEARCH_DEVICE_ID = b"DEFAULT_DEVICEID"
+DEFAULT_PASSWORD = "1111"
+DISCOVERY_TIMEOUT = 2.0
+# Größtes Subnetz, das vollständig abgefragt wird (/22 = 1022 Adressen)
+MAX_PROBE_HOSTS = 1022
+# Pakete, nach denen beim Abfragen eines Subnetzes kurz an die Event-Loop abgegeben wird
+PROBE_BATCH = 64
+
+UNIT_TYPES = {
+    3: "Vento Expert A50-1/A85-1/A100-1 W V.2",
+    4: "Vento Expert Duo A30-1 W V.2",
+    5: "Vento Expert A30 W V.2",
+}
+
+
+@dataclass
+class DiscoveredDevice:
+    """Ein gefundener Lüfter."""
+    ip: str
+    device_id: str
+    unit_type: int | None = None
+    firmware: str | None = None
+
+    @property
+    def model(self) -> str:
+        if self.unit_type is None:
+            return "Vento Expert"
+        return UNIT_TYPES.get(self.unit_type, f"Unit type {self.unit_type}")
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Sammelt alle Antworten auf die Suchanfrage, unabhängig von der DeviceID."""
+
+    def __init__(self):
+        self.transport = None
+        self.found: dict[str, DiscoveredDevice] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            frame = decode(data)
+        except ProtocolError as err:
+            _LOGGER.debug("Ungültige Antwort von %s bei der Suche: %s", addr, err)
+            return
+        device_id = frame.params.get("device_id") or frame.device_id.decode("ascii", "replace")
+        if device_id in self.found or device_id == SEARCH_DEVICE_ID.decode("ascii"):
+            return
+        self.found[device_id] = DiscoveredDevice(
+            ip=addr[0],
+            device_id=device_id,
+            unit_type=frame.params.get("unit_type"),
+            firmware=frame.params.get("firmware"),
+        )
+
+    def error_received(self, exc):
+        _LOGGER.debug("UDP-Fehler bei der Suche: %s", exc)
+
+
+def _probe_hosts(subnet: str | None) -> list[str]:
+    """Adressen eines Subnetzes, z.B. "192.168.1.0/24"; zu große Netze werden abgelehnt."""
+    if not subnet:
+        return []
+    network = ipaddress.ip_network(subnet, strict=False)
+    if network.num_addresses - 2 > MAX_PROBE_HOSTS:
+        raise ValueError(f"Subnetz {subnet} ist zu groß (maximal /22)")
+    return [str(host) for host in network.hosts()]
+
+
+async def async_discover(subnet: str | None = None, password: str = DEFAULT_PASSWORD,
+                         broadcast: str | None = "255.255.255.255", port: int = DEFAULT_PORT,
+                         timeout: float = DISCOVERY_TIMEOUT) -> list[DiscoveredDevice]:
+    """
+    Sucht Lüfter per Broadcast und, falls angegeben, durch gleichzeitiges Abfragen aller
+    Adressen des Subnetzes. Liefert alle innerhalb von timeout Sekunden gefundenen Geräte.
+    """
+    hosts = _probe_hosts(subnet)
+    packet = Encoder(SEARCH_DEVICE_ID, password.encode("ascii")).encode(
+        FUNC_READ, (PARAM_DEVICE_SEARCH, PARAM_UNIT_TYPE, PARAM_FIRMWARE)
+    )
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        _DiscoveryProtocol, local_addr=("0.0.0.0", 0), allow_broadcast=True
+    )
+    try:
+        if broadcast:
+            transport.sendto(packet, (broadcast, port))
+        for index, host in enumerate(hosts, 1):
+            transport.sendto(packet, (host, port))
+            if index % PROBE_BATCH == 0:
+                await asyncio.sleep(0)
+        await asyncio.sleep(timeout)
+    finally:
+        transport.close()
+    return sorted(protocol.found.values(), key=lambda device: device.ip)
+
+
+async def async_verify(devices: list[tuple[str, str, str]], port: int = DEFAULT_PORT) -> list[bool]:
+    """
+    Prüft gleichzeitig für jedes (IP, DeviceID, Passwort), ob das Gerät eine READ-Anfrage beantwortet.
+    Damit werden DeviceID und Passwort vor dem Anlegen eines Config-Entries bestätigt.
+    """
+    transport = await VentoTransport.async_create()
+    try:
+        clients = [
+            BlaubergVentoUDPClient(ip, device_id, password, port=port, transport=transport, retries=2)
+            for ip, device_id, password in devices
+        ]
+        frames = await asyncio.gather(*(
+            client.async_send_command(FUNC_READ, (PARAM_UNIT_ON_OFF,)) for client in clients
+        ))
+    finally:
+        transport.close()
+    return [frame is not None and PARAM_UNIT_ON_OFF not in frame.unsupported for frame in frames]
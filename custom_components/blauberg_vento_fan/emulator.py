@@ -0,0 +1,365 @@
+# emulator.py
+
+"""
+Emulator für Vento Expert Lüfter (UDP-Protokoll, 0xFD 0xFD Framing).
+Ein Prozess kann hunderte virtuelle Geräte auf localhost-Ports bereitstellen, damit die
+Integration ohne Hardware getestet und unter Last gesetzt werden kann.
+
+Beispiel:
+    python emulator.py --devices 100 --base-port 40000 --latency 0.005 --loss 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+
+try:
+    from . import codec
+    from .codec import (
+        BGCP_CMD_NOT_SUP, BGCP_CMD_PAGE, BGCP_CMD_SIZE, FUNC_READ, FUNC_RESPONSE,
+        FUNC_WRITE, FUNC_WRITE_READ, Encoder, ProtocolError, decode,
+    )
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    import codec
+    from codec import (
+        BGCP_CMD_NOT_SUP, BGCP_CMD_PAGE, BGCP_CMD_SIZE, FUNC_READ, FUNC_RESPONSE,
+        FUNC_WRITE, FUNC_WRITE_READ, Encoder, ProtocolError, decode,
+    )
+
+_LOGGER = logging.getLogger(__name__)
+
+# DeviceID, mit der die Geräte-Suche arbeitet; jedes Gerät antwortet darauf
+SEARCH_DEVICE_ID = b"DEFAULT_DEVICEID"
+
+# Nur lesbare Register; Schreibversuche lassen den Wert unverändert
+READ_ONLY_PARAMS = {
+    param_id for param_id, descriptor in codec.PARAMETERS.items() if not descriptor.writable
+}
+# Nur beschreibbare Register (z.B. Filter-Reset); sie werden nicht gespeichert
+WRITE_ONLY_PARAMS = {
+    param_id for param_id, descriptor in codec.PARAMETERS.items() if not descriptor.readable
+}
+# Zeitplaneinträge kommen in einem Paket mehrfach vor und werden roh gesammelt
+_SCHEDULE_DESCRIPTORS = {
+    codec.PARAM_SCHEDULE_PERIOD: codec.ParamDescriptor("schedule", bytes, 6, repeat=True),
+}
+# Tage, die ein Zeitplaneintrag beim Schreiben setzt (Tagesgruppen weekdays, weekend, all)
+_SCHEDULE_DAY_GROUPS = {7: range(0, 5), 8: range(5, 7), 9: range(0, 7)}
+
+
+def default_registers(device_id: bytes) -> dict[int, bytes]:
+    """Registerbelegung eines frisch eingeschalteten Geräts (Vento Expert A50-1 W V.2)."""
+    return {
+        codec.PARAM_UNIT_ON_OFF: b"\x00",
+        codec.PARAM_SPEED_NUMBER: b"\x01",
+        codec.PARAM_BOOST_STATUS: b"\x00",
+        codec.PARAM_TIMER_MODE: b"\x00",
+        codec.PARAM_TIMER_COUNTDOWN: b"\x00\x00\x00",
+        codec.PARAM_HUMIDITY_SENSOR: b"\x00",
+        codec.PARAM_RELAY_SENSOR: b"\x00",
+        codec.PARAM_ANALOG_SENSOR: b"\x00",
+        codec.PARAM_HUMIDITY_SETPOINT: b"\x3C",
+        codec.PARAM_RTC_BATTERY: (3012).to_bytes(2, "little"),
+        codec.PARAM_HUMIDITY: b"\x2D",
+        codec.PARAM_ANALOG_VALUE: b"\x00",
+        codec.PARAM_RELAY_STATUS: b"\x00",
+        codec.PARAM_MANUAL_SPEED: b"\x80",
+        codec.PARAM_FAN1_RPM: (1200).to_bytes(2, "little"),
+        codec.PARAM_FAN2_RPM: (1185).to_bytes(2, "little"),
+        codec.PARAM_FILTER_COUNTDOWN: bytes((0, 12, 90)),          # 90 Tage, 12 Stunden
+        codec.PARAM_BOOST_DELAY: b"\x0A",
+        codec.PARAM_RTC_TIME: bytes((0, 0, 12)),                    # 12:00:00
+        codec.PARAM_RTC_CALENDAR: bytes((1, 3, 1, 25)),             # Mi, 01.01.2025
+        codec.PARAM_WEEKLY_SCHEDULE: b"\x00",
+        codec.PARAM_DEVICE_SEARCH: device_id,
+        codec.PARAM_MACHINE_HOURS: bytes((30, 5, 0x6C, 0x01)),     # 364 Tage, 5:30
+        codec.PARAM_ALARM_STATUS: b"\x00",
+        codec.PARAM_FIRMWARE: bytes((0, 1, 17, 10, 0xE3, 0x07)),  # 0.1, 17.10.2019
+        codec.PARAM_FILTER_INDICATOR: b"\x00",
+        codec.PARAM_VENTILATION_MODE: b"\x00",
+        codec.PARAM_UNIT_TYPE: b"\x03\x00",
+        codec.PARAM_NIGHT_TIMER: bytes((0, 8)),
+        codec.PARAM_PARTY_TIMER: bytes((0, 4)),
+        codec.PARAM_HUMIDITY_OVER: b"\x00",
+        codec.PARAM_ANALOG_OVER: b"\x00",
+    }
+
+
+def default_schedule() -> dict[tuple[int, int], bytes]:
+    """Wochenzeitplan ab Werk: je Tag vier Perioden auf Stufe 1 bis 6:00, 12:00, 18:00 und 23:59."""
+    ends = ((0, 6), (0, 12), (0, 18), (59, 23))
+    return {
+        (day, period): bytes((day, period, 1, 0, minute, hour))
+        for day in range(7) for period, (minute, hour) in enumerate(ends, start=1)
+    }
+
+
+@dataclass
+class FaultProfile:
+    """Konfigurierbares Fehlverhalten eines virtuellen Geräts."""
+    latency: float = 0.0            # mittlere Antwortzeit in Sekunden
+    jitter: float = 0.0             # gleichverteilte Abweichung +/- in Sekunden
+    loss: float = 0.0               # Wahrscheinlichkeit, dass eine Anfrage verloren geht
+    corrupt: float = 0.0            # Wahrscheinlichkeit für eine fehlerhafte Checksumme
+    unsupported: set[int] = field(default_factory=set)  # mit 0xFD beantwortete Parameter
+    omitted: set[int] = field(default_factory=set)      # in Antworten auf READ ausgelassene Parameter
+
+
+class VirtualDevice:
+    """Ein virtuelles Gerät mit eigener Registerbelegung."""
+
+    def __init__(self, device_id: str, password: str, registers: dict[int, bytes] | None = None,
+                 faults: FaultProfile | None = None, rng: random.Random | None = None):
+        self.device_id = device_id.encode("ascii")
+        self.password = password.encode("ascii")
+        self.registers = default_registers(self.device_id)
+        if registers:
+            self.registers.update(registers)
+        self.schedule = default_schedule()
+        self.faults = faults or FaultProfile()
+        self.requests = 0
+        self._encoder = Encoder(self.device_id, self.password)
+        self._rng = rng or random.Random()
+
+    def handle(self, data: bytes) -> bytes | None:
+        """Verarbeitet eine Anfrage und liefert die Antwort (oder None, wenn das Gerät schweigt)."""
+        try:
+            device_id, password, func, start = _split_header(data)
+        except ProtocolError:
+            return None
+        if password != self.password or device_id not in (self.device_id, SEARCH_DEVICE_ID):
+            return None
+        try:
+            # Prüft die Checksumme; für WRITE liefert es gleich die Werte
+            frame = decode(data, descriptors=_SCHEDULE_DESCRIPTORS)
+        except ProtocolError:
+            return None
+        self.requests += 1
+
+        echo = {}
+        if func == FUNC_READ:
+            items = [
+                (param_id, self.schedule.get(tuple(address[:2]))
+                 if param_id == codec.PARAM_SCHEDULE_PERIOD else None)
+                for param_id, address in _read_items(data, start, len(data) - 2)
+                if param_id not in self.faults.omitted
+            ]
+        elif func in (FUNC_WRITE, FUNC_WRITE_READ):
+            entries = iter(frame.params.pop("schedule", ()))
+            items = [
+                (param_id, next(entries) if param_id == codec.PARAM_SCHEDULE_PERIOD else None)
+                for param_id in frame.ids
+            ]
+            for param_id, value in items:
+                if value is not None and codec.PARAM_SCHEDULE_PERIOD not in self.faults.unsupported:
+                    self._write_schedule(value)
+            for param_id, value in frame.params.items():
+                value = value.to_bytes(1, "little") if isinstance(value, int) else value
+                if param_id in self.faults.unsupported or param_id in READ_ONLY_PARAMS:
+                    continue
+                if param_id in WRITE_ONLY_PARAMS:
+                    self._apply_action(param_id)
+                    echo[param_id] = value
+                elif param_id in self.registers:
+                    self.registers[param_id] = value
+            if func == FUNC_WRITE:
+                return None
+        else:
+            return None
+
+        response = self._encoder.wrap(self._response_payload(items, echo))
+        if self.faults.corrupt and self._rng.random() < self.faults.corrupt:
+            response = response[:-1] + bytes(((response[-1] + 1) & 0xFF,))
+        return response
+
+    def _apply_action(self, param_id: int):
+        """Wirkung der nur beschreibbaren Register."""
+        if param_id == codec.PARAM_FILTER_RESET:
+            self.registers[codec.PARAM_FILTER_COUNTDOWN] = bytes((0, 0, 90))
+            self.registers[codec.PARAM_FILTER_INDICATOR] = b"\x00"
+        elif param_id == codec.PARAM_ALARM_RESET:
+            self.registers[codec.PARAM_ALARM_STATUS] = b"\x00"
+
+    def _write_schedule(self, value: bytes):
+        """Übernimmt einen Zeitplaneintrag; Tagesgruppen setzen alle ihre Tage."""
+        day, period = value[0], value[1]
+        for target in _SCHEDULE_DAY_GROUPS.get(day, (day,)):
+            if (target, period) in self.schedule:
+                self.schedule[target, period] = bytes((target, period)) + value[2:]
+
+    def _response_payload(self, items: list[tuple[int, bytes | None]], echo: dict[int, bytes]) -> bytearray:
+        """Antwort auf (Nummer, Wert)-Paare; ein Wert ersetzt das Register (z.B. Zeitplaneinträge)."""
+        payload = bytearray((FUNC_RESPONSE,))
+        page = 0
+        for param_id, value in items:
+            param_page = param_id >> 8
+            if param_page != page:
+                payload += bytes((BGCP_CMD_PAGE, param_page))
+                page = param_page
+            number = param_id & 0xFF
+            value = value or echo.get(param_id) or self.registers.get(param_id)
+            if value is None or param_id in self.faults.unsupported:
+                payload += bytes((BGCP_CMD_NOT_SUP, number))
+            elif len(value) == 1:
+                payload += bytes((number, value[0]))
+            else:
+                payload += bytes((BGCP_CMD_SIZE, len(value), number))
+                payload += value
+        return payload
+
+    def response_delay(self) -> float | None:
+        """Antwortverzögerung in Sekunden, oder None, wenn die Anfrage verloren geht."""
+        faults = self.faults
+        if faults.loss and self._rng.random() < faults.loss:
+            return None
+        delay = faults.latency
+        if faults.jitter:
+            delay += self._rng.uniform(-faults.jitter, faults.jitter)
+        return max(0.0, delay)
+
+
+def _split_header(data: bytes) -> tuple[bytes, bytes, int, int]:
+    """Liefert DeviceID, Passwort, Funktion und Beginn des Datenbereichs einer Anfrage."""
+    if len(data) < 8 or data[0] != 0xFD or data[1] != 0xFD:
+        raise ProtocolError("header", "Ungültiger Paketkopf")
+    idx = 4 + data[3]
+    if idx >= len(data) - 2:
+        raise ProtocolError("header", "Ungültiger Paketkopf")
+    device_id = data[4:idx]
+    pw_end = idx + 1 + data[idx]
+    if pw_end >= len(data) - 2:
+        raise ProtocolError("header", "Ungültiger Paketkopf")
+    return device_id, data[idx + 1:pw_end], data[pw_end], pw_end + 1
+
+
+def _read_items(data: bytes, idx: int, end: int) -> list[tuple[int, bytes]]:
+    """
+    Liest die Parameternummern einer READ-Anfrage mit ihren Adressbytes (0xFE-Block, z.B. Tag und
+    Periode eines Zeitplaneintrags; sonst leer). Nullbytes (Altform READ mit Wertbytes) werden ignoriert.
+    """
+    items = []
+    page = 0
+    while idx < end:
+        b = data[idx]
+        if b == BGCP_CMD_PAGE:
+            page = data[idx + 1] << 8 if idx + 1 < end else page
+            idx += 2
+        elif b == BGCP_CMD_SIZE:
+            size = data[idx + 1] if idx + 1 < end else 0
+            if idx + 2 < end:
+                items.append((page | data[idx + 2], data[idx + 3:idx + 3 + size]))
+            idx += 3 + size
+        else:
+            if b:
+                items.append((page | b, b""))
+            idx += 1
+    return items
+
+
+class _DeviceProtocol(asyncio.DatagramProtocol):
+    """UDP-Endpunkt eines virtuellen Geräts."""
+
+    def __init__(self, device: VirtualDevice):
+        self.device = device
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        response = self.device.handle(data)
+        if response is None:
+            return
+        delay = self.device.response_delay()
+        if delay is None:
+            return
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self._send, response, addr)
+        else:
+            self._send(response, addr)
+
+    def _send(self, response: bytes, addr):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(response, addr)
+
+
+class VentoEmulator:
+    """Stellt beliebig viele virtuelle Geräte auf eigenen UDP-Ports bereit."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.devices: list[tuple[VirtualDevice, int]] = []
+        self._transports = []
+
+    async def async_add_device(self, device: VirtualDevice, port: int = 0) -> int:
+        """Startet ein Gerät auf dem angegebenen Port (0 = beliebig) und liefert den Port."""
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DeviceProtocol(device), local_addr=(self.host, port)
+        )
+        port = transport.get_extra_info("sockname")[1]
+        self._transports.append(transport)
+        self.devices.append((device, port))
+        return port
+
+    async def async_add_devices(self, count: int, password: str = "1111", base_port: int = 0,
+                                faults: FaultProfile | None = None, seed: int | None = None) -> None:
+        """Startet count Geräte mit fortlaufenden DeviceIDs (und Ports ab base_port, falls gesetzt)."""
+        rng = random.Random(seed)
+        for i in range(count):
+            device = VirtualDevice(f"EMU{i:013d}", password, faults=faults, rng=rng)
+            await self.async_add_device(device, base_port + i if base_port else 0)
+
+    def inventory(self) -> list[dict]:
+        """Liste der Geräte im Format der Geräteliste von udp_test.py."""
+        return [
+            {
+                "ip": self.host,
+                "port": port,
+                "device_id": device.device_id.decode("ascii"),
+                "password": device.password.decode("ascii"),
+            }
+            for device, port in self.devices
+        ]
+
+    def close(self):
+        """Beendet alle Geräte."""
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+
+
+async def _async_main(args):
+    faults = FaultProfile(
+        latency=args.latency, jitter=args.jitter, loss=args.loss, corrupt=args.corrupt,
+        unsupported={int(p, 0) for p in args.unsupported}, omitted={int(p, 0) for p in args.omitted},
+    )
+    emulator = VentoEmulator(args.host)
+    await emulator.async_add_devices(args.devices, args.password, args.base_port, faults, args.seed)
+    print(json.dumps(emulator.inventory(), indent=2), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        emulator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vento Expert UDP-Emulator")
+    parser.add_argument("--devices", type=int, default=1, help="Anzahl virtueller Geräte")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=0, help="erster Port, 0 = beliebige Ports")
+    parser.add_argument("--password", default="1111")
+    parser.add_argument("--latency", type=float, default=0.0, help="Antwortzeit in Sekunden")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Abweichung +/- in Sekunden")
+    parser.add_argument("--loss", type=float, default=0.0, help="Verlustwahrscheinlichkeit 0..1")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Wahrscheinlichkeit fehlerhafter Checksummen 0..1")
+    parser.add_argument("--unsupported", nargs="*", default=[], help="mit 0xFD beantwortete Parameter, z.B. 0xB7")
+    parser.add_argument("--omitted", nargs="*", default=[], help="in Antworten auf READ ausgelassene Parameter")
+    parser.add_argument("--seed", type=int, default=None, help="Startwert für reproduzierbares Fehlverhalten")
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,60 @@
+# entity.py
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+
+from .const import DOMAIN
+from .coordinator import VentoDevice
+
+
+class BlaubergVentoEntity(Entity):
+    """
+    Gemeinsame Basis aller Entitäten eines Lüfters.
+    Die Werte stammen aus der gemeinsamen Abfrage des Koordinators, die Entität pollt nicht selbst.
+    """
+
+    _attr_should_poll = False
+    # Register-Schlüssel aus VentoDevice.data, von denen der Zustand der Entität abhängt
+    _snapshot_keys: tuple[str, ...] = ()
+
+    def __init__(self, device: VentoDevice):
+        """Ordnet die Entität dem Lüfter im Geräteregister zu."""
+        self._device = device
+        self._device_id = device.device_id
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device.device_id)},
+            name=device.name,
+            manufacturer="Blauberg",
+            model="Vento Expert",
+        )
+        self._last_snapshot: tuple | None = None
+
+    async def async_added_to_hass(self):
+        """Meldet die Entität beim Koordinator an, der sie nach jeder Abfrage aktualisiert."""
+        self._last_snapshot = self._snapshot()
+        self.async_on_remove(self._device.async_add_listener(self._async_handle_device_update))
+
+    @property
+    def available(self) -> bool:
+        """Nicht verfügbar, solange der Lüfter nicht antwortet (siehe VentoDevice.availability)."""
+        return self._device.available
+
+    @property
+    def extra_state_attributes(self):
+        """Kennzeichnet einen nach dem Neustart wiederhergestellten, noch unbestätigten Zustand."""
+        return {"restored": True} if self._device.restored else None
+
+    def _snapshot(self) -> tuple:
+        """Kompakter Zustand der Entität: die Werte ihrer Register-Schlüssel."""
+        data = self._device.data
+        return (self._device.available, self._device.restored, *[data.get(key) for key in self._snapshot_keys])
+
+    @callback
+    def _async_handle_device_update(self):
+        """Schreibt den HA-Zustand nur, wenn sich die eigenen Werte seit dem letzten Schreiben geändert haben."""
+        snapshot = self._snapshot()
+        if snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        self.async_write_ha_state()
@@ -1,41 +1,48 @@
 # fan.py
 
 import logging
-import asyncio
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD
-from homeassistant.helpers.event import async_track_time_interval
-from datetime import timedelta
-from .udp_client import BlaubergVentoUDPClient
-from . import DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from .coordinator import VentoDevice, VentoGroup
+from .const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from .entity import BlaubergVentoEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """
     Setup-Funktion für die Fan-Plattform, aufgerufen durch async_forward_entry_setups.
-    Erstellt und fügt die FanEntity hinzu.
+    Erstellt und fügt die FanEntity hinzu; die Abfragen übernimmt der gemeinsame Koordinator.
     """
-    data = entry.data
-    name = data.get("name", "Blauberg Vento")
-    ip = data.get(CONF_IP_ADDRESS)
-    password = data.get(CONF_PASSWORD)
-    device_id = data.get("deviceId")
-
-    # Überprüfe, ob alle erforderlichen Konfigurationsparameter vorhanden sind
-    if not all([name, ip, password, device_id]):
-        _LOGGER.error("Missing required configuration parameters.")
-        return
-
-    fan = BlaubergVentoFan(name, ip, password, device_id)
-    async_add_entities([fan], update_before_add=True)
-
-    # Starte periodische Updates alle 10 Sekunden mit einer separaten Callback-Methode
-    async_track_time_interval(hass, fan.periodic_update, timedelta(seconds=10))
-
-class BlaubergVentoFan(FanEntity):
+    device: VentoDevice | VentoGroup = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(device, VentoGroup):
+        async_add_entities([BlaubergVentoGroupFan(entry.entry_id, device)])
+    else:
+        async_add_entities([BlaubergVentoFan(device)])
+
+def _percentage_to_speed(percentage: int) -> int:
+    """Rechnet einen Prozentwert in die Geschwindigkeitsstufe 1..3 um."""
+    if percentage <= 33:
+        return 1
+    if percentage <= 66:
+        return 2
+    return 3
+
+def fan_parameters(on: bool | None = None, percentage: int | None = None,
+                   oscillating: bool | None = None) -> dict:
+    """Parameter für Ein/Aus (0x01), Geschwindigkeit (0x02) und Wärmerückgewinnung (0xB7)."""
+    params = {}
+    if on is not None:
+        params[0x01] = 1 if on else 0
+    if percentage is not None:
+        params[0x02] = _percentage_to_speed(percentage)
+    if oscillating is not None:
+        params[0xB7] = 1 if oscillating else 0
+    return params
+
+class BlaubergVentoFan(BlaubergVentoEntity, FanEntity):
     """Repräsentiert den Blauberg Vento Fan als Home Assistant FanEntity."""
 
     _attr_supported_features = (
@@ -44,17 +51,12 @@ class BlaubergVentoFan(FanEntity):
         FanEntityFeature.TURN_OFF |
         FanEntityFeature.OSCILLATE
     )
+    _snapshot_keys = ("unit_on_off", "speed_number", "ventilation_mode")
 
-    def __init__(self, name, ip, password, device_id):
+    def __init__(self, device: VentoDevice):
         """Initialisiert die FanEntity."""
-        self._name = name
-        self._ip = ip
-        self._password = password
-        self._device_id = device_id
-        self._state = False
-        self._speed = 0
-        self._ventilation_mode = "Ventilation"  # Standard: Lüftung (alternativ "Heat Recovery")
-        self._client = BlaubergVentoUDPClient(ip, device_id, password)
+        super().__init__(device)
+        self._name = device.name
 
         # Setze eine eindeutige ID für die Entität
         self._attr_unique_id = f"{self._device_id}_fan"
@@ -67,12 +69,12 @@ class BlaubergVentoFan(FanEntity):
     @property
     def is_on(self):
         """Gibt den Zustand des Lüfters zurück."""
-        return self._state
+        return self._device.data.get("unit_on_off", False)
 
     @property
     def percentage(self):
         """Gibt die Geschwindigkeit des Lüfters als Prozentwert zurück."""
-        return self._speed
+        return self._device.data.get("speed_number", 0)
 
     @property
     def supported_features(self):
@@ -82,15 +84,23 @@ class BlaubergVentoFan(FanEntity):
     @property
     def extra_state_attributes(self):
         """Gibt zusätzliche Attribute zurück."""
-        return {
+        attributes = {
             "ventilation_mode": self._ventilation_mode
         }
+        if self._device.restored:
+            attributes["restored"] = True
+        return attributes
 
     @property
     def unique_id(self):
         """Gibt die eindeutige ID der Entität zurück."""
         return self._attr_unique_id
 
+    @property
+    def _ventilation_mode(self):
+        """Betriebsart laut letzter Abfrage, Standard: Lüftung (alternativ "Heat Recovery")."""
+        return self._device.data.get("ventilation_mode", "Ventilation")
+
     @property
     def oscillating(self):
         """
@@ -100,63 +110,23 @@ class BlaubergVentoFan(FanEntity):
         return self._ventilation_mode == "Heat Recovery"
 
     async def async_update(self):
-        """Aktualisiert den Status des Lüfters."""
-        _LOGGER.debug("Updating fan status for [%s]", self._name)
+        """Aktualisiert den Status des Lüfters (nur bei manuellem Update über homeassistant.update_entity)."""
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                self._client.send_command,
-                0x01,  # Funktion: READ
-                {0x01: 0, 0x02: 0, 0xB7: 0},  # Parameter: Unit, Speed und Ventilation Mode auslesen
-                256
-            )
-            if response:
-                _LOGGER.debug("Received response: %s", response.hex())
-                # Ausgabe des rohen UDP-Pakets ohne Nummerierung:
-                raw_bytes = " ".join(f"{b:02x}" for b in response)
-                _LOGGER.debug("Raw UDP packet: %s", raw_bytes)
-                # Parse die Antwort in udp_client
-                params = self._client.parse_response(response)
-                _LOGGER.debug("Parsed parameters: %s", params)
-                if params:
-                    if 'unit_on_off' in params:
-                        self._state = params['unit_on_off']
-                    if 'speed_number' in params:
-                        self._speed = params['speed_number']
-                    if 'ventilation_mode' in params:
-                        self._ventilation_mode = params['ventilation_mode']
-
-                    _LOGGER.debug(
-                        "Interpreted status: On=%s, Speed=%d, Ventilation Mode=%s",
-                        self._state, self._speed, self._ventilation_mode
-                    )
-                else:
-                    _LOGGER.warning("No valid parameters parsed from response.")
-            else:
-                _LOGGER.warning("No response received during update.")
+            await self._device.async_refresh()
         except Exception as e:
             _LOGGER.error("Error during async_update: %s", e)
 
-        self.schedule_update_ha_state()
-
     async def async_turn_on(self, percentage: int = None, preset_mode: str = None, **kwargs):
-        """Schaltet den Lüfter ein."""
+        """Schaltet den Lüfter ein (optional direkt mit Geschwindigkeit im selben Paket)."""
         _LOGGER.debug(
             "Turning on [%s] with percentage: %s, preset_mode: %s, kwargs: %s",
             self._name, percentage, preset_mode, kwargs
         )
+        params = {0x01: 1}  # Parameter: Unit einschalten
+        if percentage is not None:
+            params[0x02] = _percentage_to_speed(percentage)  # Parameter: Geschwindigkeit setzen
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._client.send_command,
-                0x03,  # Funktion: WRITE
-                {0x01: 1},  # Parameter: Unit einschalten
-                256
-            )
-            self._state = True
-            await self.async_update()
+            await self._device.async_write(params)
         except Exception as e:
             _LOGGER.error("Error during async_turn_on: %s", e)
 
@@ -164,16 +134,7 @@ class BlaubergVentoFan(FanEntity):
         """Schaltet den Lüfter aus."""
         _LOGGER.debug("Turning off [%s] with kwargs: %s", self._name, kwargs)
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._client.send_command,
-                0x03,  # Funktion: WRITE
-                {0x01: 0},  # Parameter: Unit ausschalten
-                256
-            )
-            self._state = False
-            await self.async_update()
+            await self._device.async_write({0x01: 0})  # Parameter: Unit ausschalten
         except Exception as e:
             _LOGGER.error("Error during async_turn_off: %s", e)
 
@@ -181,22 +142,8 @@ class BlaubergVentoFan(FanEntity):
         """Setzt die Lüftergeschwindigkeit basierend auf dem Prozentwert."""
         _LOGGER.debug("Setting speed for [%s] to %s%%", self._name, percentage)
         try:
-            if percentage <= 33:
-                speed_cmd = 1
-            elif percentage <= 66:
-                speed_cmd = 2
-            else:
-                speed_cmd = 3
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._client.send_command,
-                0x03,  # Funktion: WRITE
-                {0x02: speed_cmd},  # Parameter: Geschwindigkeit setzen
-                256
-            )
-            self._speed = speed_cmd * 33  # Beispielhafte Berechnung, ggf. anpassen
-            await self.async_update()
+            # Parameter: Geschwindigkeit setzen
+            await self._device.async_write({0x02: _percentage_to_speed(percentage)})
         except Exception as e:
             _LOGGER.error("Error during async_set_percentage: %s", e)
 
@@ -207,20 +154,92 @@ class BlaubergVentoFan(FanEntity):
         """
         _LOGGER.debug("Setting oscillate (reverse mode) for [%s] to %s", self._name, oscillating)
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._client.send_command,
-                0x03,  # Funktion: WRITE
-                {0xB7: 1 if oscillating else 0},  # Parameter: Betriebsart (1: Wärmerückgewinnung, 0: Lüftung)
-                256
-            )
-            self._ventilation_mode = "Heat Recovery" if oscillating else "Ventilation"
-            await self.async_update()
+            # Parameter: Betriebsart (1: Wärmerückgewinnung, 0: Lüftung)
+            await self._device.async_write({0xB7: 1 if oscillating else 0})
         except Exception as e:
             _LOGGER.error("Error during async_oscillate: %s", e)
 
-    async def periodic_update(self, now):
-        """Callback-Methode für periodische Updates."""
-        _LOGGER.debug("Starting periodic update for [%s]", self._name)
-        await self.async_update()
\ No newline at end of file
+
+class BlaubergVentoGroupFan(FanEntity):
+    """
+    Schaltet eine Gruppe von Lüftern gemeinsam, z.B. ein Paar mit Wärmerückgewinnung.
+    Alle Pakete werden unmittelbar nacheinander gesendet, damit Richtung und Stufe gleichzeitig wechseln.
+    Der Zustand entspricht dem ersten Mitglied; eingeschaltet ist die Gruppe, wenn ein Mitglied läuft.
+    """
+
+    _attr_should_poll = False
+    _attr_supported_features = (
+        FanEntityFeature.SET_SPEED |
+        FanEntityFeature.TURN_ON |
+        FanEntityFeature.TURN_OFF |
+        FanEntityFeature.OSCILLATE
+    )
+
+    def __init__(self, entry_id: str, group: VentoGroup):
+        self._group = group
+        self._attr_name = group.name
+        self._attr_unique_id = f"{entry_id}_group_fan"
+        self._last_snapshot = None
+
+    async def async_added_to_hass(self):
+        """
+        Aktualisiert die Gruppe bei jeder Änderung eines Mitglieds. Abonniert wird je Config-Entry statt je
+        VentoDevice, damit die Gruppe auch einem neu geladenen Mitglied folgt.
+        """
+        for entry_id in self._group.entry_ids:
+            self.async_on_remove(async_dispatcher_connect(
+                self.hass, SIGNAL_DEVICE_UPDATED.format(entry_id), self._async_handle_member_update
+            ))
+
+    @callback
+    def _async_handle_member_update(self):
+        snapshot = (self.available, self.is_on, self.percentage, self.oscillating)
+        if snapshot != self._last_snapshot:
+            self._last_snapshot = snapshot
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        return any(device.available for device in self._group.devices)
+
+    @property
+    def is_on(self):
+        return any(device.data.get("unit_on_off", False) for device in self._group.devices)
+
+    @property
+    def percentage(self):
+        devices = self._group.devices
+        return devices[0].data.get("speed_number", 0) if devices else None
+
+    @property
+    def oscillating(self):
+        devices = self._group.devices
+        return bool(devices) and devices[0].data.get("ventilation_mode") == "Heat Recovery"
+
+    @property
+    def extra_state_attributes(self):
+        result = self._group.last_result or {}
+        return {
+            "members": [device.name for device in self._group.devices],
+            "last_skew_ms": result.get("skew_ms"),
+            "last_elapsed_ms": result.get("elapsed_ms"),
+        }
+
+    async def _async_write(self, params: dict):
+        try:
+            await self._group.async_write(params)
+        except Exception as e:
+            _LOGGER.error("Error during group write to [%s]: %s", self._attr_name, e)
+        self.async_write_ha_state()
+
+    async def async_turn_on(self, percentage: int = None, preset_mode: str = None, **kwargs):
+        await self._async_write(fan_parameters(on=True, percentage=percentage))
+
+    async def async_turn_off(self, **kwargs):
+        await self._async_write(fan_parameters(on=False))
+
+    async def async_set_percentage(self, percentage):
+        await self._async_write(fan_parameters(percentage=percentage))
+
+    async def async_oscillate(self, oscillating: bool) -> None:
+        await self._async_write(fan_parameters(oscillating=oscillating))
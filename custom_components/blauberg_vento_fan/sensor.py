@@ -0,0 +1,246 @@
+# sensor.py
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    REVOLUTIONS_PER_MINUTE,
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfElectricPotential,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+
+from .codec import ERROR_CHECKSUM, ERROR_REASONS
+from .const import DOMAIN
+from .coordinator import VentoDevice
+from .entity import BlaubergVentoEntity
+from .udp_client import BlaubergVentoUDPClient
+
+# Nur die Diagnose-Sensoren (Übertragungsstatistik) werden lokal gepollt, ohne Netzwerkverkehr
+SCAN_INTERVAL = timedelta(seconds=60)
+
+_ALARM_STATES = {0: "none", 1: "alarm", 2: "warning"}
+
+
+@dataclass(frozen=True, kw_only=True)
+class BlaubergVentoSensorEntityDescription(SensorEntityDescription):
+    """Sensor, dessen Wert aus dem Register-Schlüssel key der gemeinsamen Abfrage stammt."""
+    value_fn: Callable[[Any], Any] | None = None
+
+
+SENSORS: tuple[BlaubergVentoSensorEntityDescription, ...] = (
+    BlaubergVentoSensorEntityDescription(
+        key="humidity",
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="fan1_rpm",
+        name="Fan 1 speed",
+        icon="mdi:fan",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="fan2_rpm",
+        name="Fan 2 speed",
+        icon="mdi:fan",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="filter_days_remaining",
+        name="Filter remaining",
+        icon="mdi:air-filter",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.DAYS,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="timer_countdown",
+        name="Timer remaining",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="alarm_status",
+        name="Alarm status",
+        device_class=SensorDeviceClass.ENUM,
+        options=list(_ALARM_STATES.values()),
+        value_fn=lambda value: _ALARM_STATES.get(value),
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="machine_hours",
+        name="Operating hours",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="rtc_battery_voltage",
+        name="RTC battery",
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfElectricPotential.MILLIVOLT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    BlaubergVentoSensorEntityDescription(
+        key="analog_sensor_value",
+        name="0-10V sensor",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BlaubergVentoMetricSensorEntityDescription(SensorEntityDescription):
+    """Diagnose-Sensor, dessen Wert aus der Übertragungsstatistik des UDP-Clients stammt."""
+    value_fn: Callable[[BlaubergVentoUDPClient], Any]
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+def _rtt_ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 1)
+
+
+METRIC_SENSORS: tuple[BlaubergVentoMetricSensorEntityDescription, ...] = (
+    BlaubergVentoMetricSensorEntityDescription(
+        key="rtt",
+        name="Round-trip time",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda client: _rtt_ms(client.rtt.srtt),
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="rtt_p95",
+        name="Round-trip time p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda client: _rtt_ms(client.metrics.rtt_percentile(0.95)),
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="timeouts",
+        name="Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.timeouts,
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="retries",
+        name="Retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.retries,
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="checksum_errors",
+        name="Checksum errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.error_count(ERROR_CHECKSUM),
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="malformed_packets",
+        name="Malformed packets",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: sum(
+            client.metrics.error_count(reason) for reason in ERROR_REASONS if reason != ERROR_CHECKSUM
+        ),
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="unsupported_replies",
+        name="Unsupported parameters",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.unsupported,
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="packets_per_second",
+        name="Packets received",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="packets/s",
+        value_fn=lambda client: round(client.metrics.rates()[0], 3),
+    ),
+    BlaubergVentoMetricSensorEntityDescription(
+        key="bytes_per_second",
+        name="Data received",
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        value_fn=lambda client: round(client.metrics.rates()[1], 1),
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """
+    Legt die Sensoren eines Lüfters an.
+    Alle Werte stammen aus derselben Abfrage wie der Lüfterzustand, zusätzliche Sensoren
+    verursachen also keinen zusätzlichen Netzwerkverkehr.
+    """
+    device: VentoDevice = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(BlaubergVentoSensor(device, description) for description in SENSORS)
+    async_add_entities(
+        BlaubergVentoMetricSensor(device, description) for description in METRIC_SENSORS
+    )
+
+
+class BlaubergVentoSensor(BlaubergVentoEntity, SensorEntity):
+    """Ein Messwert aus der gemeinsamen Registerabfrage."""
+
+    entity_description: BlaubergVentoSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(self, device: VentoDevice, description: BlaubergVentoSensorEntityDescription):
+        super().__init__(device)
+        self.entity_description = description
+        self._attr_unique_id = f"{self._device_id}_{description.key}"
+        self._snapshot_keys = (description.key,)
+
+    @property
+    def native_value(self):
+        """Wert aus der letzten Abfrage."""
+        value = self._device.data.get(self.entity_description.key)
+        if value is None or self.entity_description.value_fn is None:
+            return value
+        return self.entity_description.value_fn(value)
+
+
+class BlaubergVentoMetricSensor(BlaubergVentoEntity, SensorEntity):
+    """
+    Übertragungsstatistik eines Lüfters (Antwortzeiten, Timeouts, verworfene Pakete).
+    Standardmäßig deaktiviert; liest nur lokale Zähler und wird alle SCAN_INTERVAL aktualisiert.
+    """
+
+    entity_description: BlaubergVentoMetricSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+
+    def __init__(self, device: VentoDevice, description: BlaubergVentoMetricSensorEntityDescription):
+        super().__init__(device)
+        self.entity_description = description
+        self._attr_unique_id = f"{self._device_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Die Zähler sind lokal und gerade bei einem nicht erreichbaren Lüfter aufschlussreich."""
+        return True
+
+    async def async_update(self):
+        """Übernimmt den aktuellen Zählerstand."""
+        self._attr_native_value = self.entity_description.value_fn(self._device.client)
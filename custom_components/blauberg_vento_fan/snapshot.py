@@ -0,0 +1,134 @@
+# snapshot.py
+
+"""
+Konfigurationsabzug der Lüfter als versionierte JSON-Datei (Dienste snapshot_config und apply_config).
+
+Format:
+    {"version": 1, "created": "2026-01-01T12:00:00+01:00",
+     "devices": {DeviceID: {"name": ..., "firmware": ..., "registers": {Schlüssel: Wert}, "schedule": [...]}}}
+
+Registerwerte werden roh gespeichert, wie sie im Paket stehen: einbytige als Zahl, mehrbytige (0xFE-Block)
+als Hex-Zeichenkette. Zurückgeschrieben wird damit genau der gelesene Wert, unabhängig von der Umrechnung in
+der Beschreibungstabelle. Schlüssel sind die der Beschreibungstabelle (codec.PARAMETERS), unbekannte
+Parameter stehen als "0x0123". Zeitplaneinträge haben das Format von SchedulePeriod.as_dict.
+"""
+
+import json
+import re
+from collections.abc import Iterable, Mapping
+
+try:
+    from .codec import PARAMETERS, SCHEDULE_DAYS, SCHEDULE_PERIODS, SchedulePeriod
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from codec import PARAMETERS, SCHEDULE_DAYS, SCHEDULE_PERIODS, SchedulePeriod
+
+SNAPSHOT_VERSION = 1
+
+_PARAM_IDS = {descriptor.key: param_id for param_id, descriptor in PARAMETERS.items()}
+
+
+def _raw(value: int | bytes) -> bytes:
+    """Wert als Bytes ohne Auffüllnullen, damit 0x05 und 05 00 (ohne 0xFE-Block gesendet) gleich sind."""
+    if isinstance(value, int):
+        value = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "little")
+    return bytes(value).rstrip(b"\0")
+
+
+def same_value(a: int | bytes | None, b: int | bytes | None) -> bool:
+    """Vergleicht zwei Rohwerte unabhängig davon, ob sie als Zahl oder als 0xFE-Block vorliegen."""
+    if a is None or b is None:
+        return a is b
+    return _raw(a) == _raw(b)
+
+
+def registers_to_json(values: Mapping[int, int | bytes]) -> dict:
+    """Rohwerte (Nummer -> int/bytes) für die Datei."""
+    result = {}
+    for param_id, value in sorted(values.items()):
+        descriptor = PARAMETERS.get(param_id)
+        key = descriptor.key if descriptor is not None else f"0x{param_id:04X}"
+        result[key] = value if isinstance(value, int) else bytes(value).hex()
+    return result
+
+
+def registers_from_json(registers: Mapping[str, int | str]) -> dict[int, int | bytes]:
+    """Umkehrung von registers_to_json; löst ValueError bei unbekannten Schlüsseln oder Werten aus."""
+    if not isinstance(registers, Mapping):
+        raise ValueError(f"Invalid registers: {registers!r}")
+    values = {}
+    for key, value in registers.items():
+        param_id = _PARAM_IDS.get(key)
+        if param_id is None:
+            if not key.startswith("0x"):
+                raise ValueError(f"Unknown register {key!r}")
+            param_id = int(key, 16)
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError(f"Invalid value for {key!r}: {value!r}")
+        value = value if isinstance(value, int) else bytes.fromhex(value)
+        # Breite des Registers: laut Beschreibungstabelle, unbekannte Zahlen ein Byte, Blöcke höchstens 0xFF Bytes
+        descriptor = PARAMETERS.get(param_id)
+        if isinstance(value, int):
+            width = descriptor.size if descriptor is not None else 1
+            if not 0 <= value < 1 << (8 * width):
+                raise ValueError(f"Value for {key!r} out of range for {width} byte(s): {value}")
+        elif len(value) > (descriptor.size if descriptor is not None else 0xFF):
+            raise ValueError(f"Value for {key!r} too long: {len(value)} bytes")
+        values[param_id] = value
+    return values
+
+
+def schedule_from_json(items: list[dict]) -> list[SchedulePeriod]:
+    """
+    Zeitplaneinträge aus der Datei (Format von SchedulePeriod.as_dict); löst ValueError bei Einträgen
+    außerhalb der Bereiche aus, die auch der Dienst set_schedule annimmt.
+    """
+    if not isinstance(items, list):
+        raise ValueError(f"Invalid schedule: {items!r}")
+    periods = []
+    for item in items:
+        if not isinstance(item, Mapping) or item.get("day") not in SCHEDULE_DAYS:
+            raise ValueError(f"Invalid schedule entry: {item!r}")
+        # Stufe 0 ist Standby
+        for key, minimum, maximum in (("period", 1, SCHEDULE_PERIODS), ("speed", 0, 3)):
+            value = item.get(key)
+            if isinstance(value, bool) or not isinstance(value, int) or not minimum <= value <= maximum:
+                raise ValueError(f"Invalid {key} in schedule entry: {item!r}")
+        end = item.get("end")
+        match = re.fullmatch(r"(\d{1,2}):(\d{2})", end) if isinstance(end, str) else None
+        if match is None or int(match[1]) > 23 or int(match[2]) > 59:
+            raise ValueError(f"Invalid end in schedule entry: {item!r}")
+        periods.append(SchedulePeriod(
+            SCHEDULE_DAYS.index(item["day"]), item["period"], item["speed"], int(match[1]), int(match[2])
+        ))
+    return periods
+
+
+def diff_registers(current: Mapping[int, int | bytes], desired: Mapping[int, int | bytes]) -> dict:
+    """Register aus desired, deren Wert sich vom aktuellen unterscheidet."""
+    return {
+        param_id: value for param_id, value in desired.items() if not same_value(current.get(param_id), value)
+    }
+
+
+def diff_schedule(current: Iterable[SchedulePeriod], desired: Iterable[SchedulePeriod]) -> list[SchedulePeriod]:
+    """Zeitplaneinträge aus desired, die im aktuellen Zeitplan fehlen oder abweichen."""
+    current = set(current)
+    return [period for period in desired if period not in current]
+
+
+def dump_snapshot(path: str, snapshot: dict):
+    """Schreibt einen Abzug (blockierend, in Home Assistant im Executor)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(snapshot, file, indent=2, ensure_ascii=False)
+
+
+def load_snapshot(path: str) -> dict:
+    """Liest einen Abzug (blockierend); löst ValueError bei unbekannter Version oder fehlerhaftem Inhalt aus."""
+    with open(path, encoding="utf-8") as file:
+        snapshot = json.load(file)
+    version = snapshot.get("version") if isinstance(snapshot, dict) else None
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if not isinstance(snapshot.get("devices"), dict):
+        raise ValueError("Snapshot contains no devices")
+    return snapshot
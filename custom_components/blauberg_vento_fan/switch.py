@@ -0,0 +1,56 @@
+# switch.py
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+
+from .codec import PARAM_WEEKLY_SCHEDULE
+from .const import DOMAIN
+from .coordinator import VentoDevice
+from .entity import BlaubergVentoEntity
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Legt den Schalter für den Wochenzeitplan eines Lüfters an."""
+    device: VentoDevice = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([BlaubergVentoScheduleSwitch(device)])
+
+
+class BlaubergVentoScheduleSwitch(BlaubergVentoEntity, SwitchEntity):
+    """
+    Schaltet den im Lüfter gespeicherten Wochenzeitplan ein oder aus. Die Perioden erscheinen als
+    Attribut und werden mit dem Dienst set_schedule geändert; der Lüfter schaltet danach selbst,
+    ohne dass Home Assistant zu den Schaltzeiten Pakete senden muss.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Weekly schedule"
+    _attr_icon = "mdi:calendar-clock"
+    _attr_entity_category = EntityCategory.CONFIG
+    _snapshot_keys = ("weekly_schedule_enabled",)
+
+    def __init__(self, device: VentoDevice):
+        super().__init__(device)
+        self._attr_unique_id = f"{self._device_id}_weekly_schedule"
+
+    @property
+    def is_on(self) -> bool | None:
+        return self._device.data.get("weekly_schedule_enabled")
+
+    @property
+    def extra_state_attributes(self):
+        """Die zuletzt gelesenen Perioden des Zeitplans."""
+        attributes = dict(super().extra_state_attributes or {})
+        if self._device.schedule is not None:
+            attributes["periods"] = [period.as_dict() for period in self._device.schedule]
+        return attributes or None
+
+    def _snapshot(self) -> tuple:
+        return (*super()._snapshot(), self._device.schedule)
+
+    async def async_turn_on(self, **kwargs) -> None:
+        await self._device.async_write({PARAM_WEEKLY_SCHEDULE: 1})
+
+    async def async_turn_off(self, **kwargs) -> None:
+        await self._device.async_write({PARAM_WEEKLY_SCHEDULE: 0})
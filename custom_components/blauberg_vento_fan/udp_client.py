@@ -1,229 +1,624 @@
 # udp_client.py
 
-import socket
-import struct
+import asyncio
 import logging
+import socket
+import time
+from bisect import bisect_left
+from collections import deque
+
+try:
+    from .capture import DEFAULT_RING_SIZE, DIRECTION_RX, DIRECTION_TX, CaptureWriter, PacketRing
+    from .codec import ERROR_REASONS, FUNC_READ, Encoder, Frame, ProtocolError, decode, parameter_items
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from capture import DEFAULT_RING_SIZE, DIRECTION_RX, DIRECTION_TX, CaptureWriter, PacketRing
+    from codec import ERROR_REASONS, FUNC_READ, Encoder, Frame, ProtocolError, decode, parameter_items
 
 _LOGGER = logging.getLogger(__name__)
 
-# Beispiel-ParameterIDs
-PARAM_UNIT_ON_OFF        = 0x01   # 0=Off, 1=On
-PARAM_SPEED_NUMBER       = 0x02   # 1..3
-PARAM_VENTILATION_MODE   = 0xB7   # 0=Ventilation, 1=Heat Recovery, 2=Supply
+DEFAULT_PORT            = 4000
+DEFAULT_TIMEOUT         = 3.0    # Obergrenze für einen einzelnen Sendeversuch
+DEFAULT_RETRIES         = 3
+INITIAL_RTO             = 1.0    # Zeitlimit, solange noch keine Messung vorliegt
+MIN_RTO                 = 0.03
+BACKOFF_FACTOR          = 2
+RECEIVE_BUFFER_SIZE     = 1 << 20
+DEFAULT_MIN_GAP         = 0.05   # Mindestabstand zwischen zwei Anfragen an dasselbe Gerät
+# Obergrenzen der Klassen des Antwortzeit-Histogramms in Sekunden; die letzte Klasse ist nach oben offen
+RTT_BUCKETS             = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+RATE_WINDOW             = 60.0   # Zeitraum für Pakete/Bytes pro Sekunde
+
+_ERROR_INDEX = {reason: index for index, reason in enumerate(ERROR_REASONS)}
+
+
+class DeviceMetrics:
+    """
+    Zähler und Antwortzeit-Histogramm eines Geräts, dazu optional ein Ringpuffer
+    der letzten Datagramme (packets).
+    Alle Felder sind beim Anlegen vorhanden; das Erfassen eines Pakets erhöht nur Zähler
+    und legt keine Objekte an. Auswertungen (as_dict, rates) laufen nur bei Bedarf.
+    """
+
+    __slots__ = (
+        "requests", "timeouts", "retries", "unsupported",
+        "packets_sent", "bytes_sent", "packets_received", "bytes_received",
+        "errors", "rtt_histogram", "rtt_count", "rtt_sum", "rtt_max",
+        "packets", "_rate_mark", "_rates",
+    )
+
+    def __init__(self, ring_size: int = DEFAULT_RING_SIZE):
+        self.requests = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.unsupported = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.packets_received = 0
+        self.bytes_received = 0
+        # Verworfene Pakete je ProtocolError.reason, in der Reihenfolge von ERROR_REASONS
+        self.errors = [0] * len(ERROR_REASONS)
+        self.rtt_histogram = [0] * (len(RTT_BUCKETS) + 1)
+        self.rtt_count = 0
+        self.rtt_sum = 0.0
+        self.rtt_max = 0.0
+        self.packets: PacketRing | None = PacketRing(ring_size) if ring_size > 0 else None
+        self._rate_mark = (time.monotonic(), 0, 0)
+        self._rates: tuple[float, float] | None = None
+
+    def record_error(self, reason: str):
+        self.errors[_ERROR_INDEX[reason]] += 1
+
+    def record_rtt(self, sample: float):
+        self.rtt_histogram[bisect_left(RTT_BUCKETS, sample)] += 1
+        self.rtt_count += 1
+        self.rtt_sum += sample
+        if sample > self.rtt_max:
+            self.rtt_max = sample
+
+    def error_count(self, reason: str) -> int:
+        return self.errors[_ERROR_INDEX[reason]]
+
+    def rtt_percentile(self, quantile: float) -> float | None:
+        """Obergrenze der Histogrammklasse, in der das Quantil liegt (Sekunden)."""
+        if not self.rtt_count:
+            return None
+        rank = quantile * self.rtt_count
+        seen = 0
+        for index, count in enumerate(self.rtt_histogram):
+            seen += count
+            if seen >= rank and count:
+                return RTT_BUCKETS[index] if index < len(RTT_BUCKETS) else self.rtt_max
+        return self.rtt_max
+
+    def rates(self) -> tuple[float, float]:
+        """
+        Empfangene Pakete und Bytes pro Sekunde im letzten vollständigen Zeitraum von RATE_WINDOW,
+        bis dieser erstmals abgelaufen ist der Mittelwert seit Beginn.
+        """
+        now = time.monotonic()
+        start, packets, size = self._rate_mark
+        elapsed = now - start
+        if elapsed >= RATE_WINDOW or (self._rates is None and elapsed > 0):
+            rates = (
+                (self.packets_received - packets) / elapsed,
+                (self.bytes_received - size) / elapsed,
+            )
+            if elapsed < RATE_WINDOW:
+                return rates
+            self._rates = rates
+            self._rate_mark = (now, self.packets_received, self.bytes_received)
+        return self._rates or (0.0, 0.0)
+
+    def as_dict(self) -> dict:
+        """Alle Werte, z.B. für die Diagnose-Ausgabe."""
+        packets_per_second, bytes_per_second = self.rates()
+        return {
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "unsupported": self.unsupported,
+            "packets_sent": self.packets_sent,
+            "bytes_sent": self.bytes_sent,
+            "packets_received": self.packets_received,
+            "bytes_received": self.bytes_received,
+            "packets_per_second": round(packets_per_second, 3),
+            "bytes_per_second": round(bytes_per_second, 1),
+            "errors": dict(zip(ERROR_REASONS, self.errors)),
+            "rtt": {
+                "count": self.rtt_count,
+                "mean_ms": round(self.rtt_sum / self.rtt_count * 1000, 2) if self.rtt_count else None,
+                "max_ms": round(self.rtt_max * 1000, 2),
+                "histogram_ms": {
+                    (f"<={bound * 1000:g}" if index < len(RTT_BUCKETS) else f">{RTT_BUCKETS[-1] * 1000:g}"): count
+                    for index, (bound, count) in enumerate(zip(RTT_BUCKETS + (RTT_BUCKETS[-1],), self.rtt_histogram))
+                },
+            },
+        }
+
+
+def request_key(param_ids) -> frozenset[int]:
+    """
+    Schlüssel, über den VentoTransport eine Antwort ihrer Anfrage zuordnet: die angefragten Parameternummern.
+    Das Gerät beantwortet READ und WRITE_READ mit diesen Nummern (nicht unterstützte als 0xFD-Eintrag),
+    eine verspätete Antwort auf eine andere Anfrage wird daher nicht angenommen. Manche Geräte lassen
+    nicht unterstützte Parameter in der Antwort auf READ weg, siehe VentoTransport.async_request.
+    """
+    return frozenset(param_ids)
+
+
+class VentoTransport(asyncio.DatagramProtocol):
+    """
+    Langlebiger UDP-Endpunkt für die Kommunikation mit den Lüftern.
+    Beliebig viele Anfragen können gleichzeitig offen sein; jede Antwort wird anhand
+    der DeviceID im Paketkopf und der enthaltenen Parameter dem passenden Future zugeordnet.
+    Antworten, die zu keiner offenen Anfrage passen (z.B. verspätet nach einem Timeout), werden verworfen.
+    """
+
+    def __init__(self):
+        self._transport = None
+        # DeviceID -> Liste offener Anfragen [(Schlüssel, Teilantwort erlaubt, Future), ...] in Sendereihenfolge,
+        # siehe request_key
+        self._pending: dict[bytes, list[tuple[frozenset[int], bool, asyncio.Future]]] = {}
+        # (IP, Port) -> Zähler des Geräts, damit auch unlesbare Pakete zugeordnet werden
+        self._metrics: dict[tuple, DeviceMetrics] = {}
+        # Optionaler Mitschnitt aller gesendeten und empfangenen Datagramme
+        self.capture: CaptureWriter | None = None
+
+    @classmethod
+    async def async_create(cls, local_addr=("0.0.0.0", 0)) -> "VentoTransport":
+        """Öffnet einen neuen UDP-Endpunkt und liefert das zugehörige Protokollobjekt."""
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_datagram_endpoint(cls, local_addr=local_addr)
+        return protocol
+
+    @property
+    def is_closing(self) -> bool:
+        """True, wenn der Endpunkt geschlossen ist oder gerade geschlossen wird."""
+        return self._transport is None or self._transport.is_closing()
+
+    def connection_made(self, transport):
+        self._transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            # Viele Lüfter antworten nahezu gleichzeitig; der Standardpuffer verwirft sonst Antworten
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+            except OSError as err:
+                _LOGGER.debug("Empfangspuffer konnte nicht vergrößert werden: %s", err)
+
+    def datagram_received(self, data: bytes, addr):
+        if self.capture is not None:
+            self.capture.record(DIRECTION_RX, addr, data)
+        metrics = self._metrics.get(addr)
+        if metrics is not None:
+            metrics.packets_received += 1
+            metrics.bytes_received += len(data)
+            if metrics.packets is not None:
+                metrics.packets.record(DIRECTION_RX, data)
+        try:
+            frame = decode(data)
+        except ProtocolError as err:
+            if metrics is not None:
+                metrics.record_error(err.reason)
+            _LOGGER.warning("Verwerfe Paket von %s: %s", addr, err)
+            return
+        waiters = self._pending.get(frame.device_id)
+        if not waiters:
+            _LOGGER.debug("Unerwartete Antwort von %s (%s)", addr, frame.device_id)
+            return
+        # Die älteste Anfrage mit genau den enthaltenen Parametern, sonst die älteste READ-Anfrage,
+        # deren Parameter die Antwort nur teilweise enthält
+        ids = frozenset(frame.ids)
+        index = next((i for i, (key, _, _) in enumerate(waiters) if key == ids), None)
+        if index is None and ids:
+            index = next((i for i, (key, partial, _) in enumerate(waiters) if partial and ids < key), None)
+        if index is None:
+            _LOGGER.debug("Verwerfe Antwort von %s, die zu keiner offenen Anfrage passt", addr)
+            return
+        key, _, future = waiters.pop(index)
+        if not waiters:
+            del self._pending[frame.device_id]
+        if ids != key:
+            # Ausgelassene Parameter gelten wie 0xFD-Einträge als nicht unterstützt
+            frame = frame._replace(unsupported=[*frame.unsupported, *sorted(key - ids)])
+        if not future.done():
+            future.set_result(frame)
+
+    def error_received(self, exc):
+        _LOGGER.debug("UDP-Fehler empfangen: %s", exc)
+
+    def connection_lost(self, exc):
+        self._transport = None
+        pending, self._pending = self._pending, {}
+        for waiters in pending.values():
+            for _, _, future in waiters:
+                if not future.done():
+                    future.set_exception(exc or ConnectionError("UDP-Endpunkt geschlossen"))
+
+    def release(self, addr):
+        """Vergisst die Zähler eines Geräts, z.B. wenn sein Config-Entry entfernt wird."""
+        self._metrics.pop(addr, None)
+
+    async def async_request(self, addr, device_id: bytes, key: frozenset[int], packet: bytes, timeouts,
+                            metrics: DeviceMetrics | None = None, partial: bool = False) -> tuple[Frame, int]:
+        """
+        Sendet ein Paket und wartet auf die zugehörige, bereits dekodierte Antwort.
+        Für jeden Eintrag in timeouts wird das Paket (erneut) gesendet und so lange gewartet;
+        eine Antwort auf einen früheren Versuch wird weiterhin angenommen.
+        Liefert die Antwort und den Index des letzten Sendeversuchs.
+        Löst asyncio.TimeoutError aus, wenn kein Versuch beantwortet wird.
+        Mit metrics werden gesendete Pakete, Wiederholungen und alle Pakete von addr gezählt.
+        Mit partial (READ) passt auch eine Antwort, die nur einen Teil von key enthält; die fehlenden
+        Parameter stehen dann in Frame.unsupported.
+        """
+        if self.is_closing:
+            raise ConnectionError("UDP-Endpunkt ist geschlossen")
+        entry = self._register(addr, device_id, key, metrics, partial)
+        try:
+            return await self._async_await(entry, addr, packet, timeouts, metrics, False)
+        finally:
+            self._unregister(device_id, entry)
+
+    async def async_request_group(self, requests: list[tuple]) -> tuple[list, float]:
+        """
+        Sendet mehrere Pakete (z.B. an die Lüfter einer Gruppe) unmittelbar nacheinander und wartet
+        gleichzeitig auf alle Antworten; Wiederholungen laufen je Paket wie bei async_request.
+        requests: [(addr, device_id, key, packet, timeouts, metrics, partial), ...]
+        Liefert je Anfrage (Antwort, Versuch) oder die Exception sowie die Zeitspanne zwischen
+        dem ersten und dem letzten gesendeten Paket in Sekunden.
+        """
+        if self.is_closing:
+            raise ConnectionError("UDP-Endpunkt ist geschlossen")
+        # Alle Anfragen vor dem ersten Senden anmelden, damit keine frühe Antwort verloren geht
+        entries = [
+            self._register(addr, device_id, key, metrics, partial)
+            for addr, device_id, key, _, _, metrics, partial in requests
+        ]
+        try:
+            start = time.perf_counter()
+            for addr, _, _, packet, _, metrics, _ in requests:
+                self._send(packet, addr, metrics, 0)
+            skew = time.perf_counter() - start
+            results = await asyncio.gather(*(
+                self._async_await(entry, addr, packet, timeouts, metrics, True)
+                for entry, (addr, _, _, packet, timeouts, metrics, _) in zip(entries, requests)
+            ), return_exceptions=True)
+        finally:
+            for entry, request in zip(entries, requests):
+                self._unregister(request[1], entry)
+        return results, skew
+
+    def _register(self, addr, device_id: bytes, key: frozenset[int], metrics: DeviceMetrics | None,
+                  partial: bool) -> tuple:
+        if metrics is not None:
+            self._metrics[addr] = metrics
+        entry = (key, partial, asyncio.get_running_loop().create_future())
+        self._pending.setdefault(device_id, []).append(entry)
+        return entry
+
+    def _unregister(self, device_id: bytes, entry: tuple):
+        waiters = self._pending.get(device_id)
+        if waiters and entry in waiters:
+            waiters.remove(entry)
+            if not waiters:
+                del self._pending[device_id]
+
+    def _send(self, packet: bytes, addr, metrics: DeviceMetrics | None, attempt: int):
+        self._transport.sendto(packet, addr)
+        if self.capture is not None:
+            self.capture.record(DIRECTION_TX, addr, packet)
+        if metrics is not None:
+            metrics.packets_sent += 1
+            metrics.bytes_sent += len(packet)
+            if metrics.packets is not None:
+                metrics.packets.record(DIRECTION_TX, packet)
+            if attempt:
+                metrics.retries += 1
+
+    async def _async_await(self, entry: tuple, addr, packet: bytes, timeouts,
+                           metrics: DeviceMetrics | None, first_sent: bool) -> tuple[Frame, int]:
+        future = entry[2]
+        for attempt, timeout in enumerate(timeouts):
+            if attempt or not first_sent:
+                self._send(packet, addr, metrics, attempt)
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout), attempt
+            except asyncio.TimeoutError:
+                continue
+        raise asyncio.TimeoutError
+
+    def close(self):
+        """Schließt den UDP-Endpunkt."""
+        if self._transport is not None:
+            self._transport.close()
+
+
+class RttEstimator:
+    """
+    Geglättete Antwortzeit (SRTT) und deren Schwankung (RTTVAR) eines Geräts, wie bei TCP (RFC 6298).
+    Daraus ergibt sich das Zeitlimit für einen Sendeversuch (RTO).
+    """
+
+    __slots__ = ("srtt", "rttvar", "min_rto", "max_rto")
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(self, min_rto: float = MIN_RTO, max_rto: float = DEFAULT_TIMEOUT):
+        self.srtt: float | None = None
+        self.rttvar: float = 0.0
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+
+    @property
+    def rto(self) -> float:
+        """Aktuelles Zeitlimit für einen Sendeversuch in Sekunden."""
+        if self.srtt is None:
+            return min(INITIAL_RTO, self.max_rto)
+        return min(self.max_rto, max(self.min_rto, self.srtt + 4 * self.rttvar))
+
+    def update(self, sample: float):
+        """Nimmt eine gemessene Antwortzeit auf (nur Antworten auf den ersten Versuch, Karn)."""
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar += self.BETA * (abs(self.srtt - sample) - self.rttvar)
+            self.srtt += self.ALPHA * (sample - self.srtt)
+
+    def timeouts(self, retries: int) -> list[float]:
+        """Zeitlimits für den ersten Versuch und jede Wiederholung, jeweils verdoppelt."""
+        rto = self.rto
+        return [min(self.max_rto, rto * (BACKOFF_FACTOR ** attempt)) for attempt in range(retries + 1)]
+
+    def as_dict(self) -> dict:
+        """Zustand zum Speichern über Neustarts hinweg."""
+        return {"srtt": self.srtt, "rttvar": self.rttvar}
+
+    def restore(self, data: dict):
+        """Übernimmt einen gespeicherten Zustand."""
+        if data.get("srtt") is not None:
+            self.srtt = float(data["srtt"])
+            self.rttvar = float(data.get("rttvar", self.srtt / 2))
 
-# Beispiel-Sonderbefehle
-BGCP_CMD_PAGE           = 0xFF
-BGCP_CMD_FUNC           = 0xFC
-BGCP_CMD_SIZE           = 0xFE
-BGCP_CMD_NOT_SUP        = 0xFD
-BGCP_FUNC_RESP          = 0x06
 
 class BlaubergVentoUDPClient:
     """Behandelt die UDP-Kommunikation mit dem Blauberg Vento Lüfter."""
 
-    def __init__(self, ip, device_id, password, port=4000):
+    def __init__(self, ip, device_id, password, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT,
+                 transport: VentoTransport | None = None, retries=DEFAULT_RETRIES,
+                 ring_size=DEFAULT_RING_SIZE):
+        """
+        Ohne transport öffnet der Client bei Bedarf einen eigenen Endpunkt.
+        Mit transport nutzt er einen gemeinsamen Endpunkt (z.B. den des Koordinators),
+        den er nicht selbst schließt. timeout begrenzt einen einzelnen Sendeversuch,
+        das tatsächliche Zeitlimit ergibt sich aus den gemessenen Antwortzeiten.
+        ring_size legt fest, wie viele Datagramme im Speicher bleiben (0 = keine).
+        """
         self.ip = ip
         self.device_id = device_id.encode("ascii")
         self.password = password.encode("ascii")
         self.port = port
+        self.retries = retries
+        self.rtt = RttEstimator(max_rto=timeout)
+        self.metrics = DeviceMetrics(ring_size)
+        self._addr = (ip, port)
+        self._encoder = Encoder(self.device_id, self.password)
+        self._transport: VentoTransport | None = transport
+        self._owns_transport = transport is None
+        self._transport_lock = asyncio.Lock()
+
+    async def _async_get_transport(self) -> VentoTransport:
+        """Liefert den Endpunkt dieses Clients und öffnet ihn beim ersten Aufruf."""
+        if not self._owns_transport:
+            return self._transport
+        async with self._transport_lock:
+            if self._transport is None or self._transport.is_closing:
+                self._transport = await VentoTransport.async_create()
+            return self._transport
+
+    @property
+    def overhead(self) -> int:
+        """Bytes eines Pakets an diesen Lüfter außerhalb der Parameter, für codec.pack_items."""
+        return self._encoder.overhead
+
+    async def async_send_command(self, func: int, parameters: dict, retries: int | None = None) -> Frame | None:
+        """
+        Sendet einen Befehl (func + Parameter) an den Lüfter und wartet asynchron auf die Antwort.
+        Mehrere Aufrufe dürfen gleichzeitig laufen, sie teilen sich einen UDP-Endpunkt.
+        retries ersetzt die Anzahl der Wiederholungen des Clients, z.B. 0 für eine Erreichbarkeitsprobe.
+        """
+        transport = await self._async_get_transport()
+        return await self._async_request(transport, func, parameters, retries)
+
+    def _prepare(self, func: int, parameters, retries: int | None = None) -> tuple:
+        """Baut das Paket und liefert die Anfrage im Format von VentoTransport.async_request_group."""
+        # Die Rohdaten landen im Ringpuffer (metrics.packets) und werden erst bei Bedarf formatiert
+        items = parameter_items(parameters)
+        packet = self._encoder.encode_items(func, items)
+        self.metrics.requests += 1
+        return (self._addr, self.device_id, request_key(param_id for param_id, _ in items), packet,
+                self.rtt.timeouts(self.retries if retries is None else retries), self.metrics, func == FUNC_READ)
+
+    def _complete(self, result, elapsed: float | None) -> Frame | None:
+        """
+        Wertet (Antwort, Versuch) oder die Exception einer Anfrage aus und pflegt Statistik und RTO.
+        Ohne elapsed (Gruppenbefehle) wird keine Antwortzeit gemessen.
+        """
+        metrics = self.metrics
+        if isinstance(result, asyncio.TimeoutError):
+            metrics.timeouts += 1
+            # Die Erreichbarkeit meldet VentoDevice, nicht jeder einzelne Timeout
+            _LOGGER.debug("Timeout: Keine Antwort vom Lüfter unter %s", self.ip)
+            return None
+        if isinstance(result, BaseException):
+            _LOGGER.error("UDP-Kommunikationsfehler: %s", result)
+            return None
+
+        frame, attempt = result
+        if frame.unsupported:
+            metrics.unsupported += len(frame.unsupported)
+        if attempt == 0 and elapsed is not None:
+            self.rtt.update(elapsed)
+            metrics.record_rtt(elapsed)
+        elif _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Antwort von %s nach %d Wiederholung(en)", self.ip, attempt)
+        return frame
+
+    async def _async_request(self, transport: VentoTransport, func: int, parameters: dict,
+                             retries: int | None = None) -> Frame | None:
+        request = self._prepare(func, parameters, retries)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            result = await transport.async_request(*request)
+        except Exception as err:  # Timeout oder geschlossener Endpunkt
+            result = err
+        return self._complete(result, loop.time() - start)
 
-    def send_command(self, func: int, parameters: dict, response_length=256) -> bytes | None:
+    def send_command(self, func: int, parameters: dict) -> Frame | None:
         """
-        Sendet einen Befehl (func + Parameter) an den Lüfter und empfängt eine Antwort.
-        Loggt sowohl die empfangenen Bytes als auch die interpretierten Parameter.
+        Blockierender Wrapper um die asynchrone API, z.B. für udp_test.py.
+        Darf nicht aus einer laufenden Event-Loop heraus aufgerufen werden.
         """
-        packet = self._build_packet(func, parameters)
+        async def _run():
+            transport = await VentoTransport.async_create()
+            try:
+                return await self._async_request(transport, func, parameters)
+            finally:
+                transport.close()
+
+        return asyncio.run(_run())
+
+    async def async_close(self):
+        """Schließt den UDP-Endpunkt des Clients, sofern er ihm selbst gehört."""
+        if self._owns_transport and self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        elif self._transport is not None:
+            self._transport.release(self._addr)
+
+
+class RequestQueue:
+    """
+    Serialisiert alle Anfragen an ein Gerät: es ist immer höchstens eine Anfrage unterwegs,
+    und zwischen dem Ende einer Anfrage und dem Senden der nächsten liegen mindestens min_gap Sekunden.
+    Schreibbefehle werden vor wartenden Abfragen gesendet; eine Abfrage, die mit identischen
+    Parametern bereits wartet, wird nicht erneut eingereiht, sondern teilt deren Ergebnis.
+    Eine bereits gesendete Anfrage wird nicht abgebrochen, damit sich Antworten nicht überschneiden.
+    """
+
+    def __init__(self, client: BlaubergVentoUDPClient, min_gap: float = DEFAULT_MIN_GAP):
+        self.client = client
+        self.min_gap = min_gap
+        self.dropped_reads = 0
+        self._writes: deque[tuple[int, dict, asyncio.Future]] = deque()
+        # (Parameter, Wiederholungen) -> Future der wartenden Abfrage, in Reihenfolge des Eintreffens
+        self._reads: dict[tuple, asyncio.Future] = {}
+        self._worker: asyncio.Task | None = None
+        self._last_done = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Anzahl wartender (noch nicht gesendeter) Anfragen."""
+        return len(self._writes) + len(self._reads)
+
+    async def async_read(self, parameters, retries: int | None = None) -> Frame | None:
+        """
+        Reiht eine Abfrage ein, sofern nicht bereits eine identische wartet.
+        retries ersetzt die Wiederholungen des Clients (z.B. 0 für eine Erreichbarkeitsprobe).
+        """
+        key = (tuple(parameters), retries)
+        future = self._reads.get(key)
+        if future is None:
+            future = self._reads[key] = asyncio.get_running_loop().create_future()
+            self._ensure_worker()
+        else:
+            self.dropped_reads += 1
+        return await asyncio.shield(future)
+
+    async def async_write(self, func: int, parameters: dict) -> Frame | None:
+        """Reiht einen Schreibbefehl vor allen wartenden Abfragen ein."""
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((func, parameters, future))
+        self._ensure_worker()
+        return await asyncio.shield(future)
+
+    async def async_reserve(self) -> asyncio.Event:
+        """
+        Reiht eine Reservierung mit der Priorität eines Schreibbefehls ein und wartet, bis sie an der Reihe ist.
+        Bis das gelieferte Event gesetzt wird, sendet die Warteschlange nichts, z.B. während eines Gruppenbefehls.
+        """
+        future = asyncio.get_running_loop().create_future()
+        release = asyncio.Event()
+        self._writes.append((None, release, future))
+        self._ensure_worker()
+        try:
+            await future
+        except asyncio.CancelledError:
+            release.set()
+            raise
+        return release
+
+    def cancel(self):
+        """Beendet die Abarbeitung; wartende Anfragen werden abgebrochen."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for _, _, future in self._writes:
+            future.cancel()
+        for future in self._reads.values():
+            future.cancel()
+        self._writes.clear()
+        self._reads.clear()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def _async_run(self):
+        """Arbeitet die Warteschlange ab und endet, sobald sie leer ist."""
+        loop = asyncio.get_running_loop()
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                sock.settimeout(3.0)
-                _LOGGER.debug(
-                    "Sending UDP packet to %s:%d -> %s",
-                    self.ip, self.port, packet.hex()
-                )
-                sock.sendto(packet, (self.ip, self.port))
-
-                response, _ = sock.recvfrom(response_length)
-                # Nummeriere die Bytes
-                numbered_bytes = " ".join(f"[{i}] {b:02x}" for i, b in enumerate(response))
-
-                # Parse die Antwort
-                parsed_params = self.parse_response(response)
-                # Interpretiere die Parameter
-                interpretation = self._interpret_params(parsed_params)
-
-                _LOGGER.debug(
-                    "Received %d bytes: %s => %s",
-                    len(response), numbered_bytes, interpretation
-                )
-                return response
-
-        except socket.timeout:
-            _LOGGER.error("Timeout: Keine Antwort vom Lüfter unter %s", self.ip)
-        except Exception as e:
-            _LOGGER.error("UDP-Kommunikationsfehler: %s", e)
-        return None
-
-    def _build_packet(self, func: int, parameters: dict) -> bytes:
-        """
-        Baut das UDP-Paket gemäß dem Blauberg-/Vento-Protokoll auf:
-        Start (0xFD 0xFD), Protokolltyp (0x02), ID, Passwort, Funktion, Parameter, Checksumme.
-        """
-        pkt = bytearray()
-        pkt.extend(b'\xFD\xFD')  # Start
-        pkt.append(0x02)          # Protokolltyp (0x02)
-
-        # DeviceID
-        pkt.append(len(self.device_id))
-        pkt.extend(self.device_id)
-
-        # Passwort
-        pkt.append(len(self.password))
-        pkt.extend(self.password)
-
-        # Funktion (z.B. 0x01=READ, 0x03=WRITE)
-        pkt.append(func)
-
-        # Parameter-Paare
-        for param_id, value in parameters.items():
-            pkt.append(param_id & 0xFF)
-            pkt.append(value & 0xFF)
-
-        # Checksumme
-        chksum = sum(pkt[2:]) & 0xFFFF
-        pkt.append(chksum & 0xFF)
-        pkt.append((chksum >> 8) & 0xFF)
-
-        return bytes(pkt)
-
-    def parse_response(self, response: bytes) -> dict:
-        """
-        Parst die empfangenen Bytes und gibt ein Dictionary mit den Parametern zurück.
-        Unterstützt verschiedene Sonderbefehle gemäß deinem C-Code.
-        """
-        if len(response) < 8:
-            _LOGGER.warning("Received response is too short: %d bytes", len(response))
-            return {}
-
-        # Prüfe Startbytes und Protokolltyp
-        if response[0] != 0xFD or response[1] != 0xFD:
-            _LOGGER.warning("Ungültige Startbytes in der Antwort.")
-            return {}
-        if response[2] != 0x02:
-            _LOGGER.warning(f"Ungültiger Protokolltyp: {response[2]:02x}")
-            return {}
-
-        idx = 3
-        dev_id_len = response[idx]
-        idx += 1
-        if idx + dev_id_len > len(response):
-            _LOGGER.warning("DeviceID-Länge überschreitet die Antwortlänge.")
-            return {}
-        device_id = response[idx:idx + dev_id_len]
-        idx += dev_id_len
-
-        pw_len = response[idx]
-        idx += 1
-        if idx + pw_len > len(response):
-            _LOGGER.warning("Passwort-Länge überschreitet die Antwortlänge.")
-            return {}
-        password = response[idx:idx + pw_len]
-        idx += pw_len
-
-        func_byte = response[idx]
-        idx += 1
-
-        length_without_checksum = len(response) - 2
-        data_region = response[idx:length_without_checksum]
-
-        # Checksumme prüfen
-        if length_without_checksum + 2 != len(response):
-            _LOGGER.warning("Mismatch in checksum calculation.")
-            return {}
-        actual_low = response[length_without_checksum]
-        actual_high = response[length_without_checksum + 1]
-        cs_calc = sum(response[2:length_without_checksum]) & 0xFFFF
-        if (actual_low != (cs_calc & 0xFF)) or (actual_high != ((cs_calc >> 8) & 0xFF)):
-            _LOGGER.warning("Checksumme stimmt nicht überein.")
-            return {}
-
-        parsed = {}
-        i = 0
-        while i < len(data_region):
-            b = data_region[i]
-            if b == BGCP_CMD_SIZE:  # 0xFE
-                if i + 2 < len(data_region):
-                    param_size = data_region[i+1]
-                    param_id = data_region[i+2]
-                    block_data = data_region[i+3:i+3+param_size]
-                    parsed[param_id] = block_data
-                    i += (3 + param_size)
+            while self._writes or self._reads:
+                wait = self._last_done + self.min_gap - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                retries = None
+                if self._writes:
+                    func, parameters, future = self._writes.popleft()
+                    if func is None:  # Reservierung (async_reserve), parameters ist das Freigabe-Event
+                        if not future.done():
+                            future.set_result(None)
+                            await parameters.wait()
+                        self._last_done = loop.time()
+                        continue
+                else:
+                    key = next(iter(self._reads))
+                    future = self._reads.pop(key)
+                    parameters, retries = key
+                    func = FUNC_READ
+                try:
+                    result = await self.client.async_send_command(func, parameters, retries)
+                except Exception as err:  # z.B. geschlossener Endpunkt
+                    if not future.done():
+                        future.set_exception(err)
                 else:
-                    _LOGGER.warning("Unvollständiges Parameter-Block gefunden.")
-                    break
-            elif b == BGCP_CMD_PAGE:  # 0xFF
-                if i + 1 < len(data_region):
-                    page = data_region[i+1]
-                    _LOGGER.debug("Page Command: %02x", page)
-                i += 2
-            elif b == BGCP_CMD_FUNC:  # 0xFC
-                if i + 1 < len(data_region):
-                    func = data_region[i+1]
-                    _LOGGER.debug("Function Command: %02x", func)
-                i += 2
-            elif b == BGCP_CMD_NOT_SUP:  # 0xFD
-                if i + 1 < len(data_region):
-                    not_sup = data_region[i+1]
-                    _LOGGER.debug("Not Supported Command: %02x", not_sup)
-                i += 2
-            else:
-                # Normales Param + Wert (2 Bytes)
-                param_id = b
-                val = None
-                if i + 1 < len(data_region):
-                    val = data_region[i+1]
-                    # Interpretation der Werte
-                    if param_id == PARAM_UNIT_ON_OFF:
-                        parsed['unit_on_off'] = bool(val)
-                    elif param_id == PARAM_SPEED_NUMBER:
-                        parsed['speed_number'] = val * 33  # Beispielhafte Umrechnung
-                    elif param_id == PARAM_VENTILATION_MODE:
-                        if val == 0:
-                            parsed['ventilation_mode'] = "Ventilation"
-                        elif val == 1:
-                            parsed['ventilation_mode'] = "Heat Recovery"
-                        elif val == 2:
-                            parsed['ventilation_mode'] = "Supply"
-                        else:
-                            parsed['ventilation_mode'] = f"Unknown ({val})"
-                    else:
-                        parsed[param_id] = val
-                i += 2
-
-        _LOGGER.debug("Parsed parameters: %s", parsed)
-        return parsed
-
-    def _interpret_params(self, params: dict) -> str:
-        """
-        Interpretiert die geparsten Parameter und gibt eine lesbare Zeichenkette zurück.
-        Beispiel: "Unit status [Off], Speed number [1], Ventilation mode [Ventilation]"
-        """
-        msgs = []
-
-        # UNIT_ON_OFF
-        unit_val = params.get('unit_on_off')
-        if unit_val is not None:
-            status = "On" if unit_val else "Off"
-            msgs.append(f"Unit status [{status}]")
-
-        # SPEED_NUMBER
-        speed_val = params.get('speed_number')
-        if speed_val is not None:
-            speed_level = speed_val // 33  # Beispielhafte Umrechnung zurück zu 1..3
-            msgs.append(f"Speed number [{speed_level}]")
-
-        # VENTILATION_MODE
-        mode_val = params.get('ventilation_mode')
-        if mode_val is not None:
-            msgs.append(f"Ventilation mode [{mode_val}]")
-
-        return ", ".join(msgs) if msgs else "No known param"
\ No newline at end of file
+                    if not future.done():
+                        future.set_result(result)
+                finally:
+                    self._last_done = loop.time()
+        finally:
+            if self._worker is asyncio.current_task():
+                self._worker = None
+
+
+async def async_send_group(transport: VentoTransport,
+                           commands: list[tuple[BlaubergVentoUDPClient, int, dict]]) -> tuple[list, float]:
+    """
+    Sendet je Client einen Befehl, alle Pakete vorab gebaut und unmittelbar nacheinander über transport.
+    Liefert die Antworten (Frame oder None) in der Reihenfolge von commands und die Sendespanne in Sekunden.
+    """
+    requests = [client._prepare(func, parameters) for client, func, parameters in commands]
+    results, skew = await transport.async_request_group(requests)
+    return [client._complete(result, None) for (client, _, _), result in zip(commands, results)], skew
@@ -1,91 +1,239 @@
-import socket
+# udp_test.py
+
+"""
+Kommandozeilenwerkzeug zur Fehlersuche und zum Vermessen vieler Lüfter gleichzeitig.
+Nutzt denselben Client und Codec wie die Integration; alle Geräte werden über einen
+gemeinsamen UDP-Endpunkt parallel angesprochen.
+
+Beispiele:
+    python udp_test.py read --device 192.168.1.2 1122334455667788 1111
+    python udp_test.py write --inventory devices.json --speed 66 --oscillation on
+    python udp_test.py bench --inventory devices.json --iterations 100 --format json
+    python udp_test.py 192.168.1.2 1122334455667788 1111 33 on   (Kurzform wie bisher: einschalten)
+
+Die Inventardatei ist eine JSON-Liste von Objekten mit ip, device_id, password und
+optional port und name (z.B. die Ausgabe von emulator.py).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
 import sys
+import time
 
-def send_command(ip, port, func, parameters, device_id, password):
-    pkt = bytearray()
-    pkt.extend(b'\xFD\xFD')  # Start
-    pkt.append(0x02)         # Protokolltyp
+try:
+    from .bench import percentiles
+    from .codec import FUNC_READ, FUNC_WRITE_READ, POLL_PARAMETERS, describe
+    from .udp_client import DEFAULT_PORT, DEFAULT_RETRIES, BlaubergVentoUDPClient, VentoTransport
+except ImportError:  # Als eigenständiges Werkzeug ohne Home Assistant gestartet
+    from bench import percentiles
+    from codec import FUNC_READ, FUNC_WRITE_READ, POLL_PARAMETERS, describe
+    from udp_client import DEFAULT_PORT, DEFAULT_RETRIES, BlaubergVentoUDPClient, VentoTransport
 
-    # Device-ID
-    device_id_bytes = device_id.encode("ascii")
-    pkt.append(len(device_id_bytes))
-    pkt.extend(device_id_bytes)
+SPEEDS = {33: 1, 66: 2, 99: 3}
+COMMANDS = ("read", "write", "bench")
 
-    # Passwort
-    password_bytes = password.encode("ascii")
-    pkt.append(len(password_bytes))
-    pkt.extend(password_bytes)
 
-    # Funktion
-    pkt.append(func)
+def load_inventory(path: str, default_port: int) -> list[dict]:
+    """Liest die Geräteliste; akzeptiert auch die Schlüssel eines Config-Entries (ip_address, deviceId)."""
+    with open(path, encoding="utf-8") as file:
+        raw = json.load(file)
+    if isinstance(raw, dict):
+        raw = raw.get("devices", [])
+    devices = []
+    for item in raw:
+        device_id = item.get("device_id") or item["deviceId"]
+        devices.append({
+            "name": item.get("name", device_id),
+            "ip": item.get("ip") or item["ip_address"],
+            "port": int(item.get("port", default_port)),
+            "device_id": device_id,
+            "password": item.get("password", "1111"),
+        })
+    return devices
 
-    # Parameter
-    for param_id, value in parameters.items():
-        pkt.append(param_id & 0xFF)
-        pkt.append(value & 0xFF)
 
-    # Checksumme
-    chksum = sum(pkt[2:]) & 0xFFFF
-    pkt.append(chksum & 0xFF)
-    pkt.append((chksum >> 8) & 0xFF)
+def _param_id(text: str) -> int:
+    return int(text, 0)
 
-    # Formatiere das gesendete Paket: Zweiergruppen mit Leerzeichen
-    raw_pkt = " ".join(f"{b:02x}" for b in pkt)
-    print("{:<25} {}".format("Sending UDP packet:", raw_pkt))
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.settimeout(3.0)
-    sock.sendto(bytes(pkt), (ip, port))
+def _assignment(text: str) -> tuple[int, int]:
+    """"0x02=3" -> (0x02, 3)"""
+    param, _, value = text.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"Erwartet PARAM=WERT, z.B. 0x02=3: {text}")
+    return int(param, 0), int(value, 0)
 
-    try:
-        response, _ = sock.recvfrom(256)
-        raw_response = " ".join(f"{b:02x}" for b in response)
-        print("{:<25} {}".format("Received UDP packet:", raw_response))
-    except socket.timeout:
-        print("Timeout: Keine Antwort erhalten.")
 
-if __name__ == "__main__":
-    usage = ("Usage: python udp_test.py <IP> <device_id> <password> "
-             "[<speed: 33|66|99>] [<oscillation: on|off>]")
-    if len(sys.argv) < 4:
-        print(usage)
-        sys.exit(1)
-    IP = sys.argv[1]
-    device_id = sys.argv[2]
-    password = sys.argv[3]
-    PORT = 4000  # Standard-Port, ggf. anpassen
-
-    # Standard: Lüfter einschalten
-    parameters = {0x01: 1}
-
-    # Optional: Lüftergeschwindigkeit
-    if len(sys.argv) >= 5:
-        try:
-            speed_input = int(sys.argv[4])
-        except ValueError:
-            print("Speed must be a number (33, 66 or 99).")
-            sys.exit(1)
-        if speed_input == 33:
-            speed_cmd = 1
-        elif speed_input == 66:
-            speed_cmd = 2
-        elif speed_input == 99:
-            speed_cmd = 3
+def write_parameters(args) -> dict:
+    """Parameter für write aus --on/--off, --speed, --oscillation und --set."""
+    params = {}
+    if args.off:
+        params[0x01] = 0
+    elif args.on or args.speed or not args.set:
+        params[0x01] = 1  # Standard wie bisher: Lüfter einschalten
+    if args.speed:
+        params[0x02] = SPEEDS[args.speed]
+    if args.oscillation:
+        params[0xB7] = 1 if args.oscillation == "on" else 0
+    params.update(dict(args.set or ()))
+    return params
+
+
+async def _async_command(clients, func: int, params, verbose: bool) -> list[dict]:
+    """Sendet denselben Befehl gleichzeitig an alle Geräte."""
+    async def run(device, client):
+        start = time.perf_counter()
+        frame = await client.async_send_command(func, params)
+        result = {"name": device["name"], "ip": device["ip"], "device_id": device["device_id"]}
+        if frame is None:
+            result["ok"] = False
+            return result
+        result.update({
+            "ok": True,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "params": frame.params,
+            "unsupported": [f"0x{param_id:02x}" for param_id in frame.unsupported],
+        })
+        if verbose:
+            result["raw"] = frame.raw.hex(" ")
+        return result
+
+    return list(await asyncio.gather(*(run(device, client) for device, client in clients)))
+
+
+async def _async_bench(clients, params, iterations: int) -> list[dict]:
+    """Fragt alle Geräte iterations-mal gleichzeitig ab und ermittelt Antwortzeiten und Verluste je Gerät."""
+    samples = {device["device_id"]: [] for device, _ in clients}
+    lost = dict.fromkeys(samples, 0)
+
+    async def run(device, client):
+        start = time.perf_counter()
+        frame = await client.async_send_command(FUNC_READ, params)
+        if frame is None:
+            lost[device["device_id"]] += 1
         else:
-            print("Invalid speed value. Must be 33, 66 or 99.")
-            sys.exit(1)
-        parameters[0x02] = speed_cmd  # Übergebe den diskreten Wert (1, 2 oder 3)
-
-    # Optional: Oszillation
-    if len(sys.argv) >= 6:
-        osc_input = sys.argv[5].lower()
-        if osc_input == "on":
-            osc_value = 1
-        elif osc_input == "off":
-            osc_value = 0
+            samples[device["device_id"]].append(time.perf_counter() - start)
+
+    for _ in range(iterations):
+        await asyncio.gather(*(run(device, client) for device, client in clients))
+    return [
+        {
+            "name": device["name"],
+            "ip": device["ip"],
+            "device_id": device["device_id"],
+            "latency": percentiles(samples[device["device_id"]]),
+            "lost": lost[device["device_id"]],
+            "loss_pct": round(lost[device["device_id"]] / iterations * 100, 2) if iterations else 0.0,
+            "retries": client.metrics.retries,
+        }
+        for device, client in clients
+    ]
+
+
+async def _async_main(args, devices: list[dict]) -> list[dict]:
+    transport = await VentoTransport.async_create()
+    retries = args.retries if args.retries is not None else (0 if args.command == "bench" else DEFAULT_RETRIES)
+    clients = [
+        (device, BlaubergVentoUDPClient(device["ip"], device["device_id"], device["password"],
+                                        port=device["port"], timeout=args.timeout,
+                                        transport=transport, retries=retries))
+        for device in devices
+    ]
+    params = tuple(args.params) if args.command != "write" and args.params else POLL_PARAMETERS
+    try:
+        if args.command == "read":
+            return await _async_command(clients, FUNC_READ, params, args.verbose)
+        if args.command == "write":
+            return await _async_command(clients, FUNC_WRITE_READ, write_parameters(args), args.verbose)
+        return await _async_bench(clients, params, args.iterations)
+    finally:
+        transport.close()
+
+
+def print_text(command: str, results: list[dict]):
+    for result in results:
+        label = f"{result['name']} ({result['ip']})"
+        if command == "bench":
+            latency = result["latency"]
+            print(
+                f"{label:<40} p50/p95/p99 {latency.get('p50_ms')}/{latency.get('p95_ms')}/"
+                f"{latency.get('p99_ms')} ms  max {latency.get('max_ms')} ms  "
+                f"loss {result['loss_pct']} %  retries {result['retries']}"
+            )
+        elif not result["ok"]:
+            print(f"{label:<40} Timeout: Keine Antwort erhalten.")
         else:
-            print("Invalid oscillation value. Use 'on' or 'off'.")
-            sys.exit(1)
-        parameters[0xB7] = osc_value
+            print(f"{label:<40} {result['latency_ms']} ms  {describe(result['params'])}")
+            if result["unsupported"]:
+                print(f"{'':<40} nicht unterstützt: {' '.join(result['unsupported'])}")
+            if "raw" in result:
+                print("{:<40} {}".format("", result["raw"]))
+
+
+def _legacy_argv(argv: list[str]) -> list[str]:
+    """Übersetzt die bisherige Kurzform <IP> <device_id> <password> [<speed>] [<on|off>] in write."""
+    if not argv or argv[0] in COMMANDS or argv[0].startswith("-"):
+        return argv
+    count = next((i for i, arg in enumerate(argv) if arg.startswith("-")), len(argv))
+    positional, options = argv[:count], argv[count:]
+    converted = ["write", "--device", *positional[:3], "--verbose"]
+    if len(positional) >= 4:
+        converted += ["--speed", positional[3]]
+    if len(positional) >= 5:
+        converted += ["--oscillation", positional[4].lower()]
+    return converted + options
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Test- und Messwerkzeug für Blauberg Vento Lüfter")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--inventory", help="JSON-Datei mit den Geräten")
+    common.add_argument("--device", nargs=3, action="append", metavar=("IP", "DEVICE_ID", "PASSWORD"),
+                        help="einzelnes Gerät, mehrfach angebbar")
+    common.add_argument("--port", type=int, default=DEFAULT_PORT)
+    common.add_argument("--timeout", type=float, default=3.0, help="Obergrenze je Sendeversuch in Sekunden")
+    common.add_argument("--retries", type=int, help=f"Wiederholungen (Standard {DEFAULT_RETRIES}, bei bench 0)")
+    common.add_argument("--format", choices=("text", "json"), default="text")
+    common.add_argument("--verbose", action="store_true", help="empfangene Pakete mit ausgeben")
+    common.add_argument("--debug", action="store_true", help="Debug-Logging des Clients")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    read = subparsers.add_parser("read", parents=[common], help="Register aller Geräte lesen")
+    read.add_argument("--params", type=_param_id, nargs="+", help="Parameter, Standard: alle abgefragten")
 
-    send_command(IP, PORT, 0x03, parameters, device_id, password)
+    write = subparsers.add_parser("write", parents=[common], help="Parameter auf allen Geräten setzen")
+    write.add_argument("--on", action="store_true")
+    write.add_argument("--off", action="store_true")
+    write.add_argument("--speed", type=int, choices=sorted(SPEEDS))
+    write.add_argument("--oscillation", choices=("on", "off"))
+    write.add_argument("--set", type=_assignment, action="append", metavar="PARAM=WERT",
+                       help="beliebiger Parameter, z.B. --set 0x02=3")
+
+    bench = subparsers.add_parser("bench", parents=[common], help="Antwortzeiten und Verluste je Gerät messen")
+    bench.add_argument("--iterations", type=int, default=20)
+    bench.add_argument("--params", type=_param_id, nargs="+", help="Parameter, Standard: alle abgefragten")
+    return parser
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args(_legacy_argv(sys.argv[1:]))
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.CRITICAL)
+
+    devices = load_inventory(args.inventory, args.port) if args.inventory else []
+    devices += [
+        {"name": device_id, "ip": ip, "port": args.port, "device_id": device_id, "password": password}
+        for ip, device_id, password in args.device or ()
+    ]
+    if not devices:
+        parser.error("Keine Geräte angegeben (--inventory oder --device)")
+
+    results = asyncio.run(_async_main(args, devices))
+    if args.format == "json":
+        print(json.dumps({"command": args.command, "results": results}, indent=2, default=str))
+    else:
+        print_text(args.command, results)
+    if args.command != "bench" and not all(result["ok"] for result in results):
+        sys.exit(1)
@@ -0,0 +1,19 @@
+"""
+Tests der Module, die ohne Home Assistant laufen (codec, udp_client, emulator, snapshot).
+Sie werden wie die eigenständigen Werkzeuge direkt aus dem Verzeichnis der Integration importiert.
+Die Tests des Koordinators (test_coordinator.py) laufen nur mit pytest-homeassistant-custom-component.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "blauberg_vento_fan"))
+
+
+@pytest.fixture(autouse=True)
+def _allow_sockets(request):
+    """Mit pytest-homeassistant-custom-component sind Sockets gesperrt; die Tests brauchen UDP auf localhost."""
+    if request.config.pluginmanager.hasplugin("socket"):
+        request.getfixturevalue("socket_enabled")
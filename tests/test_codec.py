@@ -0,0 +1,100 @@
+"""Dekodieren und Kodieren der Pakete (codec.py), verworfene Pakete auch gegen den Emulator auf localhost."""
+
+import asyncio
+
+import pytest
+
+from codec import (
+    ERROR_CHECKSUM, ERROR_INCOMPLETE_BLOCK, FUNC_READ, FUNC_RESPONSE, FUNC_WRITE_READ, PARAM_FAN1_RPM,
+    PARAM_HUMIDITY_OVER, PARAM_NIGHT_TIMER, PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE,
+    PARAMETERS, POLL_PARAMETERS, Encoder, ProtocolError, decode,
+)
+from emulator import VentoEmulator, VirtualDevice
+from udp_client import BlaubergVentoUDPClient, VentoTransport
+
+DEVICE_ID = b"0041003C54465710"
+# Antwort aus der Protokollbeschreibung: Ein, Stufe 1, Wärmerückgewinnung
+SAMPLE_RESPONSE = bytes.fromhex("fdfd02103030343130303343353434363537313004313131310601010201b701d804")
+# Antwort mit einem 0xFE-Block, dessen Größe (10) über das Paketende hinausreicht
+OVERSIZED_BLOCK = bytes((FUNC_RESPONSE, 0xFE, 0x0A, 0x4A, 0x01, 0x02))
+
+
+def _response(payload: bytes) -> bytes:
+    return Encoder(DEVICE_ID, b"1111").wrap(bytes((FUNC_RESPONSE,)) + payload)
+
+
+def test_decode_sample_response():
+    frame = decode(SAMPLE_RESPONSE)
+    assert frame.device_id == DEVICE_ID
+    assert frame.func == FUNC_RESPONSE
+    assert frame.params == {"unit_on_off": True, "speed_number": 33, "ventilation_mode": "Heat Recovery"}
+    assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_SPEED_NUMBER, PARAM_VENTILATION_MODE]
+    assert frame.unsupported == []
+
+
+@pytest.mark.parametrize("param_id", [param_id for param_id, d in PARAMETERS.items() if d.size == 1])
+def test_decode_single_byte_values(param_id):
+    """Jeder Wert eines einbytigen Parameters wird wie von seiner Beschreibung dekodiert, auch auf Seite 3."""
+    descriptor = PARAMETERS[param_id]
+    page = bytes((0xFF, param_id >> 8)) if param_id >> 8 else b""
+    for value in range(256):
+        frame = decode(_response(page + bytes((param_id & 0xFF, value))))
+        assert frame.params == {descriptor.key: descriptor.decode(value)}
+        assert frame.ids == [param_id]
+
+
+def test_decode_blocks_pages_and_raw_values():
+    payload = bytes((
+        0xFE, 0x02, PARAM_FAN1_RPM, 0x10, 0x27,
+        0xFF, 0x03, PARAM_NIGHT_TIMER & 0xFF, 0x0A, PARAM_HUMIDITY_OVER & 0xFF, 0x01,
+        0xFD, 0x05,
+    ))
+    frame = decode(_response(payload))
+    assert frame.params == {"fan1_rpm": 10000, "night_timer_setpoint": 10, "humidity_over_setpoint": True}
+    assert frame.ids == [PARAM_FAN1_RPM, PARAM_NIGHT_TIMER, PARAM_HUMIDITY_OVER, 0x0305]
+    assert frame.unsupported == [0x0305]
+    # Ohne Beschreibungstabelle bleiben die Werte roh, wie sie im Paket stehen
+    raw = decode(frame.raw, descriptors={})
+    assert raw.params == {PARAM_FAN1_RPM: b"\x10\x27", PARAM_NIGHT_TIMER: 0x0A, PARAM_HUMIDITY_OVER: 1}
+
+
+def test_encode_write_round_trip():
+    packet = Encoder(DEVICE_ID, b"1111").encode(FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1, PARAM_NIGHT_TIMER: b"\x1e\x08"})
+    frame = decode(packet, descriptors={})
+    assert frame.func == FUNC_WRITE_READ
+    assert frame.params == {PARAM_UNIT_ON_OFF: 1, PARAM_NIGHT_TIMER: b"\x1e\x08"}
+
+
+def test_decode_rejects_corrupt_packets():
+    with pytest.raises(ProtocolError) as err:
+        decode(Encoder(DEVICE_ID, b"1111").wrap(OVERSIZED_BLOCK))
+    assert err.value.reason == ERROR_INCOMPLETE_BLOCK
+    with pytest.raises(ProtocolError) as err:
+        decode(SAMPLE_RESPONSE[:-1] + b"\x00")
+    assert err.value.reason == ERROR_CHECKSUM
+
+
+class OversizedBlockDevice(VirtualDevice):
+    """Beantwortet jede Anfrage mit einem zu großen 0xFE-Block."""
+
+    def handle(self, data: bytes) -> bytes | None:
+        return self._encoder.wrap(OVERSIZED_BLOCK) if super().handle(data) else None
+
+
+def test_oversized_block_from_device_is_dropped():
+    """Ein Paket mit zu großem 0xFE-Block wird verworfen und gezählt, die Abfrage läuft ins Zeitlimit."""
+    async def _run():
+        emulator = VentoEmulator()
+        port = await emulator.async_add_device(OversizedBlockDevice(DEVICE_ID.decode(), "1111"))
+        transport = await VentoTransport.async_create(("127.0.0.1", 0))
+        try:
+            client = BlaubergVentoUDPClient(emulator.host, DEVICE_ID.decode(), "1111", port=port, timeout=0.1,
+                                            transport=transport)
+            assert await client.async_send_command(FUNC_READ, POLL_PARAMETERS, retries=0) is None
+            assert client.metrics.packets_received == 1
+            assert client.metrics.error_count(ERROR_INCOMPLETE_BLOCK) == 1
+        finally:
+            transport.close()
+            emulator.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,119 @@
+"""
+Koordinator mit echten Config-Entries gegen den Emulator; benötigt pytest-homeassistant-custom-component.
+Jeder emulierte Lüfter lauscht wie ein echter auf Port 4000, dafür auf einer eigenen Loopback-Adresse.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blauberg_vento_fan.codec import (
+    CONFIG_PARAMETERS, PARAM_HUMIDITY_SETPOINT, PARAM_MANUAL_SPEED, PARAM_NIGHT_TIMER, PARAM_SPEED_NUMBER,
+    PARAM_UNIT_ON_OFF, SchedulePeriod,
+)
+from custom_components.blauberg_vento_fan.const import (
+    AVAILABILITY_AVAILABLE, AVAILABILITY_DEGRADED, CONF_DEVICE_ID, DOMAIN,
+)
+from custom_components.blauberg_vento_fan.coordinator import BlaubergVentoCoordinator
+from custom_components.blauberg_vento_fan.emulator import VentoEmulator, VirtualDevice
+
+
+@pytest.fixture
+async def fans(hass):
+    """Koordinator mit zwei emulierten Lüftern; liefert (Koordinator, [(VentoDevice, VirtualDevice), ...])."""
+    coordinator = BlaubergVentoCoordinator(hass)
+    emulators, entries, fans = [], [], []
+    for i in range(2):
+        emulator = VentoEmulator(f"127.0.0.{i + 2}")
+        virtual = VirtualDevice(f"EMU{i:013d}", "1111")
+        await emulator.async_add_device(virtual, 4000)
+        emulators.append(emulator)
+        entry = MockConfigEntry(domain=DOMAIN, data={
+            CONF_IP_ADDRESS: emulator.host, CONF_DEVICE_ID: f"EMU{i:013d}", CONF_PASSWORD: "1111", "name": f"Fan {i}",
+        })
+        entries.append(entry)
+        fans.append((await coordinator.async_add_entry(entry), virtual))
+    yield coordinator, fans
+    for entry in entries:
+        await coordinator.async_remove_entry(entry.entry_id)
+    for emulator in emulators:
+        emulator.close()
+    await hass.async_block_till_done()
+
+
+async def test_group_write_updates_every_member(fans):
+    coordinator, fans = fans
+    devices = [device for device, _ in fans]
+    result = await coordinator.async_group_write(devices, {PARAM_UNIT_ON_OFF: 1, PARAM_SPEED_NUMBER: 2})
+    assert result["devices"] == 2
+    assert result["failed"] == []
+    for device, virtual in fans:
+        assert virtual.registers[PARAM_SPEED_NUMBER] == b"\x02"
+        assert device.data["unit_on_off"] is True
+        assert device.data["speed_number"] == 66
+        assert device.availability == AVAILABILITY_AVAILABLE
+
+
+async def test_group_write_records_unanswered_member(fans):
+    coordinator, fans = fans
+    fans[1][1].faults.loss = 1.0
+    fans[1][0].client.retries = 0
+    result = await coordinator.async_group_write([device for device, _ in fans], {PARAM_UNIT_ON_OFF: 1})
+    assert result["failed"] == ["Fan 1"]
+    assert fans[0][0].availability == AVAILABILITY_AVAILABLE
+    assert fans[1][0].failures == 1
+    assert fans[1][0].availability == AVAILABILITY_DEGRADED
+
+
+async def test_apply_config_copies_snapshot_to_other_fan(fans):
+    """Abzug von Lüfter 0 als JSON, dann nur die Abweichungen auf Lüfter 1 schreiben und prüfen."""
+    coordinator, ((device, source), (target_device, target)) = fans
+    source.registers[PARAM_HUMIDITY_SETPOINT] = bytes((72,))
+    source.registers[PARAM_MANUAL_SPEED] = bytes((200,))
+    source.registers[PARAM_NIGHT_TIMER] = bytes((10, 8))
+    source.schedule[2, 3] = SchedulePeriod(2, 3, 3, 21, 30).to_bytes()
+    snapshot = json.loads(json.dumps(await coordinator.async_snapshot_config([device])))
+    assert snapshot["failed"] == []
+
+    result = await coordinator.async_apply_config([target_device], snapshot, device.device_id, dry_run=True)
+    assert result[target_device.device_id] == {
+        "changed": ["humidity_setpoint", "manual_speed", "night_timer_setpoint"],
+        "schedule_changed": [{"day": "wed", "period": 3, "speed": 3, "end": "21:30"}],
+    }
+    assert target.registers[PARAM_HUMIDITY_SETPOINT] != source.registers[PARAM_HUMIDITY_SETPOINT]
+
+    result = await coordinator.async_apply_config([target_device], snapshot, device.device_id)
+    assert result[target_device.device_id]["verified"] is True
+    assert all(target.registers[param_id] == source.registers[param_id] for param_id in CONFIG_PARAMETERS)
+    assert target.schedule == source.schedule
+
+    # Ein erneuter Abgleich findet nichts mehr
+    result = await coordinator.async_apply_config([target_device], snapshot, device.device_id, dry_run=True)
+    assert result[target_device.device_id] == {"changed": [], "schedule_changed": []}
+    with pytest.raises(ValueError, match="not in the snapshot"):
+        await coordinator.async_apply_config([target_device], snapshot, target_device.device_id)
+
+
+@pytest.mark.parametrize("change", [
+    lambda entry: entry["registers"].update(humidity_setpoint=256),
+    lambda entry: entry["schedule"][0].update(end=2130),
+    lambda entry: entry.update(schedule="mon"),
+    lambda entry: entry.update(registers=[72]),
+], ids=["register_range", "schedule_end", "schedule_type", "registers_type"])
+async def test_apply_config_rejects_invalid_entry_before_sending(fans, change):
+    """Ein fehlerhafter Eintrag für Lüfter 1 verhindert auch die Übertragung auf Lüfter 0."""
+    coordinator, fans = fans
+    devices = [device for device, _ in fans]
+    snapshot = json.loads(json.dumps(await coordinator.async_snapshot_config(devices)))
+    snapshot["devices"][devices[0].device_id]["registers"]["humidity_setpoint"] = 72
+    change(snapshot["devices"][devices[1].device_id])
+    requests = [device.client.metrics.requests for device in devices]
+    with pytest.raises(ValueError, match=devices[1].device_id):
+        await coordinator.async_apply_config(devices, snapshot)
+    assert [device.client.metrics.requests for device in devices] == requests
+    assert fans[0][1].registers[PARAM_HUMIDITY_SETPOINT] != bytes((72,))
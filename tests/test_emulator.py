@@ -0,0 +1,66 @@
+"""Verhalten der virtuellen Geräte (emulator.py), gegen die die übrigen Tests laufen."""
+
+import asyncio
+
+from codec import (
+    FUNC_READ, FUNC_WRITE_READ, PARAM_FIRMWARE, PARAM_HUMIDITY, PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF,
+    PARAM_VENTILATION_MODE,
+)
+from emulator import FaultProfile, VentoEmulator
+from udp_client import BlaubergVentoUDPClient, VentoTransport
+
+
+def _run_device(test, faults: FaultProfile | None = None):
+    """Führt test(device, client) gegen ein emuliertes Gerät auf localhost aus."""
+    async def _run():
+        emulator = VentoEmulator()
+        await emulator.async_add_devices(1, faults=faults)
+        transport = await VentoTransport.async_create(("127.0.0.1", 0))
+        device, port = emulator.devices[0]
+        client = BlaubergVentoUDPClient(emulator.host, device.device_id.decode(), device.password.decode(),
+                                        port=port, timeout=0.2, transport=transport, retries=0)
+        try:
+            await test(device, client)
+        finally:
+            transport.close()
+            emulator.close()
+
+    asyncio.run(_run())
+
+
+def test_read_returns_registers():
+    async def _test(device, client):
+        frame = await client.async_send_command(FUNC_READ, (PARAM_UNIT_ON_OFF, PARAM_HUMIDITY, PARAM_FIRMWARE))
+        assert frame.device_id == device.device_id
+        assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_HUMIDITY, PARAM_FIRMWARE]
+        assert frame.params["unit_on_off"] is False
+        assert frame.params["humidity"] == device.registers[PARAM_HUMIDITY][0]
+        assert frame.unsupported == []
+
+    _run_device(_test)
+
+
+def test_write_changes_registers():
+    async def _test(device, client):
+        frame = await client.async_send_command(FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1, PARAM_SPEED_NUMBER: 3})
+        assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_SPEED_NUMBER]
+        assert device.registers[PARAM_UNIT_ON_OFF] == b"\x01"
+        assert device.registers[PARAM_SPEED_NUMBER] == b"\x03"
+        # Nur lesbare Register bleiben unverändert
+        humidity = device.registers[PARAM_HUMIDITY]
+        await client.async_send_command(FUNC_WRITE_READ, {PARAM_HUMIDITY: 99})
+        assert device.registers[PARAM_HUMIDITY] == humidity
+
+    _run_device(_test)
+
+
+def test_unsupported_parameters_and_loss():
+    async def _test(device, client):
+        frame = await client.async_send_command(FUNC_READ, (PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE))
+        assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE]
+        assert frame.unsupported == [PARAM_VENTILATION_MODE]
+        device.faults.loss = 1.0
+        assert await client.async_send_command(FUNC_READ, (PARAM_UNIT_ON_OFF,)) is None
+        assert client.metrics.timeouts == 1
+
+    _run_device(_test, FaultProfile(unsupported={PARAM_VENTILATION_MODE}))
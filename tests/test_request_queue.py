@@ -0,0 +1,87 @@
+"""Reihenfolge, Zusammenlegen und Mindestabstand der RequestQueue gegen den Emulator auf localhost."""
+
+import asyncio
+
+from codec import FUNC_READ, FUNC_WRITE_READ, PARAM_BOOST_STATUS, PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF
+from emulator import VentoEmulator
+from udp_client import BlaubergVentoUDPClient, RequestQueue, VentoTransport
+
+
+class RecordingClient(BlaubergVentoUDPClient):
+    """Merkt sich Zeitpunkt, Funktion und Parameter jeder gesendeten Anfrage."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent: list[tuple[float, int, object]] = []
+
+    async def async_send_command(self, func, parameters, retries=None):
+        self.sent.append((asyncio.get_running_loop().time(), func, parameters))
+        return await super().async_send_command(func, parameters, retries)
+
+
+def _run_queue(test, latency: float = 0.0, min_gap: float = 0.0):
+    """Führt test(queue, client) gegen ein emuliertes Gerät aus."""
+    async def _run():
+        emulator = VentoEmulator()
+        await emulator.async_add_devices(1)
+        transport = await VentoTransport.async_create(("127.0.0.1", 0))
+        device, port = emulator.devices[0]
+        device.faults.latency = latency
+        client = RecordingClient(emulator.host, device.device_id.decode(), device.password.decode(),
+                                 port=port, transport=transport)
+        queue = RequestQueue(client, min_gap=min_gap)
+        try:
+            await test(queue, client)
+        finally:
+            queue.cancel()
+            transport.close()
+            emulator.close()
+
+    asyncio.run(_run())
+
+
+def test_write_is_sent_before_waiting_reads():
+    async def _test(queue: RequestQueue, client: RecordingClient):
+        first = asyncio.create_task(queue.async_read([PARAM_SPEED_NUMBER]))
+        await asyncio.sleep(0.01)  # Die erste Abfrage ist unterwegs
+        read = asyncio.create_task(queue.async_read([PARAM_BOOST_STATUS]))
+        write = asyncio.create_task(queue.async_write(FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1}))
+        await asyncio.sleep(0)
+        assert queue.pending == 2
+        frames = await asyncio.gather(first, read, write)
+        assert [func for _, func, _ in client.sent] == [FUNC_READ, FUNC_WRITE_READ, FUNC_READ]
+        assert [frame.ids for frame in frames] == [[PARAM_SPEED_NUMBER], [PARAM_BOOST_STATUS], [PARAM_UNIT_ON_OFF]]
+        assert frames[2].params["unit_on_off"]
+
+    _run_queue(_test, latency=0.05)
+
+
+def test_identical_waiting_reads_share_one_request():
+    async def _test(queue: RequestQueue, client: RecordingClient):
+        first = asyncio.create_task(queue.async_read([PARAM_SPEED_NUMBER]))
+        await asyncio.sleep(0.01)
+        frames = await asyncio.gather(
+            first, queue.async_read([PARAM_BOOST_STATUS]), queue.async_read([PARAM_BOOST_STATUS])
+        )
+        assert len(client.sent) == 2
+        assert queue.dropped_reads == 1
+        assert frames[1] is frames[2]
+        assert frames[1].ids == [PARAM_BOOST_STATUS]
+
+    _run_queue(_test, latency=0.05)
+
+
+def test_requests_keep_minimum_gap():
+    async def _test(queue: RequestQueue, client: RecordingClient):
+        frames = await asyncio.gather(
+            queue.async_read([PARAM_SPEED_NUMBER]),
+            queue.async_read([PARAM_BOOST_STATUS]),
+            queue.async_write(FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1}),
+        )
+        assert all(frame is not None for frame in frames)
+        times = [sent for sent, _, _ in client.sent]
+        assert len(times) == 3
+        # Die Event-Loop darf einen Zeitgeber um ihre Taktauflösung zu früh auslösen
+        assert all(b - a >= queue.min_gap - 0.005 for a, b in zip(times, times[1:]))
+
+    _run_queue(_test, min_gap=0.05)
@@ -0,0 +1,71 @@
+"""Konfigurationsabzug (snapshot.py): Umwandlung von und nach JSON, Prüfung der Werte, Datei."""
+
+import json
+
+import pytest
+
+from codec import PARAM_HUMIDITY_SETPOINT, PARAM_NIGHT_TIMER, SchedulePeriod
+from snapshot import (
+    SNAPSHOT_VERSION, diff_registers, diff_schedule, dump_snapshot, load_snapshot, registers_from_json,
+    registers_to_json, schedule_from_json,
+)
+
+
+def test_registers_round_trip_through_json():
+    values = {PARAM_HUMIDITY_SETPOINT: 72, PARAM_NIGHT_TIMER: b"\x0a\x08", 0x0999: b"\x01\x02"}
+    registers = json.loads(json.dumps(registers_to_json(values)))
+    assert registers == {"humidity_setpoint": 72, "night_timer_setpoint": "0a08", "0x0999": "0102"}
+    assert registers_from_json(registers) == values
+    # Zahl und 0xFE-Block mit demselben Wert gelten als gleich
+    assert diff_registers({PARAM_HUMIDITY_SETPOINT: b"\x48", PARAM_NIGHT_TIMER: b"\x0a\x07"}, values) == {
+        PARAM_NIGHT_TIMER: b"\x0a\x08", 0x0999: b"\x01\x02",
+    }
+
+
+@pytest.mark.parametrize("registers", [
+    {"humidity_setpoint": 256},
+    {"humidity_setpoint": -1},
+    {"humidity_setpoint": True},
+    {"night_timer_setpoint": "0a0800"},
+    {"unknown_register": 1},
+])
+def test_registers_from_json_rejects_invalid_values(registers):
+    with pytest.raises(ValueError):
+        registers_from_json(registers)
+
+
+def test_schedule_round_trip_through_json():
+    periods = [SchedulePeriod(0, 1, 0, 6, 0), SchedulePeriod(9, 4, 3, 23, 59)]
+    items = json.loads(json.dumps([period.as_dict() for period in periods]))
+    assert items[1] == {"day": "all", "period": 4, "speed": 3, "end": "23:59"}
+    assert schedule_from_json(items) == periods
+    assert diff_schedule(periods[:1], periods) == periods[1:]
+
+
+@pytest.mark.parametrize("item", [
+    {"day": "monday", "period": 1, "speed": 1, "end": "06:00"},
+    {"day": "mon", "period": 0, "speed": 1, "end": "06:00"},
+    {"day": "mon", "period": 5, "speed": 1, "end": "06:00"},
+    {"day": "mon", "period": 1, "speed": 4, "end": "06:00"},
+    {"day": "mon", "period": 1, "speed": True, "end": "06:00"},
+    {"day": "mon", "period": "1", "speed": 1, "end": "06:00"},
+    {"day": "mon", "period": 1, "speed": 1, "end": "24:00"},
+    {"day": "mon", "period": 1, "speed": 1, "end": "06:60"},
+    {"day": "mon", "period": 1, "speed": 1, "end": "6"},
+    {"day": "mon", "period": 1, "speed": 1, "end": 600},
+    {"day": "mon", "period": 1, "speed": 1},
+    "mon 1 1 06:00",
+])
+def test_schedule_from_json_rejects_invalid_entries(item):
+    with pytest.raises(ValueError):
+        schedule_from_json([item])
+
+
+def test_snapshot_file(tmp_path):
+    snapshot = {"version": SNAPSHOT_VERSION, "devices": {"EMU0000000000000": {"registers": {"humidity_setpoint": 72}}}}
+    path = tmp_path / "snapshot.json"
+    dump_snapshot(path, snapshot)
+    assert load_snapshot(path) == snapshot
+    path.write_text(json.dumps({"version": SNAPSHOT_VERSION + 1, "devices": {}}))
+    with pytest.raises(ValueError):
+        load_snapshot(path)
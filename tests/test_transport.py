@@ -0,0 +1,71 @@
+"""Zuordnung der Antworten zu ihren Anfragen (VentoTransport) gegen den Emulator auf localhost."""
+
+import asyncio
+
+from codec import (
+    FUNC_READ, FUNC_WRITE_READ, PARAM_SPEED_NUMBER, PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE, POLL_PARAMETERS,
+)
+from emulator import FaultProfile, VentoEmulator
+from udp_client import BlaubergVentoUDPClient, VentoTransport
+
+
+def _client(emulator: VentoEmulator, transport: VentoTransport, timeout: float) -> BlaubergVentoUDPClient:
+    device, port = emulator.devices[0]
+    return BlaubergVentoUDPClient(emulator.host, device.device_id.decode(), device.password.decode(),
+                                  port=port, timeout=timeout, transport=transport)
+
+
+def test_late_reply_does_not_resolve_next_request():
+    """Die verspätete Antwort auf eine abgelaufene Abfrage darf nicht als Antwort auf den folgenden Befehl gelten."""
+    async def _run():
+        emulator = VentoEmulator()
+        await emulator.async_add_devices(1)
+        transport = await VentoTransport.async_create(("127.0.0.1", 0))
+        try:
+            device = emulator.devices[0][0]
+            client = _client(emulator, transport, timeout=0.1)
+            device.faults.latency = 0.15
+            assert await client.async_send_command(FUNC_READ, POLL_PARAMETERS, retries=0) is None
+            # Die Antwort auf den Befehl kommt erst nach der verspäteten Antwort auf die Abfrage
+            device.faults.latency = 0.1
+            client.rtt.max_rto = 1.0
+            frame = await client.async_send_command(FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1}, retries=0)
+            assert frame is not None
+            assert frame.ids == [PARAM_UNIT_ON_OFF]
+            assert frame.params["unit_on_off"]
+            assert client.metrics.packets_received == 2
+            assert client.metrics.timeouts == 1
+            assert client.rtt.srtt >= 0.1
+        finally:
+            transport.close()
+            emulator.close()
+
+    asyncio.run(_run())
+
+
+def test_read_reply_leaving_out_parameters_reports_them_unsupported():
+    """Lässt das Gerät einen angefragten Parameter weg, passt die Antwort trotzdem; er gilt als nicht unterstützt."""
+    async def _run():
+        emulator = VentoEmulator()
+        await emulator.async_add_devices(1, faults=FaultProfile(omitted={PARAM_VENTILATION_MODE}))
+        transport = await VentoTransport.async_create(("127.0.0.1", 0))
+        try:
+            client = _client(emulator, transport, timeout=0.2)
+            frame = await client.async_send_command(
+                FUNC_READ, (PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE, PARAM_SPEED_NUMBER), retries=0
+            )
+            assert frame is not None
+            assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_SPEED_NUMBER]
+            assert frame.unsupported == [PARAM_VENTILATION_MODE]
+            assert client.metrics.unsupported == 1
+            # Ein Befehl muss dagegen genau die geschriebenen Parameter bestätigen
+            frame = await client.async_send_command(
+                FUNC_WRITE_READ, {PARAM_UNIT_ON_OFF: 1, PARAM_VENTILATION_MODE: 1}, retries=0
+            )
+            assert frame.ids == [PARAM_UNIT_ON_OFF, PARAM_VENTILATION_MODE]
+            assert frame.unsupported == []
+        finally:
+            transport.close()
+            emulator.close()
+
+    asyncio.run(_run())